@@ -149,9 +149,12 @@ Complejidad Temporal:
 * registrar_voto:
     Promedio: O(1+c)
     Peor caso: O(n+c)
-* total_votantes: O(n)O(n)
+* total_votantes: O(1)
 * mostrar_resultados: O(c)
+* clasificacion.lider / clasificacion.margen: O(1)
+* resultados_de (mesa, distrito, región o nacional): O(c)
 * eliminar_votante: O(b+c)
+* vista (lectura congelada, sin detener la ingesta): O(m+c)
 
 Complejidad Espacial:
 * Tabla hash de votantes: 0(n+b)
@@ -161,6 +164,7 @@ Complejidad Espacial:
 Donde n: numero de votantes
       c: numero de candidatos
       b: colisiones en una cubeta
+      m: numero de cubetas de la tabla
   """
 
 
@@ -171,306 +175,42 @@ Donde n: numero de votantes
 ###############################################
 ### MODULO 1 Definicon de clases(Map, TableHash y SistemaVotacion)
 ###############################################
+"""
+El código está en el paquete votacion y no se repite en este informe:
+
+* votacion/mapas.py: UnsortedTableMap, HashMapBase (encadenamiento),
+  ProbeHashMap (sondeo lineal), ConcurrentHashMap, DNIBitmapMap y las
+  estrategias de hash.
+* votacion/sistema.py: RegistroCandidatos, Clasificacion y SistemaVotacion.
+* votacion/territorio.py: Territorio, conteos por mesa, distrito y región.
+* votacion/auditoria.py: RegistroAuditoria, árbol de Merkle de los votos.
+"""
 
-import time
-import random
-import tkinter as tk
-from tkinter import messagebox
-
-class UnsortedTableMap:
-    """Implementación simple de un diccionario mediante una lista desordenada."""
-    
-    class _Item:
-        """Clase interna que representa una entrada clave-valor."""
-        def __init__(self, k, v):
-            self._key = k
-            self._value = v
-
-    def __init__(self):
-        """Inicializa una tabla vacía."""
-        self._table = []
-
-    def __getitem__(self, k):
-        """Retorna el valor asociado a la clave k."""
-        for item in self._table:
-            if k == item._key:
-                return item._value
-        raise KeyError("Key Error: " + repr(k))
-
-    def __setitem__(self, k, v):
-        """Asigna el valor v a la clave k. Si ya existe, actualiza el valor."""
-        for item in self._table:
-            if k == item._key:
-                item._value = v
-                return
-        self._table.append(self._Item(k, v))
-    
-    def __delitem__(self, k):
-        """Elimina el elemento con clave k."""
-        for i in range(len(self._table)):
-            if k == self._table[i]._key:
-                del self._table[i]
-                return
-        raise KeyError("Key Error: " + repr(k))
-
-    def __len__(self):
-        """Retorna el número de elementos almacenados."""
-        return len(self._table)
-
-    def __iter__(self):
-        """Itera sobre las claves almacenadas."""
-        for item in self._table:
-            yield item._key
-
-    def items(self):
-        """Itera sobre los pares clave-valor."""
-        for item in self._table:
-            yield item._key, item._value
-
-    def __str__(self):
-        """Representación como string del mapa."""
-        return "{" + ", ".join(f"'{k}': {v}" for k, v in self.items()) + "}"
-
-
-class HashMapBase:
-    """Mapa hash que utiliza una lista de UnsortedTableMap para manejar
-    colisiones (encadenamiento).
-    """
-    
-    def __init__(self):
-        self._table = 11 * [None]  # Tabla con 11 cubetas inicialmente
-
-    def _hash_function(self, k):
-        """Función hash simple basada en suma de códigos ASCII."""
-        return sum(ord(c) for c in k) % len(self._table)
-
-    def __setitem__(self, k, v):
-        """Inserta o actualiza el valor v en la clave k."""
-        i = self._hash_function(k)
-        if self._table[i] is None:
-            self._table[i] = UnsortedTableMap()
-        self._table[i][k] = v
-
-    def __getitem__(self, k):
-        """Retorna el valor asociado a la clave k si existe."""
-        i = self._hash_function(k)
-        if self._table[i] is not None:
-            try:
-                return self._table[i][k]
-            except KeyError:
-                return None
-        return None
-
-    def __contains__(self, k):
-        """Verifica si la clave k está en el mapa."""
-        return self.__getitem__(k) is not None
-
-    def __iter__(self):
-        """Itera sobre todas las claves almacenadas."""
-        for bucket in self._table:
-            if bucket:
-                for key in bucket:
-                    yield key
-
-    def items(self):
-        """Itera sobre todos los pares clave-valor del mapa."""
-        for bucket in self._table:
-            if bucket:
-                for k, v in bucket.items():
-                    yield k, v
-
-class SistemaVotacion:
-    """Clase principal que gestiona el sistema de votación."""
-
-    def __init__(self):
-        self.votantes = HashMapBase()         # Claves: DNI, Valores: candidato votado
-        self.resultados = UnsortedTableMap()  # Claves: candidato, Valores: conteo de votos
-
-    def registrar_voto(self, dni, candidato):
-        """Registra el voto de un votante identificado por su DNI."""
-
-        # Validación del formato de DNI
-        if not isinstance(dni, str) or not dni.isdigit() or len(dni) != 8:
-            return f"Error: el DNI '{dni}' no es válido. Debe tener 8 dígitos numéricos."
-
-        if self.votantes[dni] is not None:
-            return f"Error: el DNI {dni} ya ha votado."
-
-        self.votantes[dni] = candidato
-        votos_actuales = self.resultados[candidato] if candidato in self.resultados else 0
-        self.resultados[candidato] = votos_actuales + 1
-        return f"Voto registrado exitosamente para {candidato}."
-
-    def total_votantes(self):
-        """Devuelve el número total de votantes únicos registrados."""
-        return len(list(self.votantes))
-
-    def mostrar_resultados(self):
-        """Devuelve los resultados de la votación en forma de diccionario."""
-        return dict(self.resultados.items())
-
-    def eliminar_votante(self, dni):
-        """Permite eliminar un votante (por ejemplo, para pruebas o errores)."""
-        if self.votantes[dni] is None:
-            return f"El DNI {dni} no está registrado."
-        candidato = self.votantes[dni]
-        del self.votantes._table[self.votantes._hash_function(dni)][dni]
-        self.resultados[candidato] = self.resultados[candidato] - 1
-        return f"Votante con DNI {dni} eliminado correctamente."
+from votacion import (UnsortedTableMap, HashMapBase, ProbeHashMap,
+                      RegistroCandidatos, Clasificacion, SistemaVotacion)
 
 ###############################################
 ### MODULO 2 Pruebas
 ###############################################
+"""
+votacion/pruebas.py: carga de ejemplo, distribución de las estrategias
+hash y DNIs inválidos (python -m votacion.pruebas). Los tiempos se miden
+con votacion/benchmark.py y votacion/comparacion.py, sobre cargas
+generadas de antemano con votacion/generador.py (DNIs únicos o repetidos a
+propósito, popularidad de Zipf o por cuotas, DNIs inválidos y
+eliminaciones).
+"""
 
-def generar_dni():
-    """Genera un DNI aleatorio válido de 8 dígitos como string."""
-    return ''.join(str(random.randint(0, 9)) for _ in range(8))
-
-def prueba_insercion(sistema, cantidad):
-    """Prueba el tiempo de inserción de muchos votantes."""
-    candidatos = ["A", "B", "C"]
-    start = time.time()
-    for _ in range(cantidad):
-        dni = generar_dni()
-        candidato = random.choice(candidatos)
-        sistema.registrar_voto(dni, candidato)
-    end = time.time()
-    print(f"[Inserción] Tiempo para registrar {cantidad} votantes: {end - start:.6f} segundos")
-
-def prueba_busqueda(sistema, muestras=100):
-    """Prueba el tiempo de búsqueda de DNIs ya registrados."""
-    dnis = list(sistema.votantes)
-    dnis_muestra = random.sample(dnis, min(muestras, len(dnis)))
-
-    start = time.time()
-    for dni in dnis_muestra:
-        _ = sistema.votantes[dni]
-    end = time.time()
-    print(f"[Búsqueda] Tiempo para verificar {len(dnis_muestra)} DNIs: {end - start:.6f} segundos")
-
-
-def caso_extremo_dnis_invalidos(sistema):
-    """Se prueban DNIs vacíos o con caracteres inválidos."""
-    print("\n[Prueba extrema] DNIs inválidos:")
-    print(sistema.registrar_voto("", "A"))
-    print(sistema.registrar_voto("ABC12345", "B"))
-    print(sistema.registrar_voto("-0000001", "C"))
-
-
-def comparacion_con_array(n):
-    """Comparación con lista simple (array) para búsquedas."""
-    print("\n[Comparación] Uso de arrays vs tablas hash")
-    lista_votantes = []
-
-    for _ in range(n):
-        lista_votantes.append((generar_dni(), "Candidato X"))
-
-    # Buscar 100 DNIs aleatorios
-    dnis_existentes = random.sample([dni for dni, _ in lista_votantes], 100)
-
-    # Búsqueda en lista (O(n))
-    start = time.time()
-    for dni in dnis_existentes:
-        found = any(dni == x[0] for x in lista_votantes)
-    end = time.time()
-    print(f"[Array] Búsqueda de 100 DNIs en lista de {n}: {end - start:.6f} segundos")
-
-    # Búsqueda en tabla hash (O(1) promedio)
-    sistema = SistemaVotacion()
-    for dni, candidato in lista_votantes:
-        sistema.registrar_voto(dni, candidato)
-
-    start = time.time()
-    for dni in dnis_existentes:
-        _ = sistema.votantes[dni]
-    end = time.time()
-    print(f"[Tabla Hash] Búsqueda de 100 DNIs en hash de {n}: {end - start:.6f} segundos")
-
-
-# =======================
-# EJECUCIÓN DE PRUEBAS
-# =======================
-if __name__ == "__main__":
-    sistema = SistemaVotacion()
-
-    # Pruebas solicitadas
-    prueba_insercion(sistema, 1000)
-    prueba_busqueda(sistema, 100)
-    print("Total de votantes:", sistema.total_votantes())
-    print("Resultados:", sistema.mostrar_resultados())
-
-    # Casos extremos
-    caso_extremo_dnis_invalidos(SistemaVotacion())
-
-    # Comparación con array
-    comparacion_con_array(1000)
+from votacion.pruebas import generar_dni, prueba_distribucion, caso_extremo_dnis_invalidos
 
 ###############################################
 ### MODULO 3 Interfaz Grafica
 ###############################################
-
-class InterfazVotacion:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Sistema de Votación con Tablas Hash")
-        self.sistema = SistemaVotacion()
-
-        # Etiquetas e inputs
-        self.label_dni = tk.Label(root, text="DNI del votante:")
-        self.label_dni.pack()
-        self.entry_dni = tk.Entry(root)
-        self.entry_dni.pack()
-
-        self.label_candidato = tk.Label(root, text="Nombre del candidato:")
-        self.label_candidato.pack()
-        self.entry_candidato = tk.Entry(root)
-        self.entry_candidato.pack()
-
-        # Botón de votar
-        self.btn_votar = tk.Button(root, text="Registrar Voto", command=self.registrar_voto)
-        self.btn_votar.pack(pady=5)
-
-        # Botón de mostrar resultados
-        self.btn_resultados = tk.Button(root, text="Mostrar Resultados", command=self.mostrar_resultados)
-        self.btn_resultados.pack(pady=5)
-
-        # Área de resultados
-        self.text_resultados = tk.Text(root, height=10, width=50)
-        self.text_resultados.pack(pady=10)
-        self.text_resultados.config(state='disabled')
-
-    def registrar_voto(self):
-        dni = self.entry_dni.get().strip()
-        candidato = self.entry_candidato.get().strip()
-
-        if not dni or not candidato:
-            messagebox.showerror("Error", "Por favor, ingrese DNI y candidato.")
-            return
-
-        mensaje = self.sistema.registrar_voto(dni, candidato)
-        messagebox.showinfo("Resultado", mensaje)
-        self.entry_dni.delete(0, tk.END)
-        self.entry_candidato.delete(0, tk.END)
-
-    def mostrar_resultados(self):
-        resultados = self.sistema.mostrar_resultados()
-        self.text_resultados.config(state='normal')
-        self.text_resultados.delete(1.0, tk.END)
-
-        if not resultados:
-            self.text_resultados.insert(tk.END, "Aún no hay votos registrados.\n")
-        else:
-            self.text_resultados.insert(tk.END, "Resultados de la votación:\n")
-            for candidato, votos in resultados.items():
-                self.text_resultados.insert(tk.END, f"{candidato}: {votos} votos\n")
-
-        self.text_resultados.config(state='disabled')
-
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = InterfazVotacion(root)
-    root.mainloop()
+"""
+votacion/interfaz.py: InterfazVotacion (Tk). Se abre con python main.py;
+es el único módulo que importa tkinter, de modo que el núcleo funciona en
+equipos sin pantalla.
+"""
 
 
 ###############################################
@@ -479,9 +219,14 @@ if __name__ == "__main__":
 """
 Pruebas de rendimiento:
 
-* Tiempo de Inserción: Registrar 1000 votantes con DNIs aleatorios.
-* Tiempo de Búsqueda: Verificar la existencia de 100 DNIs en una tabla con 1000
-  registros.
+* Tiempo de Inserción: Registrar n votantes con DNIs distintos.
+* Tiempo de Búsqueda: Verificar DNIs registrados y no registrados.
+* Tiempo de Eliminación, total_votantes y mostrar_resultados.
+
+Las mediciones se hacen con votacion/benchmark.py (time.perf_counter,
+calentamiento y repeticiones) para n entre 10^3 y 10^7; los resultados se
+guardan en JSON y pueden compararse con una medición anterior para
+detectar regresiones.
 
 
 Casos extremos:
@@ -492,6 +237,11 @@ Comparación:
 
 * Frente a Arrays: Registro y Búsqueda de Votantes
   (requerirían una búsqueda O(N)).
+* votacion/comparacion.py aplica la misma carga (inserción, búsquedas con
+  y sin acierto, eliminación) a una lista, un dict, HashMapBase, un
+  arreglo ordenado con búsqueda binaria y los backends de votantes, y
+  reporta el tiempo por operación y la memoria por elemento para cada
+  tamaño.
 
 Resultados obtenidos:
 
@@ -500,6 +250,12 @@ Resultados obtenidos:
 * Registrar nuevos votantes y verificar su unicidad de manera eficiente.
 * Prevención de votos duplicados mediante la unicidad del DNI.
 * Presentar los resultados de la votación de forma clara y accesible.
+* Exportación del padrón y de los resultados a CSV, NDJSON o un formato
+  binario por columnas, por bloques y con gzip opcional
+  (votacion/exportacion.py).
+* Registro de auditoría opcional con un árbol de Merkle (RFC 6962): se
+  publican raíces y cada votante puede recibir una prueba de inclusión de
+  O(log n) hashes (votacion/auditoria.py).
 
 Lecciones aprendidas:
 
@@ -511,9 +267,8 @@ Lecciones aprendidas:
 
 Mejoras futuras:
 
-* Exportación de resultados.
 * Seguridad Reforzada: Añadir autenticación biométrica.
 * Interfaz Gráfica: Desarrollar una interfaz web o móvil.
-* Integración con Blockchain: Almacenar votos en una blockchain para
-  garantizar la transparencia pública.
+* Persistir el registro de auditoría y publicar sus raíces fuera del
+  sistema para garantizar la transparencia pública.
   """
@@ -0,0 +1,172 @@
+"""Modo concurrente: almacén por franjas, lotes con registro abierto y
+orden del diario y la auditoría."""
+
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+
+from votacion import ConcurrentHashMap, SistemaVotacion, VOTO_REGISTRADO
+from votacion.auditoria import RegistroAuditoria
+from votacion.diario import DiarioVotos, recuperar
+
+HILOS = 8
+
+
+def _en_hilos(funcion, n=HILOS):
+    """Ejecuta funcion(k) en n hilos y propaga la primera excepción."""
+    errores = []
+
+    def envolver(k):
+        try:
+            funcion(k)
+        except BaseException as error:
+            errores.append(error)
+
+    hilos = [threading.Thread(target=envolver, args=(k,)) for k in range(n)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    if errores:
+        raise errores[0]
+
+
+class TestConcurrentHashMap(unittest.TestCase):
+
+    def test_put_if_absent_gana_uno_por_clave(self):
+        mapa = ConcurrentHashMap(hash_strategy="dni", stripes=8)
+        ganadores = [[] for _ in range(HILOS)]
+
+        def insertar(k):
+            for i in range(5000):
+                if mapa.put_if_absent(f"{i:08d}", k):
+                    ganadores[k].append(i)
+
+        _en_hilos(insertar)
+        self.assertEqual(len(mapa), 5000)
+        self.assertEqual(sorted(i for lista in ganadores for i in lista), list(range(5000)))
+        for k, lista in enumerate(ganadores):
+            for i in lista:
+                self.assertEqual(mapa[f"{i:08d}"], k)
+
+
+class TestSistemaConcurrente(unittest.TestCase):
+
+    def assertCoherente(self, sistema):
+        conteo = [0] * len(sistema.resultados)
+        for _, valor in sistema.votantes.items():
+            conteo[valor & 0xFFFF] += 1
+        self.assertEqual(conteo, list(sistema.resultados))
+        self.assertEqual(len(sistema.resultados), len(sistema.candidatos))
+        self.assertEqual(dict(sistema.clasificacion.top()), sistema.mostrar_resultados())
+
+    def test_un_voto_por_dni(self):
+        sistema = SistemaVotacion(concurrente=True, candidatos=["A", "B", "C"])
+        aceptados = [0] * HILOS
+
+        def votar(k):
+            rng = random.Random(k)
+            for i in range(3000):
+                if "exitosamente" in sistema.registrar_voto(f"{i:08d}", rng.choice("ABC")):
+                    aceptados[k] += 1
+
+        _en_hilos(votar)
+        self.assertEqual(sum(aceptados), 3000)
+        self.assertCoherente(sistema)
+
+    def test_lotes_con_registro_abierto(self):
+        sistema = SistemaVotacion(concurrente=True)
+
+        def votar(k):
+            rng = random.Random(k)
+            for _ in range(300):
+                n = rng.randrange(1, 30)
+                dnis = [f"{rng.randrange(20000):08d}" for _ in range(n)]
+                nombres = [f"C{rng.randrange(60)}" for _ in range(n)]
+                if rng.random() < 0.5:
+                    sistema.registrar_votos_lote(dnis, nombres)
+                else:
+                    sistema.registrar_voto(dnis[0], nombres[0])
+                if rng.random() < 0.2:
+                    sistema.eliminar_votante(dnis[-1])
+
+        _en_hilos(votar)
+        self.assertCoherente(sistema)
+
+    def test_lote_con_candidato_publicado_sin_conteo(self):
+        # Otro hilo publicó el id pero todavía no amplió los conteos
+        sistema = SistemaVotacion(concurrente=True)
+        sistema.registrar_voto("12345678", "A")
+        sistema.candidatos.registrar_si("B", lambda cid: True)
+        codigos = sistema.registrar_votos_lote(["11111111", "22222222"], ["B", "A"])
+        self.assertEqual(list(codigos), [VOTO_REGISTRADO, VOTO_REGISTRADO])
+        self.assertEqual(sistema.mostrar_resultados(), {"A": 2, "B": 1})
+
+
+class TestDiarioConcurrente(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "votos.diario")
+        self.auditoria = RegistroAuditoria()
+        self.sistema = SistemaVotacion(concurrente=True, diario=DiarioVotos(self.ruta),
+                                       auditoria=self.auditoria)
+
+    def tearDown(self):
+        self.sistema.diario.cerrar()
+        self.directorio.cleanup()
+
+    def assertRecuperable(self):
+        self.sistema.diario.sincronizar()
+        self.assertEqual(self.auditoria.verificar(self.sistema), [])
+        recuperado, diario = recuperar(self.ruta)
+        try:
+            self.assertEqual(dict(recuperado.votantes.items()), dict(self.sistema.votantes.items()))
+            self.assertEqual(recuperado.mostrar_resultados(), self.sistema.mostrar_resultados())
+        finally:
+            diario.cerrar()
+
+    def test_eliminacion_entre_voto_y_diario(self):
+        sistema = self.sistema
+        anotar = sistema.diario.anotar_votos
+        hilos = []
+
+        def anotar_lento(votos, candidatos):
+            hilo = threading.Thread(target=sistema.eliminar_votante, args=(votos[0][0],))
+            hilo.start()
+            hilos.append(hilo)
+            time.sleep(0.05)
+            anotar(votos, candidatos)
+
+        sistema.diario.anotar_votos = anotar_lento
+        sistema.registrar_voto("12345678", "A")
+        sistema.diario.anotar_votos = anotar
+        hilos[0].join()
+        self.assertEqual(sistema.total_votantes(), 0)
+        self.assertRecuperable()
+
+    def test_operaciones_mezcladas(self):
+        sistema = self.sistema
+
+        def operar(k):
+            rng = random.Random(k)
+            for _ in range(1500):
+                dni = f"{rng.randrange(100):08d}"
+                operacion = rng.random()
+                if operacion < 0.4:
+                    sistema.registrar_voto(dni, rng.choice("ABC"))
+                elif operacion < 0.7:
+                    sistema.registrar_votos_lote([dni, f"{rng.randrange(100):08d}"],
+                                                 [rng.choice("ABCD"), "E"])
+                else:
+                    sistema.eliminar_votante(dni)
+
+        _en_hilos(operar)
+        self.assertRecuperable()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Filtro cuckoo y MapaFiltrado frente a un dict de referencia."""
+
+import random
+import unittest
+
+from votacion import BACKENDS_VOTANTES, SistemaVotacion
+from votacion.filtros import FiltroCuckoo, MapaFiltrado
+
+
+class TestFiltroCuckoo(unittest.TestCase):
+
+    def test_sin_falsos_negativos(self):
+        filtro = FiltroCuckoo(10000, 0.01)
+        claves = [f"{i * 7919:08d}" for i in range(9000)]
+        for k in claves:
+            filtro.agregar(k)
+        self.assertTrue(all(filtro.puede_contener(k) for k in claves))
+        for k in claves[::2]:
+            self.assertTrue(filtro.eliminar(k))
+        self.assertEqual(len(filtro), 4500)
+        self.assertTrue(all(filtro.puede_contener(k) for k in claves[1::2]))
+
+    def test_tasa_de_falsos_positivos(self):
+        filtro = FiltroCuckoo(10000, 0.01)
+        for i in range(9000):
+            filtro.agregar(f"{i:08d}")
+        falsos = sum(filtro.puede_contener(f"{i:08d}") for i in range(50000000, 50020000))
+        self.assertLess(falsos / 20000, 0.02)
+
+
+class TestMapaFiltrado(unittest.TestCase):
+
+    def test_operaciones_aleatorias(self):
+        for backend in ("encadenamiento", "sondeo"):
+            with self.subTest(backend=backend):
+                rng = random.Random(20)
+                # Más claves que la capacidad mínima (1024): el filtro se reconstruye
+                mapa = MapaFiltrado(BACKENDS_VOTANTES[backend](None), None, 0.05)
+                referencia = {}
+                for _ in range(20000):
+                    k = f"{rng.randrange(5000):08d}"
+                    operacion = rng.random()
+                    if operacion < 0.5:
+                        self.assertEqual(mapa.put_if_absent(k, 1), k not in referencia)
+                        referencia.setdefault(k, 1)
+                    elif operacion < 0.7:
+                        mapa[k] = 2
+                        referencia[k] = 2
+                    elif operacion < 0.9:
+                        self.assertEqual(mapa.pop(k), referencia.pop(k, None))
+                    else:
+                        self.assertEqual(mapa[k], referencia.get(k))
+                self.assertEqual(len(mapa), len(referencia))
+                self.assertEqual(dict(mapa.items()), referencia)
+                self.assertTrue(all(mapa[k] == v for k, v in referencia.items()))
+
+    def test_sistema_con_y_sin_filtro(self):
+        rng = random.Random(7)
+        operaciones = [(rng.random(), f"{rng.randrange(3000):08d}", rng.choice("ABC"))
+                       for _ in range(10000)]
+        sistemas = [SistemaVotacion(), SistemaVotacion(capacity_hint=100, filtro=0.01)]
+        for sistema in sistemas:
+            for operacion, dni, candidato in operaciones:
+                if operacion < 0.7:
+                    sistema.registrar_voto(dni, candidato)
+                else:
+                    sistema.eliminar_votante(dni)
+        sin_filtro, con_filtro = sistemas
+        self.assertEqual(con_filtro.mostrar_resultados(), sin_filtro.mostrar_resultados())
+        self.assertEqual(dict(con_filtro.votantes.items()), dict(sin_filtro.votantes.items()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Conteos por mesa, distrito y región frente al padrón y a resultados."""
+
+import os
+import random
+import tempfile
+import unittest
+
+from votacion import SistemaVotacion, Territorio, MESA_INVALIDA
+from votacion.instantanea import guardar_instantanea, cargar_instantanea
+from votacion.sistema import _BITS_CANDIDATO, _MASCARA_CANDIDATO
+from votacion.territorio import MESA, DISTRITO, REGION
+
+
+def _mesas(n_regiones=3, distritos_por_region=4, mesas_por_distrito=5):
+    return [(f"M{r}-{d}-{m}", f"D{r}-{d}", f"R{r}")
+            for r in range(n_regiones)
+            for d in range(distritos_por_region)
+            for m in range(mesas_por_distrito)]
+
+
+def _dni(rng):
+    return f"{rng.randrange(3000):08d}"
+
+
+class TestTerritorio(unittest.TestCase):
+
+    def assertConteosCoherentes(self, sistema, mesas):
+        """Cada nivel coincide con lo que implica el padrón, y la suma de
+        las mesas más los votos sin mesa es el total nacional."""
+        c = len(sistema.resultados)
+        esperado = {mesa: [0] * c for mesa, _, _ in mesas}
+        sin_mesa = [0] * c
+        for _, valor in sistema.votantes.items():
+            cid = valor & _MASCARA_CANDIDATO
+            if valor > _MASCARA_CANDIDATO:
+                esperado[mesas[(valor >> _BITS_CANDIDATO) - 1][0]][cid] += 1
+            else:
+                sin_mesa[cid] += 1
+        territorio = sistema.territorio
+        distritos, regiones = {}, {}
+        for mesa, distrito, region in mesas:
+            self.assertEqual(list(territorio.conteos(MESA, mesa)), esperado[mesa], mesa)
+            for acumulado, nombre in ((distritos, distrito), (regiones, region)):
+                suma = acumulado.setdefault(nombre, [0] * c)
+                for cid, votos in enumerate(esperado[mesa]):
+                    suma[cid] += votos
+        for nivel, acumulado in ((DISTRITO, distritos), (REGION, regiones)):
+            for nombre, suma in acumulado.items():
+                self.assertEqual(list(territorio.conteos(nivel, nombre)), suma, nombre)
+        nacional = [sum(votos) for votos in zip(sin_mesa, *regiones.values())]
+        self.assertEqual(nacional, list(sistema.resultados))
+
+    def test_operaciones_aleatorias(self):
+        rng = random.Random(21)
+        mesas = _mesas()
+        sistema = SistemaVotacion(territorio=Territorio(mesas))
+        nombres = [mesa for mesa, _, _ in mesas] + [None, "no-existe"]
+        candidatos = ["A", "B", "C", "D"]
+        for paso in range(3000):
+            operacion = rng.random()
+            if operacion < 0.5:
+                sistema.registrar_voto(_dni(rng), rng.choice(candidatos), rng.choice(nombres))
+            elif operacion < 0.75:
+                sistema.eliminar_votante(_dni(rng))
+            else:
+                n = rng.randrange(1, 20)
+                sistema.registrar_votos_lote([_dni(rng) for _ in range(n)],
+                                             [rng.choice(candidatos) for _ in range(n)],
+                                             [rng.choice(nombres) for _ in range(n)])
+            if paso % 500 == 0:
+                self.assertConteosCoherentes(sistema, mesas)
+        self.assertConteosCoherentes(sistema, mesas)
+
+    def test_mesa_invalida(self):
+        sistema = SistemaVotacion(territorio=Territorio(_mesas(1, 1, 1)))
+        self.assertIn("no está registrada", sistema.registrar_voto("12345678", "A", "X"))
+        codigos = sistema.registrar_votos_lote(["12345678"], ["A"], ["X"])
+        self.assertEqual(list(codigos), [MESA_INVALIDA])
+        self.assertEqual(sistema.total_votantes(), 0)
+
+    def test_instantanea_con_mas_de_65535_mesas(self):
+        mesas = [(f"M{m}", f"D{m // 1000}", "R") for m in range(70000)]
+        sistema = SistemaVotacion(territorio=Territorio(mesas))
+        sistema.registrar_voto("12345678", "A", "M69999")
+        sistema.registrar_voto("12345679", "B", "M3")
+        sistema.registrar_voto("12345670", "B")
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "votos.snap")
+            guardar_instantanea(sistema, ruta)
+            cargado = cargar_instantanea(ruta, territorio=Territorio(mesas))
+        self.assertEqual(cargado.votantes["12345678"], sistema.votantes["12345678"])
+        self.assertEqual(cargado.resultados_de(MESA, "M69999"), {"A": 1, "B": 0})
+        self.assertEqual(cargado.resultados_de(DISTRITO, "D69"), {"A": 1, "B": 0})
+        self.assertEqual(cargado.mostrar_resultados(), {"A": 1, "B": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Vistas de lectura (copia en escritura) frente al sistema y la auditoría."""
+
+import random
+import threading
+import unittest
+
+from votacion import ConcurrentHashMap, SistemaVotacion, Territorio
+from votacion.auditoria import RegistroAuditoria
+from votacion.territorio import MESA, REGION
+
+_MESAS = [(f"M{m}", f"D{m // 4}", f"R{m // 8}") for m in range(16)]
+
+
+class TestVista(unittest.TestCase):
+
+    def test_vista_congelada(self):
+        for backend in ("encadenamiento", "sondeo"):
+            with self.subTest(backend=backend):
+                sistema = SistemaVotacion(backend=backend, territorio=Territorio(_MESAS))
+                for i in range(500):
+                    sistema.registrar_voto(f"{i:08d}", "AB"[i % 2], f"M{i % 16}")
+                vista = sistema.vista()
+                padron = dict(vista.votantes.items())
+                resultados = vista.mostrar_resultados()
+                region = vista.resultados_de(REGION, "R0")
+                for i in range(250):
+                    sistema.eliminar_votante(f"{i:08d}")
+                    sistema.registrar_voto(f"{i + 1000:08d}", "C", f"M{i % 16}")
+                self.assertEqual(dict(vista.votantes.items()), padron)
+                self.assertEqual(vista.mostrar_resultados(), resultados)
+                self.assertEqual(vista.resultados_de(REGION, "R0"), region)
+                self.assertEqual(vista.total_votantes(), 500)
+                self.assertEqual(vista.candidato_de("00000000"), "A")
+                self.assertIsNone(sistema.candidato_de("00000000"))
+                self.assertEqual(sistema.resultados_de(MESA, "M0")["C"], 16)
+
+    def test_vistas_durante_la_ingesta_coinciden_con_la_auditoria(self):
+        auditoria = RegistroAuditoria(tam_lote=64)
+        sistema = SistemaVotacion(territorio=Territorio(_MESAS), auditoria=auditoria)
+        terminado = threading.Event()
+
+        def ingerir():
+            rng = random.Random(25)
+            try:
+                for _ in range(4000):
+                    dni = f"{rng.randrange(1500):08d}"
+                    if rng.random() < 0.75:
+                        sistema.registrar_voto(dni, rng.choice("ABCD"), f"M{rng.randrange(16)}")
+                    else:
+                        sistema.eliminar_votante(dni)
+            finally:
+                terminado.set()
+
+        hilo = threading.Thread(target=ingerir)
+        hilo.start()
+        vistas = 0
+        while not terminado.is_set() or vistas == 0:
+            vista = sistema.vista()
+            self.assertEqual(auditoria.verificar(vista), [])
+            conteo = [0] * len(vista.resultados)
+            for _, valor in vista.votantes.items():
+                conteo[valor & 0xFFFF] += 1
+            self.assertEqual(conteo, list(vista.resultados))
+            vistas += 1
+        hilo.join()
+        self.assertEqual(auditoria.verificar(sistema), [])
+
+    def test_suscriptor_que_vuelve_a_llamar_al_sistema(self):
+        sistema = SistemaVotacion()
+        vistos = []
+
+        def suscriptor(nombre, delta, votos):
+            vistos.append((nombre, delta, votos, sistema.vista().total_votantes()))
+            if (nombre, delta, votos) == ("A", 1, 1):
+                sistema.registrar_voto("99999999", "B")
+            elif (nombre, delta) == ("B", 1) and votos == 1:
+                sistema.eliminar_votante("12345678")
+
+        sistema.clasificacion.suscribir(suscriptor)
+        hilo = threading.Thread(target=sistema.registrar_voto, args=("12345678", "A"), daemon=True)
+        hilo.start()
+        hilo.join(5)
+        self.assertFalse(hilo.is_alive(), "el suscriptor quedó bloqueado")
+        self.assertEqual(vistos, [("A", 1, 1, 1), ("B", 1, 1, 2), ("A", -1, 0, 1)])
+        self.assertEqual(sistema.mostrar_resultados(), {"A": 0, "B": 1})
+
+    def test_sin_vista(self):
+        for opciones in ({"concurrente": True}, {"backend": "bitmap"}):
+            with self.subTest(**opciones):
+                with self.assertRaises(ValueError):
+                    SistemaVotacion(**opciones).vista()
+        with self.assertRaises(TypeError):
+            ConcurrentHashMap().snapshot()
+
+
+if __name__ == "__main__":
+    unittest.main()
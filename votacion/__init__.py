@@ -0,0 +1,37 @@
+"""Sistema de votación con tablas hash.
+
+El núcleo (mapas hash, almacenes de votantes y SistemaVotacion) solo usa la
+biblioteca estándar y se importa en pocos milisegundos: no carga tkinter ni
+NumPy. La interfaz gráfica está en votacion.interfaz y se abre con main.py;
+los conteos por mesa, distrito y región, el diario, el registro de
+auditoría, las instantáneas, la ingesta, los fragmentos, el servicio en red
+y las herramientas de medición están en sus propios módulos del paquete.
+"""
+
+from .mapas import (
+    UnsortedTableMap,
+    HashMapBase,
+    ProbeHashMap,
+    ConcurrentHashMap,
+    DNIBitmapMap,
+    MapSnapshot,
+    HASH_STRATEGIES,
+    BACKENDS_VOTANTES,
+    hash_python,
+    hash_ascii,
+    hash_fnv,
+    hash_dni,
+)
+from .sistema import (
+    RegistroCandidatos,
+    Clasificacion,
+    SistemaVotacion,
+    VistaVotacion,
+    VOTO_REGISTRADO,
+    DNI_INVALIDO,
+    YA_VOTO,
+    DUPLICADO_EN_LOTE,
+    CANDIDATO_INVALIDO,
+    MESA_INVALIDA,
+)
+from .territorio import Territorio
@@ -0,0 +1,286 @@
+"""Registro de auditoría de solo anexado con un árbol de Merkle incremental.
+
+Cada voto aceptado y cada eliminación se anota como una hoja de 11 bytes
+(operación, DNI, id del candidato y mesa + 1). El árbol sigue RFC 6962:
+la hoja vale SHA-256(0x00 || datos) y cada nodo SHA-256(0x01 || izq ||
+der), y para n hojas que no son potencia de 2 se parte en la mayor
+potencia de 2 menor que n. Así la raíz publicada compromete toda la
+secuencia de operaciones: alterar, quitar o reordenar una hoja cambia la
+raíz, y una prueba de inclusión de O(log n) hashes muestra que el voto de
+un DNI está en el árbol de una raíz publicada.
+
+Anotar solo copia los 11 bytes; el hashing se hace por lotes de tam_lote
+hojas (o al pedir la raíz o una prueba), con la capa de hojas y cada nivel
+de nodos calculados en una pasada, así que no frena la ingesta voto a voto.
+Se guardan los nodos de todos los subárboles completos (unos 2n hashes de
+32 bytes en bytearray), con lo que la raíz se arma en O(log n) y una
+prueba en O(log² n) hashes en el peor caso.
+
+El registro vive en memoria; verificar(sistema) recalcula las hojas y el
+estado de votantes y resultados que implican, y lo compara con el del
+sistema (o con el de sistema.vista(), sin detener la ingesta).
+
+Uso:
+    auditoria = RegistroAuditoria()
+    sistema = SistemaVotacion(auditoria=auditoria)
+    ...
+    tamano, raiz = auditoria.publicar("raices.txt")
+    prueba = auditoria.prueba("12345678")
+    verificar_inclusion(prueba["hoja"], prueba["indice"], prueba["tamano"],
+                        prueba["ruta"], prueba["raiz"])
+"""
+
+import hashlib
+import struct
+import threading
+import time
+from array import array
+
+from .sistema import _BITS_CANDIDATO, _MASCARA_CANDIDATO
+
+TAM_LOTE = 4096
+
+_VOTO = 1
+_ELIMINACION = 2
+_HOJA = struct.Struct("<BIHI")     # Operación, DNI, id del candidato, mesa + 1
+# Cada hoja se guarda precedida del 0x00 de RFC 6962, así que su hash es el
+# de un solo tramo del bytearray, sin concatenar
+_HOJA_PREFIJADA = struct.Struct("<xBIHI")
+_TAM_HASH = 32
+
+
+def _hash_hoja(datos):
+    return hashlib.sha256(b"\x00" + datos).digest()
+
+
+def _hash_nodo(izquierdo, derecho):
+    return hashlib.sha256(b"\x01" + izquierdo + derecho).digest()
+
+
+def _mayor_potencia_menor(n):
+    """Mayor potencia de 2 estrictamente menor que n (n > 1)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+class RegistroAuditoria:
+    """Árbol de Merkle incremental de las operaciones aceptadas."""
+
+    def __init__(self, tam_lote=TAM_LOTE):
+        self._tam_lote = tam_lote
+        self._datos = bytearray()          # Hojas anotadas, con el prefijo 0x00
+        self._n = 0                        # Hojas anotadas
+        self._niveles = [bytearray()]      # Nivel k: hashes de subárboles de 2^k hojas
+        self._hojas_selladas = 0
+        self._ultima_hoja = {}             # DNI -> índice de su última hoja
+        self._hoja_anterior = array("q")   # Hoja -> hoja anterior del mismo DNI, o -1
+        self._publicadas = []              # (instante, tamaño, raíz)
+        self._lock = threading.Lock()
+
+    def anotar_voto(self, dni, cid, mesa=-1):
+        """Anota el voto de dni por el candidato cid (en la mesa con id
+        mesa, o -1)."""
+        self._anotar(_VOTO, dni, cid, mesa + 1)
+
+    def anotar_eliminacion(self, dni):
+        """Anota la eliminación del votante dni."""
+        self._anotar(_ELIMINACION, dni, 0, 0)
+
+    def _anotar(self, op, dni, cid, mesa):
+        with self._lock:
+            self._hoja_anterior.append(self._ultima_hoja.get(dni, -1))
+            self._ultima_hoja[dni] = self._n
+            self._datos += _HOJA_PREFIJADA.pack(op, int(dni), cid, mesa)
+            self._n += 1
+            if self._n - self._hojas_selladas >= self._tam_lote:
+                self._sellar()
+
+    def __len__(self):
+        """Retorna el número de hojas anotadas (selladas o no)."""
+        return self._n
+
+    def sellar(self):
+        """Calcula los hashes de las hojas pendientes y de los nodos que
+        completan."""
+        with self._lock:
+            self._sellar()
+
+    def _sellar(self):
+        tam = _HOJA_PREFIJADA.size
+        n = self._n
+        inicio = self._hojas_selladas
+        if inicio == n:
+            return
+        sha256 = hashlib.sha256
+        datos = bytes(self._datos[inicio * tam:n * tam])
+        self._niveles[0] += b"".join([sha256(datos[i:i + tam]).digest()
+                                      for i in range(0, len(datos), tam)])
+        self._hojas_selladas = n
+        # Cada nivel completa los pares nuevos del nivel inferior
+        k = 0
+        while n >> (k + 1):
+            inferior = self._niveles[k]
+            if len(self._niveles) == k + 1:
+                self._niveles.append(bytearray())
+            superior = self._niveles[k + 1]
+            hechos = len(superior) // _TAM_HASH
+            total = n >> (k + 1)
+            if hechos < total:
+                # Los dos hijos de un nodo son contiguos en el nivel inferior
+                h = 2 * _TAM_HASH
+                hijos = bytes(inferior[hechos * h:total * h])
+                superior += b"".join([sha256(b"\x01" + hijos[j:j + h]).digest()
+                                      for j in range(0, len(hijos), h)])
+            k += 1
+
+    def _nodo(self, k, i):
+        """Hash del subárbol completo i del nivel k."""
+        return bytes(self._niveles[k][i * _TAM_HASH:(i + 1) * _TAM_HASH])
+
+    def _mth(self, a, b):
+        """Hash de Merkle (RFC 6962) de las hojas [a, b)."""
+        n = b - a
+        if n & (n - 1) == 0:               # Subárbol completo y alineado
+            return self._nodo(n.bit_length() - 1, a >> (n.bit_length() - 1))
+        k = _mayor_potencia_menor(n)
+        return _hash_nodo(self._mth(a, a + k), self._mth(a + k, b))
+
+    def _ruta(self, m, a, b):
+        """Ruta de auditoría (RFC 6962) de la hoja m en el árbol de [a, b)."""
+        if b - a == 1:
+            return []
+        k = _mayor_potencia_menor(b - a)
+        if m < a + k:
+            return self._ruta(m, a, a + k) + [self._mth(a + k, b)]
+        return self._ruta(m, a + k, b) + [self._mth(a, a + k)]
+
+    def raiz(self):
+        """Retorna (tamaño, raíz en hexadecimal) del árbol actual."""
+        with self._lock:
+            self._sellar()
+            n = self._hojas_selladas
+            if not n:
+                return 0, hashlib.sha256(b"").hexdigest()
+            return n, self._mth(0, n).hex()
+
+    def publicar(self, archivo=None):
+        """Registra la raíz actual como publicada y, si se indica, la agrega
+        a archivo como una línea "instante tamaño raíz". Retorna (tamaño,
+        raíz)."""
+        tamano, raiz = self.raiz()
+        instante = time.time()
+        with self._lock:
+            self._publicadas.append((instante, tamano, raiz))
+        if archivo is not None:
+            with open(archivo, "a", encoding="utf-8") as f:
+                f.write(f"{instante:.3f} {tamano} {raiz}\n")
+        return tamano, raiz
+
+    def publicadas(self):
+        """Retorna la lista de (instante, tamaño, raíz) publicadas."""
+        with self._lock:
+            return list(self._publicadas)
+
+    def prueba(self, dni, tamano=None):
+        """Retorna la prueba de inclusión de la última operación de dni en
+        el árbol de las primeras tamano hojas (por defecto, el actual):
+        un dict con la hoja (datos en hexadecimal), su índice, el tamaño,
+        la ruta de hashes y la raíz. Retorna None si dni no aparece en esas
+        hojas. Las operaciones posteriores a tamano se saltan siguiendo la
+        cadena de hojas anteriores del DNI."""
+        with self._lock:
+            self._sellar()
+            n = self._hojas_selladas if tamano is None else tamano
+            if not 0 < n <= self._hojas_selladas:
+                raise ValueError(f"Tamaño de árbol fuera de rango: {n}")
+            indice = self._ultima_hoja.get(dni, -1)
+            while indice >= n:
+                indice = self._hoja_anterior[indice]
+            if indice < 0:
+                return None
+            tam = _HOJA_PREFIJADA.size
+            return {
+                "hoja": self._datos[indice * tam + 1:(indice + 1) * tam].hex(),
+                "indice": indice,
+                "tamano": n,
+                "ruta": [h.hex() for h in self._ruta(indice, 0, n)],
+                "raiz": self._mth(0, n).hex(),
+            }
+
+    def verificar(self, sistema):
+        """Recalcula el árbol desde las hojas anotadas y el estado de
+        votantes y resultados que implican, y lo compara con el sistema.
+        Con una VistaVotacion solo se consideran las hojas anotadas hasta
+        la vista, así que se puede verificar mientras siguen llegando
+        votos. Retorna la lista de discrepancias encontradas (vacía si todo
+        coincide)."""
+        hojas = getattr(sistema, "hojas_auditoria", None)
+        with self._lock:
+            self._sellar()
+            datos = bytes(self._datos)
+            niveles = [bytes(nivel) for nivel in self._niveles]
+        if hojas is not None:
+            # El árbol de las primeras hojas no incluye los nodos posteriores
+            datos = datos[:hojas * _HOJA_PREFIJADA.size]
+            niveles = [nivel[:(hojas >> k) * _TAM_HASH] for k, nivel in enumerate(niveles)]
+            niveles = niveles[:max(1, hojas.bit_length())]
+        problemas = []
+        copia = RegistroAuditoria()
+        copia._datos = bytearray(datos)
+        copia._n = len(datos) // _HOJA_PREFIJADA.size
+        copia._sellar()
+        if [bytes(nivel) for nivel in copia._niveles] != niveles:
+            problemas.append("Los hashes guardados no coinciden con las hojas anotadas")
+
+        esperado = {}
+        for op, dni, cid, mesa in _HOJA_PREFIJADA.iter_unpack(datos):
+            if op == _VOTO:
+                esperado[dni] = cid | mesa << _BITS_CANDIDATO
+            else:
+                esperado.pop(dni, None)
+        conteos = [0] * len(sistema.resultados)
+        for valor in esperado.values():
+            conteos[valor & _MASCARA_CANDIDATO] += 1
+        if len(sistema.votantes) != len(esperado):
+            problemas.append(f"votantes tiene {len(sistema.votantes)} DNIs y el registro "
+                             f"{len(esperado)}")
+        for dni, valor in esperado.items():
+            actual = sistema.votantes[f"{dni:08d}"]
+            if actual != valor:
+                problemas.append(f"DNI {dni:08d}: votantes tiene {actual!r} y el registro {valor}")
+        for cid, (actual, votos) in enumerate(zip(sistema.resultados, conteos)):
+            if actual != votos:
+                problemas.append(f"Candidato {sistema.candidatos.nombre(cid)!r}: resultados tiene "
+                                 f"{actual} y el registro {votos}")
+        return problemas
+
+
+def verificar_inclusion(hoja, indice, tamano, ruta, raiz):
+    """Verifica una prueba de inclusión (RFC 9162, 2.1.3.2) sin acceso al
+    registro: hoja son los datos de la hoja y ruta y raíz los hashes, todo
+    en hexadecimal. Retorna True si la hoja está en el árbol de esa raíz."""
+    if indice >= tamano:
+        return False
+    fn, sn = indice, tamano - 1
+    r = _hash_hoja(bytes.fromhex(hoja))
+    for p in ruta:
+        p = bytes.fromhex(p)
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = _hash_nodo(p, r)
+            while not fn & 1 and fn:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = _hash_nodo(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r.hex() == raiz
+
+
+def decodificar_hoja(hoja):
+    """Retorna (operación, DNI, id del candidato, id de mesa o -1) de los
+    datos de una hoja en hexadecimal; la operación es "voto" o
+    "eliminacion"."""
+    op, dni, cid, mesa = _HOJA.unpack(bytes.fromhex(hoja))
+    return ("voto" if op == _VOTO else "eliminacion"), f"{dni:08d}", cid, mesa - 1
@@ -0,0 +1,228 @@
+"""Suite de benchmarks de SistemaVotacion.
+
+Para cada backend de votantes y cada tamaño de padrón n (potencias de 10
+entre --min-n y --max-n) se miden con time.perf_counter la inserción
+(registrar_voto), la búsqueda de DNIs presentes y ausentes, la
+eliminación, total_votantes y mostrar_resultados. Los datos se generan
+antes de medir con GeneradorVotos (votacion.generador) y una semilla
+fija: los n DNIs presentes y las muestras ausentes son distintos entre sí
+sin necesidad de comprobarlo.
+Cada medición hace una ronda de calentamiento sin medir y luego varias
+repeticiones; se informa la mejor y la mediana.
+
+Los resultados se imprimen como tabla y pueden guardarse en JSON. Con
+--comparar se contrastan con una medición anterior guardada y se marcan
+como regresión las operaciones cuyo tiempo mediano por operación empeora
+más que --tolerancia; en ese caso el programa termina con código 1.
+
+Uso:
+    python -m votacion.benchmark --max-n 1000000 --salida base.json
+    python -m votacion.benchmark --max-n 1000000 --comparar base.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+from .generador import GeneradorVotos
+from .mapas import BACKENDS_VOTANTES
+from .sistema import SistemaVotacion, _numpy
+
+VERSION = 1
+CANDIDATOS = ["A", "B", "C", "D", "E"]
+MUESTRA = 100000           # Operaciones medidas en búsquedas y eliminaciones
+LLAMADAS = 1000            # Llamadas medidas a total_votantes y mostrar_resultados
+CARGA_MAXIMA = 10 ** 6     # Votos insertados por repetición, como máximo
+
+
+class Datos:
+    """Datos de un tamaño n: padrón, votos y muestras de búsqueda."""
+
+    def __init__(self, n, semilla):
+        generador = GeneradorVotos(semilla, CANDIDATOS)
+        m = min(n, MUESTRA)
+        self.n = n
+        self.dnis = generador.dnis(n)
+        self.candidatos = generador.elegir_candidatos(n)
+        self.presentes = generador.muestra(self.dnis, m)
+        self.ausentes = generador.dnis(m)
+
+
+def medir(funcion, repeticiones, preparar=None):
+    """Ejecuta funcion una vez para calentar y luego `repeticiones` veces.
+    preparar (opcional) se llama fuera de la medición antes de cada
+    ejecución y su resultado se pasa a funcion. Retorna los segundos de
+    cada repetición."""
+    tiempos = []
+    for repeticion in range(repeticiones + 1):
+        argumento = preparar() if preparar else None
+        inicio = time.perf_counter()
+        funcion(argumento)
+        fin = time.perf_counter()
+        if repeticion:                     # La primera es de calentamiento
+            tiempos.append(fin - inicio)
+    return tiempos
+
+
+def _cargado(backend, datos):
+    sistema = SistemaVotacion(backend=backend, candidatos=CANDIDATOS)
+    for inicio in range(0, datos.n, 10000):
+        sistema.registrar_votos_lote(datos.dnis[inicio:inicio + 10000],
+                                     datos.candidatos[inicio:inicio + 10000])
+    return sistema
+
+
+def medir_backend(backend, datos, repeticiones):
+    """Mide todas las operaciones sobre un backend. Genera tuplas
+    (operación, número de operaciones por repetición, tiempos)."""
+    # Inserción: un sistema nuevo por repetición; por encima de
+    # CARGA_MAXIMA votos se hacen menos repeticiones
+    def nuevo():
+        return SistemaVotacion(backend=backend, candidatos=CANDIDATOS)
+
+    def insertar(sistema):
+        registrar = sistema.registrar_voto
+        for dni, candidato in zip(datos.dnis, datos.candidatos):
+            registrar(dni, candidato)
+
+    repeticiones_insercion = max(1, min(repeticiones, CARGA_MAXIMA // datos.n))
+    yield "insercion", datos.n, medir(insertar, repeticiones_insercion, nuevo)
+
+    sistema = _cargado(backend, datos)
+    votantes = sistema.votantes
+
+    def buscar(dnis):
+        for dni in dnis:
+            votantes[dni]
+
+    yield "busqueda_acierto", len(datos.presentes), medir(lambda _: buscar(datos.presentes),
+                                                          repeticiones)
+    yield "busqueda_fallo", len(datos.ausentes), medir(lambda _: buscar(datos.ausentes),
+                                                       repeticiones)
+
+    # Eliminación: los votantes eliminados se restauran fuera de la medición
+    presentes = datos.presentes
+    votos = [votantes[dni] for dni in presentes]
+    nombres = [sistema.candidatos.nombre(cid) for cid in votos]
+
+    def restaurar():
+        if votantes[presentes[0]] is None:
+            sistema.registrar_votos_lote(presentes, nombres)
+
+    def eliminar(_):
+        eliminar_votante = sistema.eliminar_votante
+        for dni in presentes:
+            eliminar_votante(dni)
+
+    yield "eliminacion", len(presentes), medir(eliminar, repeticiones, restaurar)
+    restaurar()
+
+    def llamar(funcion):
+        for _ in range(LLAMADAS):
+            funcion()
+
+    yield "total_votantes", LLAMADAS, medir(lambda _: llamar(sistema.total_votantes),
+                                            repeticiones)
+    yield "mostrar_resultados", LLAMADAS, medir(lambda _: llamar(sistema.mostrar_resultados),
+                                                repeticiones)
+
+
+def ejecutar(tamanios, backends, repeticiones=5, semilla=0, salida=sys.stdout):
+    """Corre la suite completa y retorna el informe como diccionario."""
+    resultados = []
+    for n in tamanios:
+        datos = Datos(n, semilla)
+        for backend in backends:
+            for operacion, operaciones, tiempos in medir_backend(backend, datos, repeticiones):
+                mediana = statistics.median(tiempos)
+                fila = {
+                    "backend": backend,
+                    "operacion": operacion,
+                    "n": n,
+                    "operaciones": operaciones,
+                    "repeticiones": len(tiempos),
+                    "mejor_s": min(tiempos),
+                    "mediana_s": mediana,
+                    "ns_por_operacion": mediana / operaciones * 1e9,
+                }
+                resultados.append(fila)
+                if salida:
+                    print(f"{backend:>15} {operacion:>20} n={n:<9} "
+                          f"{fila['ns_por_operacion']:>12.1f} ns/op  "
+                          f"(mejor {fila['mejor_s']:.6f} s, mediana {mediana:.6f} s)",
+                          file=salida, flush=True)
+    return {
+        "version": VERSION,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "numpy": _numpy() is not None,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "semilla": semilla,
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, base, tolerancia=0.10):
+    """Compara dos informes. Retorna una lista de (backend, operación, n,
+    ns base, ns actual, cambio relativo, es_regresion) para las mediciones
+    presentes en ambos."""
+    anteriores = {(f["backend"], f["operacion"], f["n"]): f["ns_por_operacion"]
+                  for f in base["resultados"]}
+    comparacion = []
+    for fila in actual["resultados"]:
+        clave = (fila["backend"], fila["operacion"], fila["n"])
+        if clave not in anteriores:
+            continue
+        antes, ahora = anteriores[clave], fila["ns_por_operacion"]
+        cambio = ahora / antes - 1 if antes else 0.0
+        comparacion.append((*clave, antes, ahora, cambio, cambio > tolerancia))
+    return comparacion
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de SistemaVotacion.")
+    parser.add_argument("--min-n", type=int, default=10 ** 3, help="tamaño de padrón inicial")
+    parser.add_argument("--max-n", type=int, default=10 ** 7, help="tamaño de padrón final")
+    parser.add_argument("--backend", action="append", choices=sorted(BACKENDS_VOTANTES),
+                        help="backend a medir (repetible; por defecto, todos)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="archivo JSON de una medición anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="empeoramiento relativo tolerado antes de marcar una regresión")
+    args = parser.parse_args(argv)
+
+    tamanios = []
+    n = args.min_n
+    while n <= args.max_n:
+        tamanios.append(n)
+        n *= 10
+    informe = ejecutar(tamanios, args.backend or list(BACKENDS_VOTANTES),
+                       args.repeticiones, args.semilla)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regresiones = 0
+        print(f"\nComparación con {args.comparar} (tolerancia {args.tolerancia:.0%}):")
+        for backend, operacion, n, antes, ahora, cambio, regresion in comparar(
+                informe, base, args.tolerancia):
+            regresiones += regresion
+            marca = "REGRESIÓN" if regresion else ""
+            print(f"{backend:>15} {operacion:>20} n={n:<9} {antes:>12.1f} -> {ahora:>12.1f} ns/op "
+                  f"({cambio:+.1%}) {marca}")
+        if regresiones:
+            print(f"{regresiones} regresiones")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Comparación de almacenes de votantes con una misma carga de trabajo.
+
+Cada almacén de ALMACENES recibe la misma secuencia, generada con una
+semilla: n inserciones, búsquedas de DNIs presentes, búsquedas de DNIs
+ausentes y eliminaciones. Para cada almacén y tamaño se informa el tiempo
+por operación (mediana de varias repeticiones, tras un calentamiento) y la
+memoria por elemento medida con tracemalloc en una pasada aparte, sin
+contar las cadenas de los DNIs, que se crean antes y son las mismas para
+todos. Las páginas de un mmap no pasan por tracemalloc, así que para el
+backend "bitmap" solo se cuenta la parte en bytearray.
+
+Un almacén es cualquier objeto con la interfaz de mapa de HashMapBase
+(m[k] = v, m[k] retorna None si k no está, del m[k] y len(m)). Además de
+los almacenes incluidos (lista, dict, HashMapBase, arreglo ordenado y los
+de BACKENDS_VOTANTES) se pueden agregar otros con registrar_almacen.
+
+Uso:
+    python -m votacion.comparacion --max-n 100000 --salida comparacion.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tracemalloc
+from bisect import bisect_left
+
+from .mapas import UnsortedTableMap, HashMapBase, BACKENDS_VOTANTES
+from .benchmark import medir
+from .generador import GeneradorVotos
+
+MUESTRA = 10000            # Búsquedas y eliminaciones medidas por repetición
+
+
+class ListaMap(UnsortedTableMap):
+    """Lista desordenada de pares: búsqueda lineal O(n)."""
+
+    def __getitem__(self, k):
+        try:
+            return super().__getitem__(k)
+        except KeyError:
+            return None
+
+
+class DictMap(dict):
+    """dict de Python con la convención de HashMapBase para claves ausentes."""
+
+    __getitem__ = dict.get
+
+
+class ArregloOrdenadoMap:
+    """Claves en una lista ordenada y valores en otra paralela: búsqueda
+    binaria O(log n), inserción y eliminación O(n) por el desplazamiento."""
+
+    def __init__(self):
+        self._claves = []
+        self._valores = []
+
+    def __setitem__(self, k, v):
+        i = bisect_left(self._claves, k)
+        if i < len(self._claves) and self._claves[i] == k:
+            self._valores[i] = v
+        else:
+            self._claves.insert(i, k)
+            self._valores.insert(i, v)
+
+    def __getitem__(self, k):
+        i = bisect_left(self._claves, k)
+        if i < len(self._claves) and self._claves[i] == k:
+            return self._valores[i]
+        return None
+
+    def __delitem__(self, k):
+        i = bisect_left(self._claves, k)
+        if i == len(self._claves) or self._claves[i] != k:
+            raise KeyError("Key Error: " + repr(k))
+        del self._claves[i]
+        del self._valores[i]
+
+    def __len__(self):
+        return len(self._claves)
+
+
+# Almacenes a comparar: nombre -> (fábrica, tamaño máximo razonable o None).
+# Como en BACKENDS_VOTANTES, cada fábrica recibe el tamaño esperado o None.
+ALMACENES = {}
+
+
+def registrar_almacen(nombre, fabrica, max_n=None):
+    """Agrega un almacén a la comparación. Los tamaños mayores que max_n se
+    omiten para ese almacén (útil para estructuras O(n) por operación)."""
+    ALMACENES[nombre] = (fabrica, max_n)
+
+
+registrar_almacen("lista", lambda capacity_hint: ListaMap(), 10 ** 4)
+registrar_almacen("dict", lambda capacity_hint: DictMap())
+registrar_almacen("HashMapBase", lambda capacity_hint: HashMapBase(capacity_hint))
+registrar_almacen("ordenado", lambda capacity_hint: ArregloOrdenadoMap(), 10 ** 5)
+for _nombre, _fabrica in BACKENDS_VOTANTES.items():
+    registrar_almacen(_nombre, _fabrica)
+
+
+class Carga:
+    """Carga de trabajo de tamaño n: claves, valores y muestras."""
+
+    def __init__(self, n, semilla):
+        generador = GeneradorVotos(semilla)
+        m = min(n, MUESTRA)
+        self.n = n
+        self.claves = generador.dnis(n)
+        indices = {nombre: i for i, nombre in enumerate(generador.candidatos)}
+        self.valores = [indices[c] for c in generador.elegir_candidatos(n)]
+        self.presentes = generador.muestra(self.claves, m)
+        self.ausentes = generador.dnis(m)
+
+
+def _cargar(almacen, carga):
+    for k, v in zip(carga.claves, carga.valores):
+        almacen[k] = v
+    return almacen
+
+
+def medir_memoria(fabrica, carga):
+    """Retorna los bytes asignados por el almacén tras insertar la carga."""
+    tracemalloc.start()
+    try:
+        almacen = _cargar(fabrica(None), carga)
+        actual, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del almacen
+    return actual
+
+
+def medir_almacen(fabrica, carga, repeticiones):
+    """Mide un almacén con la carga. Genera (operación, número de
+    operaciones por repetición, tiempos)."""
+    yield "insercion", carga.n, medir(lambda almacen: _cargar(almacen, carga), repeticiones,
+                                      lambda: fabrica(None))
+    almacen = _cargar(fabrica(None), carga)
+
+    def buscar(claves):
+        for k in claves:
+            almacen[k]
+
+    yield "busqueda_acierto", len(carga.presentes), medir(lambda _: buscar(carga.presentes),
+                                                          repeticiones)
+    yield "busqueda_fallo", len(carga.ausentes), medir(lambda _: buscar(carga.ausentes),
+                                                       repeticiones)
+
+    valores = [almacen[k] for k in carga.presentes]
+
+    def restaurar():
+        if almacen[carga.presentes[0]] is None:
+            for k, v in zip(carga.presentes, valores):
+                almacen[k] = v
+
+    def eliminar(_):
+        for k in carga.presentes:
+            del almacen[k]
+
+    yield "eliminacion", len(carga.presentes), medir(eliminar, repeticiones, restaurar)
+
+
+def ejecutar(tamanios, almacenes, repeticiones=3, semilla=0, salida=sys.stdout):
+    """Compara los almacenes indicados y retorna la lista de mediciones."""
+    resultados = []
+    for n in tamanios:
+        carga = Carga(n, semilla)
+        for nombre in almacenes:
+            fabrica, max_n = ALMACENES[nombre]
+            if max_n is not None and n > max_n:
+                continue
+            memoria = medir_memoria(fabrica, carga)
+            for operacion, operaciones, tiempos in medir_almacen(fabrica, carga, repeticiones):
+                fila = {
+                    "almacen": nombre,
+                    "operacion": operacion,
+                    "n": n,
+                    "ns_por_operacion": statistics.median(tiempos) / operaciones * 1e9,
+                    "bytes_por_elemento": memoria / n,
+                }
+                resultados.append(fila)
+                if salida:
+                    print(f"{nombre:>15} {operacion:>17} n={n:<9} "
+                          f"{fila['ns_por_operacion']:>12.1f} ns/op "
+                          f"{fila['bytes_por_elemento']:>9.1f} B/elemento",
+                          file=salida, flush=True)
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comparación de almacenes de votantes.")
+    parser.add_argument("--min-n", type=int, default=10 ** 3, help="tamaño inicial")
+    parser.add_argument("--max-n", type=int, default=10 ** 6, help="tamaño final")
+    parser.add_argument("--almacen", action="append", choices=sorted(ALMACENES),
+                        help="almacén a comparar (repetible; por defecto, todos)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON donde guardar las mediciones")
+    args = parser.parse_args(argv)
+
+    tamanios = []
+    n = args.min_n
+    while n <= args.max_n:
+        tamanios.append(n)
+        n *= 10
+    resultados = ejecutar(tamanios, args.almacen or list(ALMACENES),
+                          args.repeticiones, args.semilla)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump({"semilla": args.semilla, "resultados": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Diario de votos de solo anexado (write-ahead log) para SistemaVotacion.
+
+Cada voto aceptado y cada eliminación se anotan como un registro binario
+de 7 bytes: operación (1 byte), DNI como entero (4 bytes) e id del
+candidato (2 bytes). La primera vez que aparece un id se anota antes un
+registro de candidato seguido de su nombre en UTF-8, de modo que el
+diario basta para reconstruir el registro de candidatos. Un voto emitido
+en una mesa del territorio va precedido de un registro de mesa con el id
+de la mesa; los nombres de las mesas no se anotan, así que para recuperar
+hay que pasar un sistema con el mismo Territorio.
+
+Cada registro se escribe en el archivo (una llamada write al sistema
+operativo) antes de que SistemaVotacion cuente el voto y lo confirme, así
+que una caída del proceso no pierde ningún voto confirmado; si la
+escritura falla, el sistema deshace el voto y propaga el error. Solo el
+fsync se agrupa (group commit): se hace uno cuando hay `grupo` registros
+sin sincronizar o cuando pasan `espera_maxima` segundos desde el último,
+lo que ocurra primero. Un hilo de fondo garantiza el fsync por tiempo
+aunque no lleguen más votos, así que un corte de energía pierde a lo sumo
+los votos de esa ventana.
+
+Uso:
+    diario = DiarioVotos("votos.diario")
+    sistema = SistemaVotacion(diario=diario)
+    ...
+    sistema, diario = recuperar("votos.diario")   # tras una caída
+"""
+
+import os
+import struct
+import threading
+import time
+
+from .sistema import SistemaVotacion, _BITS_CANDIDATO, _MASCARA_CANDIDATO
+
+CABECERA = b"VOTD\x01"             # Firma y versión del formato
+
+_VOTO = 1
+_ELIMINACION = 2
+_CANDIDATO = 3                     # El campo dni guarda el largo del nombre
+_MESA = 4                          # El campo dni guarda la mesa + 1 del voto siguiente
+_REGISTRO = struct.Struct("<BIH")
+
+
+class DiarioVotos:
+    """Diario binario de operaciones con fsync agrupado."""
+
+    def __init__(self, ruta, grupo=1000, espera_maxima=0.05):
+        self._ruta = ruta
+        self._grupo = grupo
+        self._espera_maxima = espera_maxima
+        self._archivo = open(ruta, "ab", buffering=0)     # Cada write va al sistema operativo
+        if self._archivo.tell() == 0:
+            self._escribir(CABECERA)
+        else:
+            _verificar_cabecera(ruta)
+        self._pendientes = 0
+        self._ultimo_sync = time.monotonic()
+        # Al reabrir un diario los nombres se vuelven a anotar; reproducir
+        # verifica que los registros repetidos coincidan
+        self._candidatos_anotados = 0
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._sincronizar_periodicamente, daemon=True)
+        self._hilo.start()
+
+    @property
+    def ruta(self):
+        return self._ruta
+
+    def anotar_voto(self, dni, cid, candidatos, mesa=-1):
+        """Anota el voto de dni por el candidato cid en la mesa con id mesa
+        (-1 si no tiene). candidatos es el RegistroCandidatos del sistema,
+        para anotar los nombres nuevos. Al retornar, el registro ya está en
+        el sistema operativo."""
+        self.anotar_votos([(dni, cid, mesa)], candidatos)
+
+    def anotar_votos(self, votos, candidatos):
+        """Anota una lista de votos (dni, cid, mesa) con una sola escritura."""
+        with self._lock:
+            datos = bytearray()
+            anotados = self._candidatos_anotados
+            for dni, cid, mesa in votos:
+                while anotados <= cid:
+                    nombre = candidatos.nombre(anotados).encode("utf-8")
+                    datos += _REGISTRO.pack(_CANDIDATO, len(nombre), anotados)
+                    datos += nombre
+                    anotados += 1
+                if mesa >= 0:
+                    datos += _REGISTRO.pack(_MESA, mesa + 1, 0)
+                datos += _REGISTRO.pack(_VOTO, int(dni), cid)
+            self._escribir(datos)
+            self._candidatos_anotados = anotados
+            self._anotado(len(votos))
+
+    def anotar_eliminacion(self, dni):
+        """Anota la eliminación del votante dni."""
+        with self._lock:
+            self._escribir(_REGISTRO.pack(_ELIMINACION, int(dni), 0))
+            self._anotado(1)
+
+    def _escribir(self, datos):
+        """Escribe datos al final del archivo. Si la escritura falla, recorta
+        lo que haya quedado a medias para no dejar un registro parcial antes
+        de los siguientes, y propaga el error."""
+        inicio = self._archivo.tell()
+        try:
+            vista = memoryview(datos)
+            while vista:
+                vista = vista[self._archivo.write(vista):]
+        except BaseException:
+            try:
+                self._archivo.truncate(inicio)
+                self._archivo.seek(inicio)
+            except OSError:
+                pass
+            raise
+
+    def _anotado(self, registros):
+        """Decide si el grupo pendiente debe sincronizarse ya."""
+        self._pendientes += registros
+        if (self._pendientes >= self._grupo
+                or time.monotonic() - self._ultimo_sync >= self._espera_maxima):
+            self._sincronizar()
+
+    def sincronizar(self):
+        """Sincroniza en disco todos los registros escritos."""
+        with self._lock:
+            self._sincronizar()
+
+    def _sincronizar(self):
+        if self._pendientes:
+            os.fsync(self._archivo.fileno())
+        self._pendientes = 0
+        self._ultimo_sync = time.monotonic()
+
+    def _sincronizar_periodicamente(self):
+        while not self._detener.wait(self._espera_maxima):
+            with self._lock:
+                if self._pendientes and time.monotonic() - self._ultimo_sync >= self._espera_maxima:
+                    self._sincronizar()
+
+    def posicion(self):
+        """Retorna el tamaño en bytes del diario."""
+        with self._lock:
+            return self._archivo.tell()
+
+    def cerrar(self):
+        """Sincroniza lo pendiente y cierra el archivo."""
+        self._detener.set()
+        self._hilo.join()
+        with self._lock:
+            if not self._archivo.closed:
+                self._sincronizar()
+                self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def _verificar_cabecera(ruta):
+    with open(ruta, "rb") as f:
+        if f.read(len(CABECERA)) != CABECERA:
+            raise ValueError(f"{ruta} no es un diario de votos válido")
+
+
+def reproducir(sistema, ruta, desde=None):
+    """Aplica a sistema las operaciones del diario a partir de la posición
+    desde (por defecto, el inicio). Los registros se aplican directamente
+    sobre votantes y resultados, sin validar de nuevo ni volver a anotarlos,
+    y el almacén se reserva de una vez según el tamaño del diario. La
+    clasificación se reconstruye una sola vez al final.
+
+    Retorna la posición del final del último registro completo; un registro
+    parcial al final (escritura interrumpida por una caída) se ignora.
+    """
+    _verificar_cabecera(ruta)
+    with open(ruta, "rb") as f:
+        datos = f.read()
+    pos = len(CABECERA) if desde is None else desde
+    votantes = sistema.votantes
+    resultados = sistema.resultados
+    candidatos = sistema.candidatos
+    territorio = sistema.territorio
+    votantes.reserve(len(votantes) + (len(datos) - pos) // _REGISTRO.size)
+    put_if_absent = votantes.put_if_absent
+    unpack_from = _REGISTRO.unpack_from
+    tam = _REGISTRO.size
+    fin = len(datos)
+    while pos + tam <= fin:
+        op, dni, cid = unpack_from(datos, pos)
+        if op == _VOTO:
+            if put_if_absent(f"{dni:08d}", cid):
+                resultados[cid] += 1
+        elif op == _MESA:
+            if pos + 2 * tam > fin:
+                break                      # Voto truncado
+            if territorio is None or dni > len(territorio):
+                raise ValueError(f"El diario tiene votos en la mesa {dni - 1}, que no "
+                                 f"está en el territorio del sistema")
+            m = dni - 1
+            pos += tam
+            op, dni, cid = unpack_from(datos, pos)
+            if op != _VOTO:
+                raise ValueError(f"Registro de mesa sin voto en la posición {pos} del diario")
+            if put_if_absent(f"{dni:08d}", cid | (m + 1) << _BITS_CANDIDATO):
+                resultados[cid] += 1
+                territorio.sumar(m, cid, 1)
+        elif op == _ELIMINACION:
+            clave = f"{dni:08d}"
+            anterior = votantes[clave]
+            if anterior is not None:
+                del votantes[clave]
+                resultados[anterior & _MASCARA_CANDIDATO] -= 1
+                if anterior > _MASCARA_CANDIDATO:
+                    territorio.sumar((anterior >> _BITS_CANDIDATO) - 1,
+                                     anterior & _MASCARA_CANDIDATO, -1)
+        elif op == _CANDIDATO:
+            if pos + tam + dni > fin:
+                break                      # Nombre truncado
+            nombre = datos[pos + tam:pos + tam + dni].decode("utf-8")
+            pos += dni
+            if cid < len(candidatos):
+                if candidatos.nombre(cid) != nombre:
+                    raise ValueError(f"El candidato {cid} del diario ({nombre!r}) no coincide "
+                                     f"con el registro ({candidatos.nombre(cid)!r})")
+            else:
+                if candidatos.registrar(nombre) != cid:
+                    raise ValueError(f"Ids de candidato no consecutivos en el diario: {cid}")
+                sistema._ampliar_resultados(cid)
+        else:
+            raise ValueError(f"Registro desconocido en la posición {pos} del diario")
+        pos += tam
+    sistema.clasificacion.reconstruir(resultados)
+    return pos
+
+
+def recuperar(ruta, sistema=None, desde=None, **opciones):
+    """Reconstruye un sistema desde el diario tras una caída.
+
+    Reproduce el diario sobre sistema (o sobre un SistemaVotacion nuevo)
+    desde la posición indicada (por ejemplo, la de una instantánea),
+    descarta un posible registro parcial al final, y retorna (sistema,
+    diario) con el diario reabierto y conectado al sistema. opciones se
+    pasa a DiarioVotos.
+    """
+    if sistema is None:
+        sistema = SistemaVotacion()
+    fin = reproducir(sistema, ruta, desde)
+    with open(ruta, "r+b") as f:
+        f.truncate(fin)
+    sistema.diario = DiarioVotos(ruta, **opciones)
+    return sistema, sistema.diario
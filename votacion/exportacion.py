@@ -0,0 +1,273 @@
+"""Exportación por bloques del padrón de votantes y de los resultados.
+
+El padrón se recorre directamente sobre las cubetas del almacén (con
+iter_chunks en HashMapBase y ProbeHashMap, o con el generador items() en
+los demás) y se escribe en bloques de unas tam_bloque filas, así que la
+memoria usada no depende del tamaño del padrón. Formatos:
+
+    csv        dni,candidato (y mesa, si el sistema tiene territorio)
+    ndjson     {"dni": ..., "candidato": ...} por línea
+    columnar   binario: candidatos y conteos, y luego bloques de columnas
+               (DNIs como uint32 y valores como uint64), legible con leer_columnar o
+               directamente con numpy.frombuffer
+
+Si la ruta termina en .gz (o con comprimir=True) la salida se comprime con
+gzip. Los resultados (nacionales y, si hay territorio, por mesa, distrito
+y región) se exportan con exportar_resultados en csv o ndjson.
+
+La exportación lee el sistema mientras se recorre; si hay escrituras
+concurrentes conviene exportar desde sistema.vista(), que congela votantes
+y conteos sin detener la ingesta.
+
+Uso:
+    python -m votacion.exportacion votos.snap padron.csv.gz
+    python -m votacion.exportacion votos.snap resultados.ndjson --resultados
+    python -m votacion.exportacion votos.snap padron.col --territorio mesas.csv
+
+Una instantánea con conteos por mesa necesita el territorio con el que se
+guardó (--territorio, un CSV mesa,distrito,region; ver leer_territorio).
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import struct
+import time
+from array import array
+from itertools import islice
+
+from .sistema import _BITS_CANDIDATO, _MASCARA_CANDIDATO
+from .territorio import MESA, DISTRITO, REGION, Territorio
+
+TAM_BLOQUE = 65536
+NIVEL_GZIP = 6
+
+FIRMA = b"VOTCOL\x00\x00"
+VERSION = 2                        # 2: valores uint64 (la mesa no cabe en 16 bits)
+_CABECERA = struct.Struct("<8sBH")
+_LARGO = struct.Struct("<H")
+_BLOQUE = struct.Struct("<I")
+
+_EXTENSIONES = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".col": "columnar"}
+
+
+def detectar_formato(ruta):
+    """Deduce el formato a partir de la extensión (ignorando un .gz final)."""
+    base = ruta[:-3] if ruta.endswith(".gz") else ruta
+    formato = _EXTENSIONES.get(os.path.splitext(base)[1].lower())
+    if formato is None:
+        raise ValueError(f"No se reconoce el formato de exportación: {ruta}")
+    return formato
+
+
+def _abrir(ruta, comprimir):
+    if comprimir is None:
+        comprimir = ruta.endswith(".gz")
+    if comprimir:
+        return gzip.open(ruta, "wb", compresslevel=NIVEL_GZIP)
+    return open(ruta, "wb")
+
+
+def _bloques(votantes, tam_bloque):
+    """Genera listas de unos tam_bloque pares (dni, valor) del almacén."""
+    if hasattr(votantes, "iter_chunks"):
+        yield from votantes.iter_chunks(tam_bloque)
+        return
+    iterador = iter(votantes.items())
+    while True:
+        bloque = list(islice(iterador, tam_bloque))
+        if not bloque:
+            return
+        yield bloque
+
+
+def _campo_csv(texto):
+    """Cita un campo CSV si contiene comas, comillas o saltos de línea."""
+    if any(c in texto for c in ',"\r\n'):
+        return '"' + texto.replace('"', '""') + '"'
+    return texto
+
+
+def _nombres_mesa(sistema):
+    """Retorna la lista de nombres de mesa indexada por valor >> 16 (el 0
+    es "sin mesa"), o None si el sistema no tiene territorio."""
+    if sistema.territorio is None:
+        return None
+    return [""] + sistema.territorio.nombres(MESA)
+
+
+def _lineas_csv(bloque, nombres, mesas):
+    if mesas is None:
+        return "".join([f"{dni},{nombres[v]}\n" for dni, v in bloque])
+    return "".join([f"{dni},{nombres[v & _MASCARA_CANDIDATO]},{mesas[v >> _BITS_CANDIDATO]}\n"
+                    for dni, v in bloque])
+
+
+def _lineas_ndjson(bloque, nombres, mesas):
+    if mesas is None:
+        return "".join([f'{{"dni": "{dni}", "candidato": {nombres[v]}}}\n'
+                        for dni, v in bloque])
+    return "".join([f'{{"dni": "{dni}", "candidato": {nombres[v & _MASCARA_CANDIDATO]}, '
+                    f'"mesa": {mesas[v >> _BITS_CANDIDATO]}}}\n' for dni, v in bloque])
+
+
+def _escribir_cabecera_columnar(salida, sistema):
+    salida.write(_CABECERA.pack(FIRMA, VERSION, len(sistema.candidatos)))
+    for nombre in sistema.candidatos:
+        codificado = nombre.encode("utf-8")
+        salida.write(_LARGO.pack(len(codificado)) + codificado)
+    salida.write(array("q", sistema.resultados).tobytes())
+
+
+def exportar_padron(sistema, ruta, formato=None, comprimir=None, tam_bloque=TAM_BLOQUE):
+    """Escribe el padrón de votantes en ruta y retorna el número de filas.
+
+    formato es "csv", "ndjson" o "columnar" (por defecto, según la
+    extensión). Solo se mantiene en memoria un bloque de tam_bloque filas.
+    """
+    formato = formato or detectar_formato(ruta)
+    nombres = list(sistema.candidatos)
+    mesas = _nombres_mesa(sistema)
+    # Los nombres se preparan una sola vez, no una vez por fila
+    if formato == "csv":
+        nombres = [_campo_csv(nombre) for nombre in nombres]
+        if mesas is not None:
+            mesas = [_campo_csv(mesa) for mesa in mesas]
+    elif formato == "ndjson":
+        nombres = [json.dumps(nombre, ensure_ascii=False) for nombre in nombres]
+        if mesas is not None:
+            mesas = ["null"] + [json.dumps(mesa, ensure_ascii=False) for mesa in mesas[1:]]
+    elif formato != "columnar":
+        raise ValueError(f"Formato de exportación desconocido: {formato!r}")
+    filas = 0
+    with _abrir(ruta, comprimir) as salida:
+        if formato == "csv":
+            salida.write(b"dni,candidato\n" if mesas is None else b"dni,candidato,mesa\n")
+        elif formato == "columnar":
+            _escribir_cabecera_columnar(salida, sistema)
+        for bloque in _bloques(sistema.votantes, tam_bloque):
+            filas += len(bloque)
+            if formato == "columnar":
+                salida.write(_BLOQUE.pack(len(bloque)))
+                salida.write(array("I", [int(dni) for dni, _ in bloque]).tobytes())
+                salida.write(array("Q", [v for _, v in bloque]).tobytes())
+            elif formato == "csv":
+                salida.write(_lineas_csv(bloque, nombres, mesas).encode("utf-8"))
+            else:
+                salida.write(_lineas_ndjson(bloque, nombres, mesas).encode("utf-8"))
+        if formato == "columnar":
+            salida.write(_BLOQUE.pack(0))  # Fin de los bloques
+    return filas
+
+
+def leer_columnar(ruta):
+    """Lee un archivo columnar (comprimido o no). Retorna (candidatos,
+    conteos, bloques): la lista de nombres, un array("q") con los conteos
+    y un generador de pares (dnis, valores) por bloque, de array("I") y
+    array("Q").
+    El valor de un votante es el id del candidato, más la mesa + 1
+    desplazada 16 bits si votó en una mesa del territorio."""
+    entrada = gzip.open(ruta, "rb") if ruta.endswith(".gz") else open(ruta, "rb")
+    try:
+        firma, version, n_candidatos = _CABECERA.unpack(entrada.read(_CABECERA.size))
+        if firma != FIRMA or version != VERSION:
+            raise ValueError(f"{ruta} no es una exportación columnar válida")
+        candidatos = []
+        for _ in range(n_candidatos):
+            (largo,) = _LARGO.unpack(entrada.read(_LARGO.size))
+            candidatos.append(entrada.read(largo).decode("utf-8"))
+        conteos = array("q")
+        conteos.frombytes(entrada.read(8 * n_candidatos))
+    except BaseException:
+        entrada.close()
+        raise
+
+    def bloques():
+        with entrada:
+            while True:
+                (n,) = _BLOQUE.unpack(entrada.read(_BLOQUE.size))
+                if not n:
+                    return
+                dnis, valores = array("I"), array("Q")
+                dnis.frombytes(entrada.read(4 * n))
+                valores.frombytes(entrada.read(8 * n))
+                yield dnis, valores
+
+    return candidatos, conteos, bloques()
+
+
+def _filas_resultados(sistema):
+    """Genera (nivel, nombre, conteos) para el total nacional y para cada
+    nodo del territorio."""
+    yield "nacional", "", sistema.resultados
+    territorio = sistema.territorio
+    if territorio is not None:
+        for nivel in (REGION, DISTRITO, MESA):
+            for nombre in territorio.nombres(nivel):
+                yield nivel, nombre, territorio.conteos(nivel, nombre)
+
+
+def exportar_resultados(sistema, ruta, formato=None, comprimir=None):
+    """Escribe los resultados (nacionales y por región, distrito y mesa)
+    en ruta, en csv (nivel,nombre,candidato,votos) o ndjson (un objeto por
+    nodo). Retorna el número de nodos escritos."""
+    formato = formato or detectar_formato(ruta)
+    if formato not in ("csv", "ndjson"):
+        raise ValueError(f"Los resultados se exportan en csv o ndjson, no {formato!r}")
+    candidatos = list(sistema.candidatos)
+    nodos = 0
+    with _abrir(ruta, comprimir) as salida:
+        if formato == "csv":
+            salida.write(b"nivel,nombre,candidato,votos\n")
+        for nivel, nombre, conteos in _filas_resultados(sistema):
+            nodos += 1
+            if formato == "csv":
+                texto = "".join(f"{nivel},{_campo_csv(nombre)},{_campo_csv(candidato)},{votos}\n"
+                                for candidato, votos in zip(candidatos, conteos))
+            else:
+                texto = json.dumps({"nivel": nivel, "nombre": nombre,
+                                    "resultados": dict(zip(candidatos, conteos))},
+                                   ensure_ascii=False) + "\n"
+            salida.write(texto.encode("utf-8"))
+    return nodos
+
+
+def leer_territorio(ruta):
+    """Construye un Territorio desde un CSV con encabezado mesa,distrito,region
+    (una fila por mesa, en el orden de registro de las mesas)."""
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        filas = csv.DictReader(archivo)
+        faltan = {MESA, DISTRITO, REGION} - set(filas.fieldnames or ())
+        if faltan:
+            raise ValueError(f"{ruta}: faltan las columnas {', '.join(sorted(faltan))}")
+        return Territorio((fila[MESA], fila[DISTRITO], fila[REGION]) for fila in filas)
+
+
+def main(argv=None):
+    from .instantanea import cargar_instantanea
+
+    parser = argparse.ArgumentParser(description="Exporta el padrón o los resultados de una instantánea.")
+    parser.add_argument("instantanea", help="archivo de instantánea (votacion.instantanea)")
+    parser.add_argument("salida", help="archivo .csv, .ndjson o .col, opcionalmente terminado en .gz")
+    parser.add_argument("--formato", choices=("csv", "ndjson", "columnar"))
+    parser.add_argument("--resultados", action="store_true", help="exporta los resultados en lugar del padrón")
+    parser.add_argument("--bloque", type=int, default=TAM_BLOQUE, help="filas por bloque")
+    parser.add_argument("--territorio", help="CSV mesa,distrito,region con las mesas de la instantánea")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    territorio = leer_territorio(args.territorio) if args.territorio else None
+    sistema = cargar_instantanea(args.instantanea, territorio=territorio)
+    if args.resultados:
+        filas = exportar_resultados(sistema, args.salida, args.formato)
+    else:
+        filas = exportar_padron(sistema, args.salida, args.formato, tam_bloque=args.bloque)
+    segundos = time.perf_counter() - inicio
+    unidad = "nodos" if args.resultados else "filas"
+    print(f"[Exportación] {filas} {unidad} en {segundos:.3f} segundos -> {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
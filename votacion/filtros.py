@@ -0,0 +1,256 @@
+"""Filtro cuckoo para descartar DNIs nuevos antes de buscarlos en la tabla.
+
+El día de la elección casi todos los votos son de DNIs que todavía no
+votaron, y cada uno recorre igual la cadena (o la secuencia de sondeo) de
+su cubeta para comprobarlo. Un filtro cuckoo responde "seguro que no está"
+o "puede estar" mirando dos cubetas de 4 huellas: si responde que no, la
+clave se inserta sin buscarla en la tabla; solo las posibles presencias
+(votos repetidos y falsos positivos) hacen la búsqueda exacta. A
+diferencia de un filtro de Bloom, admite eliminaciones, que
+eliminar_votante necesita.
+
+En CPython consultar el filtro cuesta casi lo mismo que buscar en una
+tabla con poca carga (ambos son un puñado de operaciones interpretadas),
+así que el filtro está desactivado por defecto: conviene cuando la
+búsqueda exacta es cara (cadenas largas, muchas lápidas en el sondeo o un
+almacén más lento que la tabla en memoria).
+
+Uso:
+    sistema = SistemaVotacion(capacity_hint=n, filtro=0.01)
+"""
+
+import math
+from array import array
+
+from .mapas import hash_fnv
+
+_ENTRADAS = 4                  # Huellas por cubeta
+_OCUPACION = 0.95              # Ocupación máxima alcanzable con 4 huellas por cubeta
+_MAX_DESALOJOS = 500
+_MEZCLA = 0x9E3779B97F4A7C15   # Impar: x -> x * _MEZCLA mod 2^64 es biyectiva
+_MASCARA_64 = (1 << 64) - 1
+
+
+class FiltroLleno(Exception):
+    """No se pudo ubicar una huella tras _MAX_DESALOJOS desalojos."""
+
+
+class FiltroCuckoo:
+    """Filtro cuckoo de huellas de f bits en cubetas de 4 entradas.
+
+    capacidad es el número esperado de claves; el número de cubetas es la
+    potencia de 2 que las aloja con ocupación menor que 95 %. El largo de
+    las huellas sale de tasa_falsos_positivos: con 2 cubetas de 4 entradas
+    la tasa es a lo sumo 8 / 2^f, así que f = log2(8 / tasa) bits (entre 4
+    y 16). Las huellas se guardan en un array("H"), sin objetos por clave.
+    """
+
+    def __init__(self, capacidad, tasa_falsos_positivos=0.01):
+        if not 0 < tasa_falsos_positivos < 1:
+            raise ValueError("tasa_falsos_positivos debe estar entre 0 y 1")
+        self._bits_huella = min(16, max(4, math.ceil(math.log2(2 * _ENTRADAS / tasa_falsos_positivos))))
+        self._mascara_huella = (1 << self._bits_huella) - 1
+        cubetas = max(1, math.ceil(capacidad / (_ENTRADAS * _OCUPACION)))
+        self._bits_indice = max(1, (cubetas - 1).bit_length())
+        self._mascara_indice = (1 << self._bits_indice) - 1
+        self._huellas = array("H", bytes(2 * _ENTRADAS << self._bits_indice))
+        self._n = 0
+        self.capacidad = capacidad
+        self.tasa_falsos_positivos = tasa_falsos_positivos
+
+    def _indice_y_huella(self, k):
+        """Retorna (cubeta, huella) de la clave; la huella nunca es 0."""
+        if len(k) == 8 and k.isdecimal():
+            x = int(k)
+        else:
+            x = hash_fnv(k)
+        h = (x * _MEZCLA) & _MASCARA_64    # Los bits altos quedan bien mezclados
+        indice = h >> (64 - self._bits_indice)
+        huella = (h >> (64 - self._bits_indice - self._bits_huella)) & self._mascara_huella
+        return indice, huella or 1
+
+    def _alternativa(self, indice, huella):
+        """La otra cubeta de una huella; aplicada dos veces vuelve a indice."""
+        return indice ^ ((huella * 0x5BD1E995) & self._mascara_indice)
+
+    def _en_cubeta(self, indice, huella):
+        inicio = indice * _ENTRADAS
+        return huella in self._huellas[inicio:inicio + _ENTRADAS]
+
+    def puede_contener(self, k):
+        """False si k seguro no está; True si puede estar."""
+        indice, huella = self._indice_y_huella(k)
+        return (self._en_cubeta(indice, huella)
+                or self._en_cubeta(self._alternativa(indice, huella), huella))
+
+    def _ubicar(self, indice, huella):
+        """Guarda la huella en una entrada libre de la cubeta, si la hay."""
+        huellas = self._huellas
+        inicio = indice * _ENTRADAS
+        for j in range(inicio, inicio + _ENTRADAS):
+            if not huellas[j]:
+                huellas[j] = huella
+                return True
+        return False
+
+    def agregar(self, k):
+        """Agrega la huella de k. Si no hay lugar tras _MAX_DESALOJOS
+        desalojos lanza FiltroLleno; el filtro queda inservible (perdió una
+        huella) y debe reconstruirse."""
+        indice, huella = self._indice_y_huella(k)
+        alternativa = self._alternativa(indice, huella)
+        if self._ubicar(indice, huella) or self._ubicar(alternativa, huella):
+            self._n += 1
+            return
+        huellas = self._huellas
+        indice = alternativa
+        for desalojo in range(_MAX_DESALOJOS):
+            j = indice * _ENTRADAS + desalojo % _ENTRADAS
+            huella, huellas[j] = huellas[j], huella
+            indice = self._alternativa(indice, huella)
+            if self._ubicar(indice, huella):
+                self._n += 1
+                return
+        raise FiltroLleno(f"Filtro cuckoo lleno con {self._n} huellas")
+
+    def eliminar(self, k):
+        """Quita una huella de k. Solo debe llamarse con claves agregadas."""
+        indice, huella = self._indice_y_huella(k)
+        huellas = self._huellas
+        for cubeta in (indice, self._alternativa(indice, huella)):
+            inicio = cubeta * _ENTRADAS
+            for j in range(inicio, inicio + _ENTRADAS):
+                if huellas[j] == huella:
+                    huellas[j] = 0
+                    self._n -= 1
+                    return True
+        return False
+
+    def __len__(self):
+        return self._n
+
+    def bytes_usados(self):
+        return len(self._huellas) * self._huellas.itemsize
+
+
+class MapaFiltrado:
+    """Almacén de votantes con un FiltroCuckoo delante.
+
+    Ofrece la misma interfaz que HashMapBase. put_if_absent y __getitem__
+    consultan primero el filtro: si descarta la clave, la inserción usa
+    _put_new del almacén (sin recorrer la cubeta) y la búsqueda retorna
+    None sin tocar la tabla. Si el filtro se llena (o se supera su
+    capacidad) se reconstruye con el doble de capacidad desde las claves
+    del almacén, como una tabla hash al redimensionarse.
+
+    El almacén debe implementar _put_new (HashMapBase y ProbeHashMap).
+    """
+
+    def __init__(self, mapa, capacidad=None, tasa_falsos_positivos=0.01):
+        self._mapa = mapa
+        self._tasa = tasa_falsos_positivos
+        self._filtro = FiltroCuckoo(max(capacidad or 0, len(mapa), 1024), tasa_falsos_positivos)
+        for k in mapa:
+            self._filtro.agregar(k)
+        self.descartes = 0                 # Claves que el filtro descartó
+        self.falsos_positivos = 0          # "Puede estar" que no estaba
+
+    def _reconstruir(self, capacidad):
+        while True:
+            filtro = FiltroCuckoo(capacidad, self._tasa)
+            try:
+                for k in self._mapa:
+                    filtro.agregar(k)
+            except FiltroLleno:
+                capacidad *= 2
+                continue
+            self._filtro = filtro
+            return
+
+    def _agregar(self, k):
+        if len(self._filtro) >= self._filtro.capacidad:
+            self._reconstruir(2 * self._filtro.capacidad)
+            return                         # La reconstrucción ya incluye k
+        try:
+            self._filtro.agregar(k)
+        except FiltroLleno:
+            self._reconstruir(2 * self._filtro.capacidad)
+
+    def put_if_absent(self, k, v):
+        """Inserta v en la clave k solo si k no existe. Retorna True si se
+        insertó y False si la clave ya estaba."""
+        if not self._filtro.puede_contener(k):
+            self.descartes += 1
+            self._mapa._put_new(k, v)
+        elif self._mapa.put_if_absent(k, v):
+            self.falsos_positivos += 1
+        else:
+            return False
+        self._agregar(k)
+        return True
+
+    def __setitem__(self, k, v):
+        """Inserta o actualiza el valor v en la clave k."""
+        if self._filtro.puede_contener(k) and self._mapa[k] is not None:
+            self._mapa[k] = v
+        else:
+            self.put_if_absent(k, v)
+
+    def __getitem__(self, k):
+        """Retorna el valor asociado a la clave k si existe."""
+        if not self._filtro.puede_contener(k):
+            self.descartes += 1
+            return None
+        v = self._mapa[k]
+        if v is None:
+            self.falsos_positivos += 1
+        return v
+
+    def pop(self, k):
+        """Elimina la clave k y retorna su valor, o None si no existía."""
+        if not self._filtro.puede_contener(k):
+            return None
+        v = self._mapa.pop(k)
+        if v is not None:
+            self._filtro.eliminar(k)
+        return v
+
+    def __delitem__(self, k):
+        """Elimina el elemento con clave k."""
+        if self.pop(k) is None:
+            raise KeyError("Key Error: " + repr(k))
+
+    def __contains__(self, k):
+        return self[k] is not None
+
+    def __len__(self):
+        return len(self._mapa)
+
+    def __iter__(self):
+        return iter(self._mapa)
+
+    def items(self):
+        return self._mapa.items()
+
+    def reserve(self, n):
+        """Reserva espacio en el almacén y en el filtro para n elementos."""
+        self._mapa.reserve(n)
+        if n > self._filtro.capacidad:
+            self._reconstruir(n)
+
+    def estadisticas_filtro(self):
+        """Retorna el tamaño del filtro y cuántas consultas resolvió."""
+        return {
+            "huellas": len(self._filtro),
+            "capacidad": self._filtro.capacidad,
+            "bytes": self._filtro.bytes_usados(),
+            "tasa_objetivo": self._tasa,
+            "descartes": self.descartes,
+            "falsos_positivos": self.falsos_positivos,
+        }
+
+    def __getattr__(self, nombre):
+        # Métodos propios del almacén (por ejemplo, bucket_occupancy)
+        if nombre == "_mapa":
+            raise AttributeError(nombre)
+        return getattr(self._mapa, nombre)
@@ -0,0 +1,175 @@
+"""SistemaVotacion fragmentado en varios procesos para usar todos los núcleos.
+
+Los DNIs se reparten entre N procesos trabajadores según hash_dni(dni) % N.
+Cada trabajador tiene su propio SistemaVotacion (su tabla de votantes y sus
+resultados parciales), así que un mismo DNI siempre llega al mismo proceso
+y la verificación de voto duplicado sigue siendo local. El coordinador
+envía los votos por lotes a todos los trabajadores a la vez, espera sus
+códigos de estado y los reordena; los resultados se obtienen sumando los
+parciales por nombre de candidato.
+
+Uso:
+    with SistemaFragmentado(4, candidatos=["A", "B", "C"]) as sistema:
+        codigos = sistema.registrar_votos_lote(dnis, candidatos)
+        print(sistema.mostrar_resultados())
+"""
+
+import multiprocessing
+import os
+
+from .mapas import hash_dni
+from .sistema import SistemaVotacion
+
+
+def _trabajador(conexion, opciones):
+    """Bucle de un proceso trabajador: atiende comandos hasta recibir "cerrar"."""
+    sistema = SistemaVotacion(**opciones)
+    while True:
+        comando, *argumentos = conexion.recv()
+        if comando == "cerrar":
+            conexion.close()
+            return
+        try:
+            respuesta = _atender(sistema, comando, argumentos)
+        except Exception as error:         # Se devuelve al coordinador
+            respuesta = error
+        conexion.send(respuesta)
+
+
+def _atender(sistema, comando, argumentos):
+    """Ejecuta un comando del coordinador sobre el sistema del fragmento."""
+    if comando == "lote":
+        return bytes(sistema.registrar_votos_lote(*argumentos))
+    if comando == "voto":
+        return sistema.registrar_voto(*argumentos)
+    if comando == "eliminar":
+        return sistema.eliminar_votante(*argumentos)
+    if comando == "consultar":
+        return sistema.candidato_de(argumentos[0])
+    if comando == "resultados":
+        return sistema.mostrar_resultados()
+    if comando == "total":
+        return sistema.total_votantes()
+    raise ValueError(f"Comando desconocido: {comando!r}")
+
+
+class SistemaFragmentado:
+    """Coordinador de un SistemaVotacion repartido entre procesos.
+
+    Ofrece la misma interfaz que SistemaVotacion (registrar_voto,
+    registrar_votos_lote, eliminar_votante, total_votantes y
+    mostrar_resultados) además de consultar_votante. capacity_hint es el
+    tamaño esperado del padrón completo y se reparte entre los fragmentos.
+    """
+
+    def __init__(self, n_fragmentos=None, candidatos=None, backend="encadenamiento",
+                 capacity_hint=None):
+        self._n = n_fragmentos or os.cpu_count() or 1
+        opciones = {
+            "capacity_hint": capacity_hint // self._n + 1 if capacity_hint else None,
+            "backend": backend,
+            "candidatos": candidatos,
+        }
+        self._conexiones = []
+        self._procesos = []
+        for _ in range(self._n):
+            local, remota = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(target=_trabajador, args=(remota, opciones),
+                                              daemon=True)
+            proceso.start()
+            remota.close()
+            self._conexiones.append(local)
+            self._procesos.append(proceso)
+
+    @property
+    def n_fragmentos(self):
+        return self._n
+
+    def fragmento(self, dni):
+        """Retorna el índice del fragmento dueño del DNI."""
+        return hash_dni(dni) % self._n if isinstance(dni, str) else 0
+
+    def _recibir(self, i):
+        respuesta = self._conexiones[i].recv()
+        if isinstance(respuesta, Exception):
+            raise respuesta
+        return respuesta
+
+    def _pedir(self, i, *comando):
+        self._conexiones[i].send(comando)
+        return self._recibir(i)
+
+    def _pedir_a_todos(self, *comando):
+        for conexion in self._conexiones:
+            conexion.send(comando)
+        return [self._recibir(i) for i in range(self._n)]
+
+    def registrar_voto(self, dni, candidato):
+        """Registra un voto en el fragmento dueño del DNI."""
+        return self._pedir(self.fragmento(dni), "voto", dni, candidato)
+
+    def registrar_votos_lote(self, dnis, candidatos):
+        """Reparte el lote entre los fragmentos, que lo procesan en paralelo,
+        y retorna los códigos de estado en el orden original."""
+        if len(dnis) != len(candidatos):
+            raise ValueError("dnis y candidatos deben tener la misma longitud")
+        filas = [[] for _ in range(self._n)]
+        sub_dnis = [[] for _ in range(self._n)]
+        sub_candidatos = [[] for _ in range(self._n)]
+        fragmento = self.fragmento
+        for i, (dni, candidato) in enumerate(zip(dnis, candidatos)):
+            f = fragmento(dni)
+            filas[f].append(i)
+            sub_dnis[f].append(dni)
+            sub_candidatos[f].append(candidato)
+        activos = [f for f in range(self._n) if filas[f]]
+        for f in activos:
+            self._conexiones[f].send(("lote", sub_dnis[f], sub_candidatos[f]))
+        respuestas = {}
+        for f in activos:                  # Se reciben todas antes de fallar
+            try:
+                respuestas[f] = self._recibir(f)
+            except Exception as error:
+                respuestas[f] = error
+        codigos = bytearray(len(dnis))
+        for f in activos:
+            if isinstance(respuestas[f], Exception):
+                raise respuestas[f]
+            for i, codigo in zip(filas[f], respuestas[f]):
+                codigos[i] = codigo
+        return codigos
+
+    def eliminar_votante(self, dni):
+        """Elimina al votante en el fragmento dueño del DNI."""
+        return self._pedir(self.fragmento(dni), "eliminar", dni)
+
+    def consultar_votante(self, dni):
+        """Retorna el candidato votado por el DNI, o None si no votó."""
+        return self._pedir(self.fragmento(dni), "consultar", dni)
+
+    def total_votantes(self):
+        """Suma los votantes de todos los fragmentos."""
+        return sum(self._pedir_a_todos("total"))
+
+    def mostrar_resultados(self):
+        """Combina los resultados parciales de todos los fragmentos."""
+        resultados = {}
+        for parcial in self._pedir_a_todos("resultados"):
+            for candidato, votos in parcial.items():
+                resultados[candidato] = resultados.get(candidato, 0) + votos
+        return resultados
+
+    def cerrar(self):
+        """Detiene los procesos trabajadores."""
+        for conexion in self._conexiones:
+            if not conexion.closed:
+                conexion.send(("cerrar",))
+                conexion.close()
+        for proceso in self._procesos:
+            proceso.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,225 @@
+"""Generador de cargas de votos sintéticas, reproducible y rápido.
+
+Los DNIs salen de una permutación afín de 0..10^8-1 elegida con la
+semilla, i -> (a*i + b) mod 10^8 con a coprimo con 10^8: el i-ésimo DNI
+se calcula en O(1), los n primeros son distintos sin tener que
+comprobarlo, y un votante repetido o eliminado se elige como un índice ya
+emitido, sin guardar los DNIs anteriores. Los candidatos se eligen con
+cuotas fijas o con una distribución de Zipf, y se pueden mezclar DNIs
+inválidos, votantes repetidos y eliminaciones en la proporción deseada.
+
+Con NumPy (opcional) todo se genera de forma vectorizada; sin NumPy se
+usa random.Random con la misma semilla. Los DNIs son los mismos en ambos
+casos, pero los candidatos y las filas inválidas o repetidas no.
+
+Uso:
+    generador = GeneradorVotos(semilla=1, zipf=1.2, tasa_repetidos=0.05)
+    dnis, candidatos = generador.lote(100000)
+    sistema.registrar_votos_lote(dnis, candidatos)
+"""
+
+import argparse
+import random
+import time
+
+from .sistema import _numpy
+
+CANDIDATOS = ("A", "B", "C", "D", "E")
+
+_ESPACIO_DNI = 10 ** 8
+_POTENCIAS = tuple(10 ** k for k in range(7, -1, -1))
+# Formas de DNI inválido, a partir de un DNI válido d
+_INVALIDOS = (
+    lambda d: d[:7],                       # Un dígito de menos
+    lambda d: d + "0",                     # Un dígito de más
+    lambda d: "A" + d[1:],                 # Con letras
+    lambda d: "-" + d[1:],                 # Negativo
+    lambda d: "",                          # Vacío
+)
+
+
+class GeneradorVotos:
+    """Genera DNIs únicos, candidatos y mezclas de operaciones.
+
+    semilla fija la permutación de DNIs y la secuencia aleatoria. Los
+    candidatos se eligen uniformemente, o según cuotas (una proporción por
+    candidato, no hace falta que sumen 1), o con probabilidad proporcional
+    a 1 / rango^zipf. tasa_invalidos, tasa_repetidos y tasa_eliminaciones
+    son fracciones de las filas generadas por lote() y operaciones().
+    """
+
+    def __init__(self, semilla=0, candidatos=CANDIDATOS, cuotas=None, zipf=None,
+                 tasa_invalidos=0.0, tasa_repetidos=0.0, tasa_eliminaciones=0.0,
+                 usar_numpy=True):
+        if cuotas is not None and zipf is not None:
+            raise ValueError("Indique cuotas o zipf, no ambos")
+        self.candidatos = list(candidatos)
+        if cuotas is None:
+            cuotas = ([1 / (rango + 1) ** zipf for rango in range(len(self.candidatos))]
+                      if zipf is not None else [1] * len(self.candidatos))
+        if len(cuotas) != len(self.candidatos) or min(cuotas) < 0 or not sum(cuotas):
+            raise ValueError("Se necesita una cuota no negativa por candidato")
+        total = sum(cuotas)
+        self.cuotas = [c / total for c in cuotas]
+        self.tasa_invalidos = tasa_invalidos
+        self.tasa_repetidos = tasa_repetidos
+        self.tasa_eliminaciones = tasa_eliminaciones
+
+        generador = random.Random(semilla)
+        self._a = generador.randrange(_ESPACIO_DNI) | 1    # Impar...
+        if self._a % 5 == 0:
+            self._a += 2                                   # ...y no múltiplo de 5
+        self._b = generador.randrange(_ESPACIO_DNI)
+        self._random = generador
+        self._np = _numpy() if usar_numpy else None
+        self._rng = self._np.random.default_rng(semilla) if self._np is not None else None
+        self._acumuladas = []
+        acumulada = 0.0
+        for cuota in self.cuotas:
+            acumulada += cuota
+            self._acumuladas.append(acumulada)
+        self._emitidos = 0
+
+    @property
+    def emitidos(self):
+        """Número de DNIs distintos emitidos hasta ahora."""
+        return self._emitidos
+
+    def dni(self, i):
+        """Retorna el i-ésimo DNI de la permutación."""
+        return f"{(i * self._a + self._b) % _ESPACIO_DNI:08d}"
+
+    def _dnis_de(self, indices):
+        """Retorna la lista de DNIs de una secuencia de índices."""
+        np = self._np
+        if np is None:
+            a, b = self._a, self._b
+            return [f"{(i * a + b) % _ESPACIO_DNI:08d}" for i in indices]
+        valores = (np.asarray(indices, dtype=np.int64) * self._a + self._b) % _ESPACIO_DNI
+        # Ocho dígitos ASCII por fila, decodificados de una vez
+        digitos = (valores[:, None] // np.array(_POTENCIAS, dtype=np.int64)) % 10 + ord("0")
+        return [d.decode("ascii") for d in digitos.astype(np.uint8).view("S8").ravel().tolist()]
+
+    def dnis(self, n):
+        """Retorna los n siguientes DNIs, distintos de todos los anteriores."""
+        inicio = self._emitidos
+        self._emitidos += n
+        if self._np is None:
+            return self._dnis_de(range(inicio, inicio + n))
+        return self._dnis_de(self._np.arange(inicio, inicio + n))
+
+    def muestra(self, poblacion, k):
+        """Retorna k elementos distintos de poblacion, con la semilla del
+        generador."""
+        return self._random.sample(poblacion, k)
+
+    def elegir_candidatos(self, n):
+        """Retorna n nombres de candidato según las cuotas."""
+        nombres = self.candidatos
+        if self._np is None:
+            return self._random.choices(nombres, cum_weights=self._acumuladas, k=n)
+        indices = self._np.searchsorted(self._acumuladas, self._rng.random(n) * self._acumuladas[-1],
+                                        side="right")
+        return [nombres[i] for i in indices.tolist()]
+
+    def _indices(self, n, tasa):
+        """Retorna (índices, marcadas): n índices de DNI en los que una
+        fracción tasa de las filas (marcadas) repite un índice ya emitido y
+        el resto usa índices nuevos."""
+        base = self._emitidos
+        np = self._np
+        if np is None:
+            aleatorio = self._random.random
+            indices, marcadas = [], []
+            siguiente = base
+            for _ in range(n):
+                repetir = siguiente > 0 and aleatorio() < tasa
+                if repetir:
+                    indices.append(int(aleatorio() * siguiente))
+                else:
+                    indices.append(siguiente)
+                    siguiente += 1
+                marcadas.append(repetir)
+            self._emitidos = siguiente
+            return indices, marcadas
+        marcadas = self._rng.random(n) < tasa
+        if base == 0 and n:
+            marcadas[0] = False            # La primera fila no tiene a quién repetir
+        nuevas = ~marcadas
+        previas = base + np.cumsum(nuevas) - nuevas    # Índices emitidos antes de cada fila
+        indices = np.where(marcadas, (self._rng.random(n) * previas).astype(np.int64), previas)
+        self._emitidos = base + int(nuevas.sum())
+        return indices, marcadas.tolist()
+
+    def _invalidar(self, dnis):
+        """Reemplaza una fracción tasa_invalidos de los DNIs por formas
+        inválidas, rotando entre _INVALIDOS."""
+        if not self.tasa_invalidos:
+            return dnis
+        if self._np is None:
+            aleatorio = self._random.random
+            filas = [i for i in range(len(dnis)) if aleatorio() < self.tasa_invalidos]
+        else:
+            filas = self._np.flatnonzero(self._rng.random(len(dnis)) < self.tasa_invalidos).tolist()
+        for j, i in enumerate(filas):
+            dnis[i] = _INVALIDOS[j % len(_INVALIDOS)](dnis[i])
+        return dnis
+
+    def lote(self, n):
+        """Retorna (dnis, candidatos) de n votos, con tasa_repetidos votos de
+        DNIs ya emitidos y tasa_invalidos DNIs mal formados."""
+        if self.tasa_repetidos:
+            indices, _ = self._indices(n, self.tasa_repetidos)
+            dnis = self._dnis_de(indices)
+        else:
+            dnis = self.dnis(n)
+        return self._invalidar(dnis), self.elegir_candidatos(n)
+
+    def lotes(self, total, tam_lote=10000):
+        """Genera lote() sucesivos hasta completar total votos."""
+        for inicio in range(0, total, tam_lote):
+            yield self.lote(min(tam_lote, total - inicio))
+
+    def operaciones(self, n):
+        """Retorna n operaciones ("votar", dni, candidato) o ("eliminar",
+        dni, None). Una fracción tasa_eliminaciones elimina DNIs ya
+        emitidos; los votos siguen las tasas de lote()."""
+        eliminar = self.tasa_eliminaciones
+        repetir = (1 - eliminar) * self.tasa_repetidos
+        indices, marcadas = self._indices(n, eliminar + repetir)
+        dnis = self._dnis_de(indices)
+        # Las filas marcadas usan un DNI ya emitido: se reparten entre
+        # eliminaciones y votos repetidos
+        umbral = eliminar / (eliminar + repetir) if eliminar else 0.0
+        aleatorio = self._random.random
+        votos = [i for i, marcada in enumerate(marcadas)
+                 if not (marcada and aleatorio() < umbral)]
+        operaciones = [("eliminar", dni, None) for dni in dnis]
+        validos = self._invalidar([dnis[i] for i in votos])
+        for i, dni, candidato in zip(votos, validos, self.elegir_candidatos(len(votos))):
+            operaciones[i] = ("votar", dni, candidato)
+        return operaciones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide la velocidad del generador de votos.")
+    parser.add_argument("-n", type=int, default=10 ** 6, help="votos a generar")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--zipf", type=float, help="exponente de Zipf de la popularidad")
+    parser.add_argument("--invalidos", type=float, default=0.0, help="fracción de DNIs inválidos")
+    parser.add_argument("--repetidos", type=float, default=0.0, help="fracción de votantes repetidos")
+    parser.add_argument("--sin-numpy", action="store_true", help="no usar NumPy aunque esté instalado")
+    args = parser.parse_args(argv)
+
+    generador = GeneradorVotos(args.semilla, zipf=args.zipf, tasa_invalidos=args.invalidos,
+                               tasa_repetidos=args.repetidos, usar_numpy=not args.sin_numpy)
+    inicio = time.perf_counter()
+    for _ in generador.lotes(args.n):
+        pass
+    segundos = time.perf_counter() - inicio
+    print(f"[Generador] {args.n} votos en {segundos:.3f} segundos "
+          f"({args.n / segundos:.0f} votos/s, NumPy: {generador._np is not None})")
+
+
+if __name__ == "__main__":
+    main()
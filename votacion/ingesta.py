@@ -0,0 +1,191 @@
+"""Ingesta de archivos de votos (CSV o NDJSON) sin interfaz gráfica.
+
+Los archivos se procesan como una cadena de generadores:
+
+    parsear -> agrupar en lotes -> validar, deduplicar y aplicar -> rechazos
+
+La validación del DNI y la detección de duplicados (dentro del lote y
+contra los votos ya registrados) se hacen por lote con
+SistemaVotacion.registrar_votos_lote, así que el propio almacén de
+votantes sirve como conjunto de DNIs vistos. Solo se mantiene en memoria
+un lote a la vez, sin importar el tamaño del archivo.
+
+Uso:
+    python -m votacion.ingesta votos.csv --rechazos rechazos.csv --candidatos A,B,C
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+
+from .mapas import BACKENDS_VOTANTES
+from .sistema import (SistemaVotacion, VOTO_REGISTRADO, DNI_INVALIDO, YA_VOTO,
+                      DUPLICADO_EN_LOTE, CANDIDATO_INVALIDO)
+
+TAM_LOTE = 10000
+
+# Motivo de rechazo escrito en el archivo de rechazos
+FORMATO_INVALIDO = "formato_invalido"
+MOTIVOS = {
+    DNI_INVALIDO: "dni_invalido",
+    YA_VOTO: "ya_voto",
+    DUPLICADO_EN_LOTE: "duplicado_en_lote",
+    CANDIDATO_INVALIDO: "candidato_invalido",
+}
+
+
+def detectar_formato(ruta):
+    """Deduce el formato ("csv" o "ndjson") a partir de la extensión."""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"No se reconoce el formato del archivo: {ruta}")
+
+
+def parsear_csv(archivo):
+    """Genera (línea, dni, candidato, motivo) desde un CSV dni,candidato.
+
+    motivo es None para las filas bien formadas. Una cabecera inicial
+    "dni,..." se omite.
+    """
+    for linea, fila in enumerate(csv.reader(archivo), start=1):
+        if linea == 1 and fila and fila[0].strip().lower() == "dni":
+            continue
+        if len(fila) != 2:
+            yield linea, ",".join(fila), "", FORMATO_INVALIDO
+            continue
+        yield linea, fila[0].strip(), fila[1].strip(), None
+
+
+def parsear_ndjson(archivo):
+    """Genera (línea, dni, candidato, motivo) desde un archivo NDJSON con
+    objetos {"dni": ..., "candidato": ...}, uno por línea."""
+    for linea, texto in enumerate(archivo, start=1):
+        texto = texto.strip()
+        if not texto:
+            continue
+        try:
+            registro = json.loads(texto)
+            dni, candidato = registro["dni"], registro["candidato"]
+        except (ValueError, TypeError, KeyError):
+            yield linea, texto, "", FORMATO_INVALIDO
+            continue
+        if not isinstance(dni, str) or not isinstance(candidato, str):
+            yield linea, str(dni), str(candidato), FORMATO_INVALIDO
+            continue
+        yield linea, dni.strip(), candidato.strip(), None
+
+
+PARSERS = {"csv": parsear_csv, "ndjson": parsear_ndjson}
+
+
+def en_lotes(filas, tam_lote, rechazos):
+    """Agrupa las filas bien formadas en lotes de hasta tam_lote filas.
+
+    Las filas mal formadas se desvían a la lista rechazos, que el consumidor
+    vacía después de cada lote; también cuentan para el tamaño del lote, de
+    modo que esa lista nunca supera tam_lote filas.
+    """
+    lote = []
+    for fila in filas:
+        if fila[3] is not None:
+            rechazos.append(fila)
+        else:
+            lote.append(fila)
+        if len(lote) + len(rechazos) >= tam_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def aplicar_lotes(sistema, lotes):
+    """Aplica cada lote con registrar_votos_lote y genera, por lote, el
+    número de votos aceptados y las filas rechazadas con su motivo."""
+    for lote in lotes:
+        codigos = sistema.registrar_votos_lote([fila[1] for fila in lote],
+                                               [fila[2] for fila in lote])
+        rechazadas = [(linea, dni, candidato, MOTIVOS[codigo])
+                      for (linea, dni, candidato, _), codigo in zip(lote, codigos)
+                      if codigo != VOTO_REGISTRADO]
+        yield len(lote) - len(rechazadas), rechazadas
+
+
+def ingerir(sistema, ruta, ruta_rechazos=None, tam_lote=TAM_LOTE, formato=None,
+            progreso=None):
+    """Carga un archivo de votos en sistema y retorna un resumen.
+
+    Las filas rechazadas se escriben en ruta_rechazos (CSV con columnas
+    linea, dni, candidato, motivo) si se indica. Si se pasa progreso, se
+    llama después de cada lote con (bytes leídos, bytes totales). El
+    resumen incluye el rendimiento en filas por segundo.
+    """
+    formato = formato or detectar_formato(ruta)
+    if formato not in PARSERS:
+        raise ValueError(f"Formato de archivo desconocido: {formato!r}")
+    aceptadas = rechazadas = 0
+    total = os.path.getsize(ruta)
+    inicio = time.perf_counter()
+    with open(ruta, newline="", encoding="utf-8") as entrada:
+        salida = open(ruta_rechazos, "w", newline="", encoding="utf-8") if ruta_rechazos else None
+        try:
+            escritor = csv.writer(salida) if salida else None
+            if escritor:
+                escritor.writerow(["linea", "dni", "candidato", "motivo"])
+            mal_formadas = []
+            lotes = en_lotes(PARSERS[formato](entrada), tam_lote, mal_formadas)
+            for ok, filas_rechazadas in aplicar_lotes(sistema, lotes):
+                filas_rechazadas.extend(mal_formadas)
+                mal_formadas.clear()
+                aceptadas += ok
+                rechazadas += len(filas_rechazadas)
+                if escritor:
+                    escritor.writerows(filas_rechazadas)
+                if progreso:
+                    progreso(entrada.buffer.tell(), total)
+            # Filas mal formadas posteriores al último lote
+            rechazadas += len(mal_formadas)
+            if escritor:
+                escritor.writerows(mal_formadas)
+        finally:
+            if salida:
+                salida.close()
+    if progreso:
+        progreso(total, total)
+    segundos = time.perf_counter() - inicio
+    filas = aceptadas + rechazadas
+    return {
+        "filas": filas,
+        "aceptadas": aceptadas,
+        "rechazadas": rechazadas,
+        "segundos": segundos,
+        "filas_por_segundo": filas / segundos if segundos > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingesta de archivos de votos.")
+    parser.add_argument("archivo", help="archivo .csv o .ndjson con columnas dni y candidato")
+    parser.add_argument("--rechazos", help="archivo CSV donde escribir las filas rechazadas")
+    parser.add_argument("--formato", choices=sorted(PARSERS), help="formato del archivo (por defecto, según la extensión)")
+    parser.add_argument("--lote", type=int, default=TAM_LOTE, help="filas por lote")
+    parser.add_argument("--candidatos", help="lista cerrada de candidatos separados por comas")
+    parser.add_argument("--backend", default="encadenamiento", choices=sorted(BACKENDS_VOTANTES))
+    parser.add_argument("--capacidad", type=int, help="tamaño esperado del padrón")
+    args = parser.parse_args(argv)
+
+    candidatos = args.candidatos.split(",") if args.candidatos else None
+    sistema = SistemaVotacion(args.capacidad, args.backend, candidatos)
+    resumen = ingerir(sistema, args.archivo, args.rechazos, args.lote, args.formato)
+    print(f"[Ingesta] {resumen['filas']} filas en {resumen['segundos']:.3f} segundos "
+          f"({resumen['filas_por_segundo']:.0f} filas/s): "
+          f"{resumen['aceptadas']} aceptadas, {resumen['rechazadas']} rechazadas")
+    print("Resultados:", sistema.mostrar_resultados())
+
+
+if __name__ == "__main__":
+    main()
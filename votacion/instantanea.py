@@ -0,0 +1,276 @@
+"""Instantáneas binarias de SistemaVotacion con arranque rápido vía mmap.
+
+Una instantánea guarda, en un punto del tiempo, el registro de candidatos,
+los conteos y el padrón de votantes ordenado por DNI:
+
+    cabecera       "<8sBBHQQ": firma, versión, registro cerrado,
+                   n candidatos, n votantes, posición del diario
+    candidatos     por cada uno: largo (uint16) y nombre en UTF-8
+    n mesas        uint32 (0 si el sistema no tiene territorio)
+    conteos        n candidatos * int64
+    mesas          n mesas * n candidatos * int64, conteos de cada mesa
+    dnis           n votantes * uint32, en orden creciente
+    valores        n votantes * uint64, valor de cada DNI en votantes
+                   (id del candidato y mesa, ver sistema.py)
+
+Las secciones numéricas empiezan alineadas a 8 bytes. Al cargar, el archivo
+se mapea con mmap y los arreglos de DNIs e ids se usan directamente sobre el
+mapeo (búsqueda binaria), sin recorrer ni convertir cada registro; solo se
+leen los candidatos y los conteos (y los de las mesas, de los que se
+recalculan distritos y regiones). Los cambios posteriores a la carga van a
+una tabla hash pequeña superpuesta (MapaInstantanea).
+
+Si el sistema tiene un diario, la cabecera guarda su posición en el momento
+de la instantánea, y cargar_instantanea puede reproducir solo la cola del
+diario escrita después. Para que cada voto quede o en la instantánea o en
+esa cola (y no en ambas), la posición y los datos se toman en el mismo
+instante: de sistema.vista(), o con el lock de escritura tomado.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+
+from .mapas import HashMapBase
+from .sistema import SistemaVotacion, VistaVotacion, _numpy
+from .diario import recuperar
+
+FIRMA = b"VOTSNAP\x00"
+VERSION = 2
+_CABECERA = struct.Struct("<8sBBHQQ")
+_LARGO = struct.Struct("<H")
+_N_MESAS = struct.Struct("<I")
+
+
+def _alinear(n):
+    return (n + 7) & ~7
+
+
+class MapaInstantanea:
+    """Almacén de votantes sobre una instantánea mapeada en memoria.
+
+    Los votantes de la instantánea se buscan por búsqueda binaria en los
+    arreglos mapeados (de solo lectura); las eliminaciones se marcan en un
+    bitmap y las inserciones posteriores se guardan en un HashMapBase
+    superpuesto. Ofrece la misma interfaz que HashMapBase.
+    """
+
+    def __init__(self, mapeo, dnis, ids):
+        self._mapeo = mapeo                # Mantiene vivo el mmap
+        self._dnis = dnis                  # memoryview "I", ordenado
+        self._ids = ids                    # memoryview "Q"
+        self._borrados = bytearray(len(dnis) // 8 + 1)
+        self._n_borrados = 0
+        self._nuevos = HashMapBase(hash_strategy="dni")
+
+    def _posicion(self, k):
+        """Retorna la posición de k entre los votantes vigentes de la
+        instantánea, o None si no está (o fue eliminado)."""
+        if not (isinstance(k, str) and len(k) == 8 and k.isascii() and k.isdigit()):
+            return None
+        i = int(k)
+        j = bisect_left(self._dnis, i)
+        if j < len(self._dnis) and self._dnis[j] == i \
+                and not self._borrados[j >> 3] & (1 << (j & 7)):
+            return j
+        return None
+
+    def _borrar(self, j):
+        self._borrados[j >> 3] |= 1 << (j & 7)
+        self._n_borrados += 1
+
+    def put_if_absent(self, k, v):
+        """Inserta v en la clave k solo si k no existe. Retorna True si se
+        insertó y False si la clave ya estaba."""
+        if self._posicion(k) is not None:
+            return False
+        return self._nuevos.put_if_absent(k, v)
+
+    def __setitem__(self, k, v):
+        """Inserta o actualiza el valor v en la clave k."""
+        j = self._posicion(k)
+        if j is not None:                  # La instantánea es de solo lectura
+            self._borrar(j)
+        self._nuevos[k] = v
+
+    def __getitem__(self, k):
+        """Retorna el valor asociado a la clave k si existe."""
+        j = self._posicion(k)
+        if j is not None:
+            return self._ids[j]
+        return self._nuevos[k]
+
+    def __delitem__(self, k):
+        """Elimina el elemento con clave k."""
+        j = self._posicion(k)
+        if j is not None:
+            self._borrar(j)
+        else:
+            del self._nuevos[k]
+
+    def pop(self, k):
+        """Elimina la clave k y retorna su valor, o None si no existía."""
+        j = self._posicion(k)
+        if j is not None:
+            self._borrar(j)
+            return self._ids[j]
+        return self._nuevos.pop(k)
+
+    def __contains__(self, k):
+        """Verifica si la clave k está en el mapa."""
+        return self.__getitem__(k) is not None
+
+    def __len__(self):
+        """Retorna el número de elementos almacenados."""
+        return len(self._dnis) - self._n_borrados + len(self._nuevos)
+
+    def reserve(self, n):
+        """Reserva espacio en la tabla superpuesta."""
+        self._nuevos.reserve(n)
+
+    def __iter__(self):
+        """Itera sobre todas las claves almacenadas."""
+        for k, _ in self.items():
+            yield k
+
+    def items(self):
+        """Itera sobre todos los pares clave-valor del mapa."""
+        borrados = self._borrados
+        for j, (dni, cid) in enumerate(zip(self._dnis, self._ids)):
+            if not borrados[j >> 3] & (1 << (j & 7)):
+                yield f"{dni:08d}", cid
+        yield from self._nuevos.items()
+
+
+def _padron_ordenado(votantes):
+    """Retorna (dnis, valores) del almacén ordenados por DNI, como bytes de
+    arreglos uint32 y uint64. Los valores van en su propia columna porque
+    con más de 65535 mesas no caben en 32 bits."""
+    dnis, valores = array("I"), array("Q")
+    for k, v in votantes.items():
+        dnis.append(int(k))
+        valores.append(v)
+    np = _numpy()                          # Opcional: acelera el ordenamiento
+    if np is not None:
+        orden = np.argsort(np.frombuffer(dnis, dtype=np.uint32))
+        return (np.frombuffer(dnis, dtype=np.uint32)[orden].tobytes(),
+                np.frombuffer(valores, dtype=np.uint64)[orden].tobytes())
+    orden = sorted(range(len(dnis)), key=dnis.__getitem__)
+    return (array("I", [dnis[i] for i in orden]).tobytes(),
+            array("Q", [valores[i] for i in orden]).tobytes())
+
+
+def _secciones(sistema, posicion_diario):
+    """Retorna (cabecera, nombres, n mesas, secciones numéricas) de una
+    instantánea del estado de sistema (un SistemaVotacion o una vista)."""
+    dnis, valores = _padron_ordenado(sistema.votantes)
+    territorio = sistema.territorio
+    mesas = territorio.conteos_mesas().tobytes() if territorio is not None else b""
+    n_mesas = len(territorio) if territorio is not None else 0
+    candidatos = sistema.candidatos
+    resultados = array("q", sistema.resultados)
+    nombres = bytearray()
+    # Un nombre por conteo: un candidato que otro hilo está registrando
+    # todavía no tiene conteo
+    for cid in range(len(resultados)):
+        codificado = candidatos.nombre(cid).encode("utf-8")
+        nombres += _LARGO.pack(len(codificado)) + codificado
+    cabecera = _CABECERA.pack(FIRMA, VERSION, candidatos.cerrado, len(resultados),
+                              len(dnis) // 4, posicion_diario or 0)
+    return cabecera, nombres, n_mesas, (resultados.tobytes(), mesas, dnis, valores)
+
+
+def guardar_instantanea(sistema, ruta):
+    """Escribe una instantánea de sistema (un SistemaVotacion o una
+    VistaVotacion) en ruta.
+
+    De un SistemaVotacion con diario, primero sincroniza el diario. Luego
+    toma una vista, que registra la posición del diario en el mismo
+    instante, y escribe desde ella sin detener la ingesta; en modo
+    concurrente o con el backend 'bitmap' (sin vistas) copia el estado con
+    el lock de escritura tomado. El archivo se escribe aparte y se renombra
+    al final, así que una caída a mitad de camino nunca deja una
+    instantánea incompleta.
+    """
+    if isinstance(sistema, VistaVotacion):
+        datos = _secciones(sistema, sistema.posicion_diario)
+    else:
+        if sistema.diario is not None:
+            sistema.diario.sincronizar()
+        try:
+            vista = sistema.vista()
+        except ValueError:
+            with sistema._escritura:
+                posicion = sistema.diario.posicion() if sistema.diario is not None else None
+                datos = _secciones(sistema, posicion)
+        else:
+            datos = _secciones(vista, vista.posicion_diario)
+    cabecera, nombres, n_mesas, secciones = datos
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(cabecera)
+        f.write(nombres)
+        f.write(_N_MESAS.pack(n_mesas))
+        for seccion in secciones:
+            f.write(bytes(_alinear(f.tell()) - f.tell()))
+            f.write(seccion)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def cargar_instantanea(ruta, ruta_diario=None, territorio=None, **opciones_diario):
+    """Carga una instantánea y retorna un SistemaVotacion listo para usar.
+
+    Si se indica ruta_diario, reproduce solo la parte del diario escrita
+    después de la instantánea y deja el diario conectado al sistema
+    (opciones_diario se pasa a DiarioVotos). Si la instantánea tiene
+    conteos por mesa hay que pasar un Territorio nuevo con las mismas
+    mesas en el mismo orden.
+    """
+    with open(ruta, "rb") as f:
+        mapeo = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    firma, version, cerrado, n_candidatos, n_votantes, posicion_diario = \
+        _CABECERA.unpack_from(mapeo, 0)
+    if firma != FIRMA or version != VERSION:
+        raise ValueError(f"{ruta} no es una instantánea de votos válida")
+
+    sistema = SistemaVotacion(territorio=territorio)
+    pos = _CABECERA.size
+    for _ in range(n_candidatos):
+        (largo,) = _LARGO.unpack_from(mapeo, pos)
+        pos += _LARGO.size
+        sistema.candidatos.registrar(mapeo[pos:pos + largo].decode("utf-8"))
+        pos += largo
+    if cerrado:
+        sistema.candidatos.cerrar()
+    (n_mesas,) = _N_MESAS.unpack_from(mapeo, pos)
+    pos += _N_MESAS.size
+    if n_mesas and (territorio is None or len(territorio) != n_mesas):
+        raise ValueError(f"La instantánea tiene {n_mesas} mesas; hay que pasar un "
+                         f"territorio con las mismas mesas")
+
+    vista = memoryview(mapeo)
+    pos = _alinear(pos)
+    sistema.resultados = array("q")
+    sistema.resultados.frombytes(vista[pos:pos + 8 * n_candidatos])
+    sistema.clasificacion.reconstruir(sistema.resultados)
+    pos = _alinear(pos + 8 * n_candidatos)
+    if territorio is not None:
+        territorio.ampliar(n_candidatos)
+        if n_mesas:
+            conteos = array("q")
+            conteos.frombytes(vista[pos:pos + 8 * n_candidatos * n_mesas])
+            territorio.cargar_conteos_mesas(conteos)
+    pos = _alinear(pos + 8 * n_candidatos * n_mesas)
+    dnis = vista[pos:pos + 4 * n_votantes].cast("I")
+    pos = _alinear(pos + 4 * n_votantes)
+    ids = vista[pos:pos + 8 * n_votantes].cast("Q")
+    sistema.votantes = MapaInstantanea(mapeo, dnis, ids)
+
+    if ruta_diario is not None:
+        recuperar(ruta_diario, sistema, desde=posicion_diario or None, **opciones_diario)
+    return sistema
@@ -0,0 +1,282 @@
+"""Instrumentación opcional de HashMapBase y SistemaVotacion.
+
+Cuando está apagada no cuesta nada: los mapas y SistemaVotacion no tienen
+ningún contador ni condición. instrumentar(mapa) cambia la clase del mapa
+por una subclase que cuenta, antes de delegar en la original, las
+comparaciones de clave de cada __getitem__ y cada inserción (__setitem__ y
+put_if_absent): las claves recorridas en la cadena de la cubeta
+(encadenamiento) o las casillas visitadas (sondeo lineal). También
+registra cada redimensionamiento. desinstrumentar(mapa) restaura la clase
+original.
+
+instrumentar(sistema) instrumenta además su almacén de votantes (si es un
+HashMapBase) y reemplaza, solo en esa instancia, registrar_voto y
+eliminar_votante por versiones que registran su latencia en histogramas
+de tipo HDR (HistogramaLatencia).
+
+estadisticas(objeto) retorna todo como diccionario y volcar(objeto) como
+texto. Los contadores no usan locks: con ConcurrentHashMap son aproximados.
+
+Uso:
+    instrumentar(sistema)
+    ...
+    print(volcar(sistema))
+    desinstrumentar(sistema)
+"""
+
+import time
+
+from .mapas import HashMapBase, ProbeHashMap, _OCCUPIED, _EMPTY
+from .sistema import SistemaVotacion
+
+
+class HistogramaLatencia:
+    """Histograma de latencias (en nanosegundos) con cubetas log-lineales,
+    como HdrHistogram: cada potencia de 2 se divide en 2^(bits-1) cubetas,
+    así que cualquier valor se registra con un error relativo menor que
+    2^-(bits-1) (1.6 % con bits=7) usando memoria logarítmica en el rango."""
+
+    def __init__(self, bits=7):
+        self._bits = bits
+        self._mitad = 1 << (bits - 1)
+        self._conteos = {}
+        self.total = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = 0
+
+    def _indice(self, valor):
+        e = max(0, valor.bit_length() - self._bits)
+        return e * self._mitad + (valor >> e)
+
+    def _valor(self, indice):
+        """Retorna el menor valor que cae en la cubeta indice."""
+        e = max(0, (indice >> (self._bits - 1)) - 1)
+        return (indice - e * self._mitad) << e
+
+    def registrar(self, valor):
+        """Registra un valor entero no negativo."""
+        i = self._indice(valor)
+        self._conteos[i] = self._conteos.get(i, 0) + 1
+        self.total += 1
+        self.suma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def percentil(self, p):
+        """Retorna el valor por debajo del cual está el p % de los registros."""
+        if not self.total:
+            return 0
+        objetivo = max(1, -(-self.total * p // 100))
+        acumulado = 0
+        for i in sorted(self._conteos):
+            acumulado += self._conteos[i]
+            if acumulado >= objetivo:
+                return min(self._valor(i), self.maximo)
+        return self.maximo
+
+    def a_dict(self):
+        return {
+            "n": self.total,
+            "min_ns": self.minimo or 0,
+            "media_ns": self.suma / self.total if self.total else 0.0,
+            "p50_ns": self.percentil(50),
+            "p90_ns": self.percentil(90),
+            "p99_ns": self.percentil(99),
+            "p999_ns": self.percentil(99.9),
+            "max_ns": self.maximo,
+        }
+
+
+class _Comparaciones:
+    """Comparaciones de clave de un tipo de operación."""
+
+    def __init__(self):
+        self.operaciones = 0
+        self.total = 0
+        self.maximo = 0
+
+    def registrar(self, comparaciones):
+        self.operaciones += 1
+        self.total += comparaciones
+        if comparaciones > self.maximo:
+            self.maximo = comparaciones
+
+    def a_dict(self):
+        return {
+            "operaciones": self.operaciones,
+            "comparaciones_media": self.total / self.operaciones if self.operaciones else 0.0,
+            "comparaciones_max": self.maximo,
+        }
+
+
+class _MapaInstrumentado:
+    """Mezcla que cuenta comparaciones y redimensionamientos y delega en la
+    clase original del mapa (la siguiente en el MRO)."""
+
+    def _iniciar_instrumentacion(self):
+        self._lecturas = _Comparaciones()
+        self._escrituras = _Comparaciones()
+        self._redimensionamientos = []
+
+    def __getitem__(self, k):
+        self._lecturas.registrar(self._comparaciones(k))
+        return super().__getitem__(k)
+
+    def __setitem__(self, k, v):
+        self._escrituras.registrar(self._comparaciones(k))
+        super().__setitem__(k, v)
+
+    def put_if_absent(self, k, v):
+        self._escrituras.registrar(self._comparaciones(k))
+        return super().put_if_absent(k, v)
+
+    def _resize(self, c):
+        anterior = len(self._table)
+        inicio = time.perf_counter()
+        super()._resize(c)
+        self._redimensionamientos.append({
+            "de": anterior,
+            "a": c,
+            "elementos": len(self),
+            "segundos": time.perf_counter() - inicio,
+        })
+
+
+class _EncadenamientoInstrumentado(_MapaInstrumentado):
+    def _comparaciones(self, k):
+        """Claves de la cadena comparadas hasta encontrar k (o toda la cadena)."""
+        bucket = self._table[self._hash_function(k)]
+        if bucket is None:
+            return 0
+        comparaciones = 0
+        for item in bucket._table:
+            comparaciones += 1
+            if item._key == k:
+                break
+        return comparaciones
+
+
+class _SondeoInstrumentado(_MapaInstrumentado):
+    def _comparaciones(self, k):
+        """Casillas visitadas por el sondeo lineal hasta resolver k."""
+        table, states = self._table, self._states
+        cap = len(table)
+        j = self._hash(k) % cap
+        visitadas = 1
+        while states[j] != _EMPTY and not (states[j] == _OCCUPIED and table[j] == k):
+            j = j + 1 if j + 1 < cap else 0
+            visitadas += 1
+        return visitadas
+
+
+_CLASES = {}                               # Clase original -> instrumentada
+
+
+def _clase_instrumentada(cls):
+    if cls not in _CLASES:
+        mezcla = _SondeoInstrumentado if issubclass(cls, ProbeHashMap) else _EncadenamientoInstrumentado
+        _CLASES[cls] = type(cls.__name__ + "Instrumentado", (mezcla, cls), {"_original": cls})
+    return _CLASES[cls]
+
+
+def _envolver(sistema, nombre, histograma):
+    original = getattr(sistema, nombre)
+    perf_counter_ns = time.perf_counter_ns
+
+    def medido(*args, **kwargs):
+        inicio = perf_counter_ns()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            histograma.registrar(perf_counter_ns() - inicio)
+
+    setattr(sistema, nombre, medido)
+
+
+def instrumentar(objeto):
+    """Activa la instrumentación de un HashMapBase o un SistemaVotacion."""
+    if isinstance(objeto, SistemaVotacion):
+        if "_latencias" in vars(objeto):
+            return objeto
+        instrumentar(objeto.votantes)
+        objeto._latencias = {nombre: HistogramaLatencia()
+                             for nombre in ("registrar_voto", "eliminar_votante")}
+        for nombre, histograma in objeto._latencias.items():
+            _envolver(objeto, nombre, histograma)
+    elif isinstance(objeto, HashMapBase):
+        if not isinstance(objeto, _MapaInstrumentado):
+            objeto.__class__ = _clase_instrumentada(type(objeto))
+            objeto._iniciar_instrumentacion()
+    return objeto
+
+
+def desinstrumentar(objeto):
+    """Desactiva la instrumentación y descarta las estadísticas."""
+    if isinstance(objeto, SistemaVotacion):
+        for nombre in vars(objeto).pop("_latencias", ()):
+            delattr(objeto, nombre)
+        desinstrumentar(objeto.votantes)
+    elif isinstance(objeto, _MapaInstrumentado):
+        objeto.__class__ = objeto._original
+        del objeto._lecturas, objeto._escrituras, objeto._redimensionamientos
+    return objeto
+
+
+def estadisticas(objeto):
+    """Retorna las estadísticas actuales como diccionario."""
+    if isinstance(objeto, SistemaVotacion):
+        latencias = vars(objeto).get("_latencias", {})
+        return {
+            "votantes": estadisticas(objeto.votantes),
+            "latencias": {nombre: h.a_dict() for nombre, h in latencias.items()},
+        }
+    datos = {"tipo": type(objeto).__name__}
+    if isinstance(objeto, HashMapBase):
+        datos["ocupacion"] = objeto.bucket_occupancy()
+    if isinstance(objeto, _MapaInstrumentado):
+        datos["tipo"] = objeto._original.__name__
+        datos["getitem"] = objeto._lecturas.a_dict()
+        datos["setitem"] = objeto._escrituras.a_dict()
+        datos["redimensionamientos"] = list(objeto._redimensionamientos)
+    return datos
+
+
+def volcar(objeto):
+    """Retorna las estadísticas actuales como texto legible."""
+    datos = estadisticas(objeto)
+    if "latencias" in datos:
+        lineas = _lineas_mapa(datos["votantes"])
+        for nombre, h in datos["latencias"].items():
+            lineas.append(f"{nombre}: {h['n']} llamadas, media {h['media_ns'] / 1000:.1f} us, "
+                          f"p50 {h['p50_ns'] / 1000:.1f} us, p99 {h['p99_ns'] / 1000:.1f} us, "
+                          f"p99.9 {h['p999_ns'] / 1000:.1f} us, máx {h['max_ns'] / 1000:.1f} us")
+        return "\n".join(lineas)
+    return "\n".join(_lineas_mapa(datos))
+
+
+def _lineas_mapa(datos):
+    lineas = [f"Almacén de votantes: {datos['tipo']}"]
+    ocupacion = datos.get("ocupacion")
+    if ocupacion:
+        lineas.append(f"  {ocupacion['size']} elementos en {ocupacion['buckets']} cubetas "
+                      f"(factor de carga {ocupacion['load_factor']:.2f}, "
+                      f"cadena máxima {ocupacion['max_chain']}, "
+                      f"media {ocupacion['mean_chain']:.2f})")
+        lineas.append("  Histograma de cadenas: " + ", ".join(
+            f"{largo}: {cubetas}" for largo, cubetas in ocupacion["histogram"].items()))
+    for operacion in ("getitem", "setitem"):
+        if operacion in datos:
+            c = datos[operacion]
+            lineas.append(f"  {operacion}: {c['operaciones']} operaciones, "
+                          f"{c['comparaciones_media']:.2f} comparaciones de media, "
+                          f"{c['comparaciones_max']} como máximo")
+    if "redimensionamientos" in datos:
+        redimensionamientos = datos["redimensionamientos"]
+        lineas.append(f"  Redimensionamientos: {len(redimensionamientos)}")
+        for r in redimensionamientos:
+            lineas.append(f"    {r['de']} -> {r['a']} cubetas con {r['elementos']} elementos "
+                          f"({r['segundos'] * 1000:.2f} ms)")
+    return lineas
@@ -0,0 +1,197 @@
+"""Interfaz gráfica (Tk) del sistema de votación.
+
+Es el único módulo que importa tkinter; el resto del paquete no lo necesita.
+
+La ventana nunca llama a SistemaVotacion directamente: cada acción se
+encola para un hilo trabajador, que la ejecuta y devuelve sus mensajes
+(estado, progreso, errores) por otra cola que la ventana revisa cada
+INTERVALO_EVENTOS_MS. Así registrar un voto o importar un padrón grande
+no congela la ventana. Los resultados se refrescan solos, como mucho cada
+INTERVALO_REFRESCO_MS y solo si la clasificación cambió, actualizando
+únicamente las filas cuyo conteo o posición cambiaron.
+"""
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import filedialog, ttk
+
+from .ingesta import ingerir
+from .sistema import SistemaVotacion
+
+INTERVALO_EVENTOS_MS = 50
+INTERVALO_REFRESCO_MS = 250
+
+
+class Trabajador(threading.Thread):
+    """Hilo que ejecuta en orden las tareas encoladas con enviar()."""
+
+    def __init__(self, eventos):
+        super().__init__(daemon=True)
+        self._tareas = queue.Queue()
+        self._eventos = eventos            # Cola de mensajes hacia la ventana
+
+    def enviar(self, funcion, *args):
+        self._tareas.put((funcion, args))
+
+    def detener(self):
+        self._tareas.put(None)
+
+    def run(self):
+        while True:
+            tarea = self._tareas.get()
+            if tarea is None:
+                return
+            funcion, args = tarea
+            try:
+                funcion(*args)
+            except Exception as error:     # Se muestra en la línea de estado
+                self._eventos.put(("error", f"Error: {error}"))
+
+
+class InterfazVotacion:
+    def __init__(self, root, sistema=None):
+        self.root = root
+        self.root.title("Sistema de Votación con Tablas Hash")
+        self.sistema = sistema or SistemaVotacion()
+
+        self._eventos = queue.Queue()
+        self._trabajador = Trabajador(self._eventos)
+        self._trabajador.start()
+        self._cambios = True               # La clasificación cambió desde el último refresco
+        self._mostrados = {}               # Candidato -> votos mostrados en la tabla
+        self.sistema.clasificacion.suscribir(self._al_cambiar)
+
+        # Etiquetas e inputs
+        self.label_dni = tk.Label(root, text="DNI del votante:")
+        self.label_dni.pack()
+        self.entry_dni = tk.Entry(root)
+        self.entry_dni.pack()
+
+        self.label_candidato = tk.Label(root, text="Nombre del candidato:")
+        self.label_candidato.pack()
+        self.entry_candidato = tk.Entry(root)
+        self.entry_candidato.pack()
+        self.entry_candidato.bind("<Return>", lambda evento: self.registrar_voto())
+
+        # Botón de votar
+        self.btn_votar = tk.Button(root, text="Registrar Voto", command=self.registrar_voto)
+        self.btn_votar.pack(pady=5)
+
+        # Botón de importación masiva y su barra de progreso
+        self.btn_importar = tk.Button(root, text="Importar archivo...", command=self.importar)
+        self.btn_importar.pack(pady=5)
+        self.progreso = ttk.Progressbar(root, length=300, mode="determinate")
+        self.progreso.pack(pady=5)
+
+        # Tabla de resultados, ordenada por votos
+        self.tabla = ttk.Treeview(root, columns=("votos",), height=10)
+        self.tabla.heading("#0", text="Candidato")
+        self.tabla.heading("votos", text="Votos")
+        self.tabla.pack(pady=10, fill="both", expand=True)
+        self.lider = tk.Label(root, text="Aún no hay votos registrados.")
+        self.lider.pack()
+
+        # Línea de estado en lugar de ventanas emergentes
+        self.estado = tk.Label(root, text="Listo.", anchor="w", relief="sunken")
+        self.estado.pack(fill="x", side="bottom")
+
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        self.root.after(INTERVALO_EVENTOS_MS, self._atender_eventos)
+        self.root.after(INTERVALO_REFRESCO_MS, self._refrescar)
+
+    def registrar_voto(self):
+        dni = self.entry_dni.get().strip()
+        candidato = self.entry_candidato.get().strip()
+
+        if not dni or not candidato:
+            self.estado.config(text="Por favor, ingrese DNI y candidato.")
+            return
+
+        self._trabajador.enviar(self._votar, dni, candidato)
+        self.entry_dni.delete(0, tk.END)
+        self.entry_candidato.delete(0, tk.END)
+        self.entry_dni.focus_set()
+
+    def importar(self):
+        ruta = filedialog.askopenfilename(
+            title="Importar votos",
+            filetypes=[("Votos", "*.csv *.ndjson *.jsonl"), ("Todos los archivos", "*")])
+        if not ruta:
+            return
+        self.btn_importar.config(state="disabled")
+        self.progreso.config(value=0)
+        self.estado.config(text=f"Importando {ruta}...")
+        self._trabajador.enviar(self._importar, ruta)
+
+    def cerrar(self):
+        self._trabajador.detener()
+        self.root.destroy()
+
+    # Se ejecutan en el hilo trabajador
+
+    def _votar(self, dni, candidato):
+        self._eventos.put(("estado", self.sistema.registrar_voto(dni, candidato)))
+
+    def _importar(self, ruta):
+        try:
+            resumen = ingerir(self.sistema, ruta, progreso=self._avisar_progreso)
+            self._eventos.put(("estado", f"Importación terminada: {resumen['aceptadas']} "
+                                         f"votos aceptados, {resumen['rechazadas']} rechazados "
+                                         f"({resumen['filas_por_segundo']:.0f} filas/s)."))
+        finally:
+            self._eventos.put(("importado",))
+
+    def _avisar_progreso(self, hecho, total):
+        self._eventos.put(("progreso", 100 * hecho / total if total else 100))
+
+    def _al_cambiar(self, nombre, delta, votos):
+        self._cambios = True
+
+    # Se ejecutan en el hilo de Tk
+
+    def _atender_eventos(self):
+        try:
+            while True:
+                tipo, *datos = self._eventos.get_nowait()
+                if tipo in ("estado", "error"):
+                    self.estado.config(text=datos[0])
+                elif tipo == "progreso":
+                    self.progreso.config(value=datos[0])
+                elif tipo == "importado":
+                    self.btn_importar.config(state="normal")
+        except queue.Empty:
+            pass
+        self.root.after(INTERVALO_EVENTOS_MS, self._atender_eventos)
+
+    def _refrescar(self):
+        if self._cambios:
+            self._cambios = False          # Antes de leer: un cambio posterior vuelve a marcarlo
+            self.mostrar_resultados()
+        self.root.after(INTERVALO_REFRESCO_MS, self._refrescar)
+
+    def mostrar_resultados(self):
+        """Actualiza solo las filas de la tabla cuyo conteo o posición cambió."""
+        clasificacion = self.sistema.clasificacion
+        for posicion, (candidato, votos) in enumerate(clasificacion.top()):
+            fila = "c:" + candidato        # Un iid vacío sería la raíz del árbol
+            anterior = self._mostrados.get(candidato)
+            if anterior is None:
+                self.tabla.insert("", posicion, iid=fila, text=candidato, values=(votos,))
+            else:
+                if anterior != votos:
+                    self.tabla.item(fila, values=(votos,))
+                if self.tabla.index(fila) != posicion:
+                    self.tabla.move(fila, "", posicion)
+            self._mostrados[candidato] = votos
+
+        lider = clasificacion.lider()
+        if lider is not None and lider[1] > 0:
+            self.lider.config(text=f"Lidera {lider[0]} por {clasificacion.margen()} votos")
+
+
+def ejecutar():
+    """Abre la ventana principal y atiende eventos hasta cerrarla."""
+    root = tk.Tk()
+    InterfazVotacion(root)
+    root.mainloop()
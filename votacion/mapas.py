@@ -0,0 +1,861 @@
+"""Mapas hash y almacenes de votantes.
+
+UnsortedTableMap y HashMapBase (encadenamiento), ProbeHashMap (sondeo
+lineal), ConcurrentHashMap (locks por franjas) y DNIBitmapMap (índice
+directo por DNI), junto con las estrategias de hash y MapSnapshot (copia
+de solo lectura de un mapa). Solo depende de la biblioteca estándar.
+"""
+
+import copy
+import mmap
+import threading
+
+
+class UnsortedTableMap:
+    """Implementación simple de un diccionario mediante una lista desordenada."""
+    
+    class _Item:
+        """Clase interna que representa una entrada clave-valor."""
+        __slots__ = ("_key", "_value")     # Sin __dict__ por entrada
+
+        def __init__(self, k, v):
+            self._key = k
+            self._value = v
+
+    def __init__(self):
+        """Inicializa una tabla vacía."""
+        self._table = []
+
+    def __getitem__(self, k):
+        """Retorna el valor asociado a la clave k."""
+        for item in self._table:
+            if k == item._key:
+                return item._value
+        raise KeyError("Key Error: " + repr(k))
+
+    def __setitem__(self, k, v):
+        """Asigna el valor v a la clave k. Si ya existe, actualiza el valor."""
+        for item in self._table:
+            if k == item._key:
+                item._value = v
+                return
+        self._table.append(self._Item(k, v))
+
+    def _append(self, k, v):
+        """Agrega el par (k, v) sin buscar k: el llamador garantiza que no existe."""
+        self._table.append(self._Item(k, v))
+
+    def _copy(self):
+        """Retorna una copia con entradas propias, que se puede modificar sin
+        afectar a esta."""
+        other = UnsortedTableMap()
+        other._table = [self._Item(item._key, item._value) for item in self._table]
+        return other
+    
+    def __delitem__(self, k):
+        """Elimina el elemento con clave k."""
+        for i in range(len(self._table)):
+            if k == self._table[i]._key:
+                del self._table[i]
+                return
+        raise KeyError("Key Error: " + repr(k))
+
+    def __len__(self):
+        """Retorna el número de elementos almacenados."""
+        return len(self._table)
+
+    def __iter__(self):
+        """Itera sobre las claves almacenadas."""
+        for item in self._table:
+            yield item._key
+
+    def items(self):
+        """Itera sobre los pares clave-valor."""
+        for item in self._table:
+            yield item._key, item._value
+
+    def __str__(self):
+        """Representación como string del mapa."""
+        return "{" + ", ".join(f"'{k}': {v}" for k, v in self.items()) + "}"
+
+
+def _es_primo(n):
+    """Verifica si n es un número primo."""
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    d = 3
+    while d * d <= n:
+        if n % d == 0:
+            return False
+        d += 2
+    return True
+
+
+def _siguiente_primo(n):
+    """Retorna el menor número primo mayor o igual a n."""
+    while not _es_primo(n):
+        n += 1
+    return n
+
+
+def hash_python(k):
+    """Hash nativo de Python (rápido, aleatorizado por proceso para str)."""
+    return hash(k)
+
+
+def hash_ascii(k):
+    """Suma de códigos ASCII. Se conserva solo como referencia: para DNIs de
+    8 dígitos apenas produce 73 valores distintos."""
+    return sum(ord(c) for c in k)
+
+
+_FNV_OFFSET = 2166136261
+_FNV_PRIME = 16777619
+
+
+def hash_fnv(k):
+    """Hash FNV-1a de 32 bits sobre los caracteres de la clave."""
+    h = _FNV_OFFSET
+    for c in k:
+        h = ((h ^ ord(c)) * _FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+_DNI_PRIMO = 109345121   # Primo mayor que el espacio de DNIs (10^8)
+_DNI_ESCALA = 48271
+_DNI_DESPLAZAMIENTO = 12345
+
+
+def hash_dni(k):
+    """Hash para DNIs: interpreta los 8 dígitos como entero y aplica
+    compresión MAD ((a*i + b) mod p). Claves que no son DNI usan FNV-1a."""
+    if len(k) == 8 and k.isdecimal():
+        return (int(k) * _DNI_ESCALA + _DNI_DESPLAZAMIENTO) % _DNI_PRIMO
+    return hash_fnv(k)
+
+
+# Estrategias de hash disponibles para HashMapBase (nombre -> función)
+HASH_STRATEGIES = {
+    "python": hash_python,
+    "ascii": hash_ascii,
+    "fnv": hash_fnv,
+    "dni": hash_dni,
+}
+
+
+class HashMapBase:
+    """Mapa hash que utiliza una lista de UnsortedTableMap para manejar
+    colisiones (encadenamiento).
+
+    La tabla se redimensiona a un tamaño primo aproximadamente el doble del
+    actual cuando el factor de carga (elementos / cubetas) supera load_factor.
+    Si se conoce de antemano el número de claves, capacity_hint permite
+    reservar la tabla desde el inicio y evitar todo redimensionamiento.
+
+    hash_strategy puede ser el nombre de una estrategia de HASH_STRATEGIES o
+    cualquier función que reciba la clave y retorne un entero.
+
+    Si se indica min_load_factor, la tabla se reduce a la mitad cuando las
+    eliminaciones dejan el factor de carga por debajo de ese valor, sin bajar
+    nunca de la capacidad inicial.
+
+    snapshot() copia solo la lista de cubetas y las comparte con la copia;
+    a partir de ahí el mapa copia cada cubeta compartida la primera vez que
+    la modifica (copia en escritura), así que la copia no cambia.
+    """
+
+    def __init__(self, capacity_hint=None, load_factor=0.75, hash_strategy="python",
+                 min_load_factor=None):
+        if load_factor <= 0:
+            raise ValueError("load_factor debe ser mayor que 0")
+        if min_load_factor is not None and not 0 < min_load_factor < load_factor / 2:
+            raise ValueError("min_load_factor debe estar entre 0 y load_factor / 2")
+        if isinstance(hash_strategy, str):
+            if hash_strategy not in HASH_STRATEGIES:
+                raise ValueError(f"Estrategia de hash desconocida: {hash_strategy!r}")
+            hash_strategy = HASH_STRATEGIES[hash_strategy]
+        self._hash = hash_strategy
+        self._load_factor = load_factor
+        self._min_load_factor = min_load_factor
+        self._n = 0                        # Número de elementos almacenados
+        capacidad = 11                     # Tabla con 11 cubetas inicialmente
+        if capacity_hint is not None:
+            capacidad = max(capacidad, int(capacity_hint / load_factor) + 1)
+        self._table = _siguiente_primo(capacidad) * [None]
+        self._min_capacity = len(self._table)
+        self._shared = None                # Cubetas del último snapshot, o None
+
+    def _hash_function(self, k):
+        """Retorna el índice de cubeta de la clave k según la estrategia."""
+        return self._hash(k) % len(self._table)
+
+    def reserve(self, n):
+        """Agranda la tabla de una vez para que quepan n elementos sin más
+        redimensionamientos (útil antes de una carga masiva)."""
+        if n > self._load_factor * len(self._table):
+            self._resize(_siguiente_primo(int(n / self._load_factor) + 1))
+
+    def _resize(self, c):
+        """Redistribuye todos los elementos en una nueva tabla de c cubetas."""
+        old = list(self.items())
+        self._table = c * [None]
+        self._shared = None                # Las cubetas nuevas no se comparten
+        for k, v in old:
+            i = self._hash_function(k)
+            if self._table[i] is None:
+                self._table[i] = UnsortedTableMap()
+            self._table[i][k] = v
+
+    def __setitem__(self, k, v):
+        """Inserta o actualiza el valor v en la clave k."""
+        i = self._hash_function(k)
+        bucket = self._table[i]
+        if bucket is None:
+            bucket = self._table[i] = UnsortedTableMap()
+        elif self._shared is not None and self._shared[i] is bucket:
+            bucket = self._table[i] = bucket._copy()
+        oldsize = len(bucket)
+        bucket[k] = v
+        if len(bucket) > oldsize:          # La clave es nueva
+            self._n += 1
+            if self._n > self._load_factor * len(self._table):
+                self._resize(_siguiente_primo(2 * len(self._table) + 1))
+
+    def put_if_absent(self, k, v):
+        """Inserta v en la clave k solo si k no existe. Retorna True si se
+        insertó y False si la clave ya estaba (calcula el hash una sola vez)."""
+        i = self._hash_function(k)
+        bucket = self._table[i]
+        if bucket is None:
+            bucket = self._table[i] = UnsortedTableMap()
+        elif k in bucket:
+            return False
+        elif self._shared is not None and self._shared[i] is bucket:
+            bucket = self._table[i] = bucket._copy()
+        bucket[k] = v
+        self._n += 1
+        if self._n > self._load_factor * len(self._table):
+            self._resize(_siguiente_primo(2 * len(self._table) + 1))
+        return True
+
+    def _put_new(self, k, v):
+        """Inserta v en la clave k sabiendo que k no existe (por ejemplo,
+        porque un filtro lo descartó): no recorre la cadena de la cubeta."""
+        i = self._hash_function(k)
+        bucket = self._table[i]
+        if bucket is None:
+            bucket = self._table[i] = UnsortedTableMap()
+        elif self._shared is not None and self._shared[i] is bucket:
+            bucket = self._table[i] = bucket._copy()
+        bucket._append(k, v)
+        self._n += 1
+        if self._n > self._load_factor * len(self._table):
+            self._resize(_siguiente_primo(2 * len(self._table) + 1))
+
+    def __getitem__(self, k):
+        """Retorna el valor asociado a la clave k si existe."""
+        i = self._hash_function(k)
+        if self._table[i] is not None:
+            try:
+                return self._table[i][k]
+            except KeyError:
+                return None
+        return None
+
+    def __delitem__(self, k):
+        """Elimina el elemento con clave k."""
+        i = self._hash_function(k)
+        bucket = self._table[i]
+        if bucket is None:
+            raise KeyError("Key Error: " + repr(k))
+        if self._shared is not None and self._shared[i] is bucket:
+            bucket = self._table[i] = bucket._copy()
+        del bucket[k]
+        self._n -= 1
+        self._shrink_if_sparse()
+
+    def pop(self, k):
+        """Elimina la clave k y retorna su valor, o None si no existía."""
+        v = self[k]
+        if v is not None:
+            del self[k]
+        return v
+
+    def _shrink_if_sparse(self):
+        """Reduce la tabla a la mitad si quedó por debajo de min_load_factor."""
+        if (self._min_load_factor is not None
+                and len(self._table) > self._min_capacity
+                and self._n < self._min_load_factor * len(self._table)):
+            self._resize(max(self._min_capacity, _siguiente_primo(len(self._table) // 2)))
+
+    def __len__(self):
+        """Retorna el número de elementos almacenados."""
+        return self._n
+
+    def __contains__(self, k):
+        """Verifica si la clave k está en el mapa."""
+        return self.__getitem__(k) is not None
+
+    def __iter__(self):
+        """Itera sobre todas las claves almacenadas."""
+        for bucket in self._table:
+            if bucket:
+                for key in bucket:
+                    yield key
+
+    def items(self):
+        """Itera sobre todos los pares clave-valor del mapa."""
+        for bucket in self._table:
+            if bucket:
+                for k, v in bucket.items():
+                    yield k, v
+
+    def iter_chunks(self, size):
+        """Itera sobre los pares clave-valor en listas de unos size pares,
+        armadas cubeta por cubeta sin generadores anidados (para recorrer
+        tablas grandes, por ejemplo al exportar)."""
+        chunk = []
+        append = chunk.append
+        for bucket in self._table:
+            if bucket is not None:         # bool(bucket) llamaría a __len__
+                for item in bucket._table:
+                    append((item._key, item._value))
+                if len(chunk) >= size:
+                    yield chunk
+                    chunk = []
+                    append = chunk.append
+        if chunk:
+            yield chunk
+
+    def snapshot(self):
+        """Retorna un MapSnapshot con el contenido actual, en O(cubetas): la
+        copia comparte las cubetas con el mapa, y el mapa copia cada una
+        antes de modificarla. No debe llamarse mientras otro hilo escribe
+        en el mapa."""
+        frozen = copy.copy(self)
+        frozen._table = list(self._table)
+        frozen._shared = None
+        self._shared = frozen._table       # Basta con el último: comparte todas las vigentes
+        return MapSnapshot(frozen)
+
+    def bucket_occupancy(self):
+        """Reporta la ocupación de las cubetas para evaluar la distribución
+        de la función hash. El histograma asocia cada longitud de cadena con
+        el número de cubetas que la tienen."""
+        histogram = {}
+        for bucket in self._table:
+            length = len(bucket) if bucket is not None else 0
+            histogram[length] = histogram.get(length, 0) + 1
+        buckets = len(self._table)
+        empty = histogram.get(0, 0)
+        used = buckets - empty
+        size = len(self)
+        return {
+            "buckets": buckets,
+            "used": used,
+            "empty": empty,
+            "size": size,
+            "load_factor": size / buckets,
+            "max_chain": max(histogram),
+            "mean_chain": size / used if used else 0.0,
+            "histogram": dict(sorted(histogram.items())),
+        }
+
+
+_EMPTY = 0      # Casilla nunca usada
+_OCCUPIED = 1   # Casilla con un elemento
+_DELETED = 2    # Casilla liberada (lápida); no corta la secuencia de sondeo
+
+
+class ProbeHashMap(HashMapBase):
+    """Mapa hash con direccionamiento abierto y sondeo lineal.
+
+    En lugar de una cubeta UnsortedTableMap por posición, guarda claves,
+    valores y estados en tres arreglos paralelos (_table, _values y
+    _states), sin objetos auxiliares por elemento. Ofrece la misma interfaz
+    que HashMapBase. Las lápidas cuentan para el factor de carga y se
+    eliminan en cada redimensionamiento.
+    """
+
+    def __init__(self, capacity_hint=None, load_factor=0.5, hash_strategy="python",
+                 min_load_factor=None):
+        if not 0 < load_factor < 1:
+            raise ValueError("load_factor debe estar entre 0 y 1")
+        super().__init__(capacity_hint, load_factor, hash_strategy, min_load_factor)
+        self._values = len(self._table) * [None]
+        self._states = bytearray(len(self._table))
+        self._deleted = 0                  # Número de lápidas
+
+    def _find_slot(self, k):
+        """Busca la clave k. Retorna (True, j) si está en la casilla j, o
+        (False, j) con la primera casilla disponible para insertarla."""
+        table = self._table
+        states = self._states
+        cap = len(table)
+        j = self._hash(k) % cap
+        avail = None
+        while True:
+            state = states[j]
+            if state == _EMPTY:
+                return False, (j if avail is None else avail)
+            if state == _DELETED:
+                if avail is None:
+                    avail = j
+            elif table[j] == k:
+                return True, j
+            j += 1
+            if j == cap:
+                j = 0
+
+    def _resize(self, c):
+        """Reubica los elementos vivos en arreglos nuevos de c casillas."""
+        old = list(self.items())
+        self._table = c * [None]
+        self._values = c * [None]
+        self._states = bytearray(c)
+        self._n = 0
+        self._deleted = 0
+        for k, v in old:
+            found, j = self._find_slot(k)
+            self._table[j] = k
+            self._values[j] = v
+            self._states[j] = _OCCUPIED
+            self._n += 1
+
+    def __setitem__(self, k, v):
+        """Inserta o actualiza el valor v en la clave k."""
+        found, j = self._find_slot(k)
+        if found:
+            self._values[j] = v
+            return
+        self._insert_at(j, k, v)
+
+    def put_if_absent(self, k, v):
+        """Inserta v en la clave k solo si k no existe. Retorna True si se
+        insertó y False si la clave ya estaba (un único sondeo)."""
+        found, j = self._find_slot(k)
+        if found:
+            return False
+        self._insert_at(j, k, v)
+        return True
+
+    def _put_new(self, k, v):
+        """Inserta v en la clave k sabiendo que k no existe: ocupa la primera
+        casilla libre o lápida del sondeo sin comparar claves."""
+        states = self._states
+        cap = len(states)
+        j = self._hash(k) % cap
+        while states[j] == _OCCUPIED:
+            j += 1
+            if j == cap:
+                j = 0
+        self._insert_at(j, k, v)
+
+    def _insert_at(self, j, k, v):
+        """Ocupa la casilla libre j con el par (k, v) y redimensiona si hace falta."""
+        if self._states[j] == _DELETED:
+            self._deleted -= 1
+        self._table[j] = k
+        self._values[j] = v
+        self._states[j] = _OCCUPIED
+        self._n += 1
+        if self._n + self._deleted > self._load_factor * len(self._table):
+            if self._n > self._load_factor * len(self._table) / 2:
+                self._resize(_siguiente_primo(2 * len(self._table) + 1))
+            else:                          # Sobre todo lápidas: misma capacidad
+                self._resize(len(self._table))
+
+    def __getitem__(self, k):
+        """Retorna el valor asociado a la clave k si existe."""
+        found, j = self._find_slot(k)
+        return self._values[j] if found else None
+
+    def __delitem__(self, k):
+        """Elimina el elemento con clave k dejando una lápida."""
+        found, j = self._find_slot(k)
+        if not found:
+            raise KeyError("Key Error: " + repr(k))
+        self._table[j] = None
+        self._values[j] = None
+        self._states[j] = _DELETED
+        self._n -= 1
+        self._deleted += 1
+        self._shrink_if_sparse()
+
+    def __iter__(self):
+        """Itera sobre todas las claves almacenadas."""
+        for j, state in enumerate(self._states):
+            if state == _OCCUPIED:
+                yield self._table[j]
+
+    def items(self):
+        """Itera sobre todos los pares clave-valor del mapa."""
+        for j, state in enumerate(self._states):
+            if state == _OCCUPIED:
+                yield self._table[j], self._values[j]
+
+    def iter_chunks(self, size):
+        """Itera sobre los pares clave-valor en listas de hasta size pares,
+        recorriendo las casillas de a size por vez."""
+        table, values, states = self._table, self._values, self._states
+        for start in range(0, len(table), size):
+            end = start + size
+            chunk = [(k, v) for k, v, state in zip(table[start:end], values[start:end],
+                                                   states[start:end]) if state == _OCCUPIED]
+            if chunk:
+                yield chunk
+
+    def snapshot(self):
+        """Retorna un MapSnapshot con el contenido actual. Las casillas solo
+        guardan claves y valores inmutables, así que basta copiar los tres
+        arreglos: O(casillas), sin costo posterior para las escrituras."""
+        frozen = copy.copy(self)
+        frozen._table = list(self._table)
+        frozen._values = list(self._values)
+        frozen._states = bytearray(self._states)
+        return MapSnapshot(frozen)
+
+    def bucket_occupancy(self):
+        """Reporta la ocupación de las casillas. El histograma asocia cada
+        longitud de sondeo (casillas visitadas hasta encontrar la clave) con
+        el número de claves que la requieren."""
+        cap = len(self._table)
+        histogram = {}
+        for j, state in enumerate(self._states):
+            if state == _OCCUPIED:
+                length = (j - self._hash(self._table[j]) % cap) % cap + 1
+                histogram[length] = histogram.get(length, 0) + 1
+        total = sum(length * count for length, count in histogram.items())
+        return {
+            "buckets": cap,
+            "used": self._n,
+            "empty": cap - self._n - self._deleted,
+            "deleted": self._deleted,
+            "size": self._n,
+            "load_factor": self._n / cap,
+            "max_chain": max(histogram, default=0),
+            "mean_chain": total / self._n if self._n else 0.0,
+            "histogram": dict(sorted(histogram.items())),
+        }
+
+
+class ConcurrentHashMap(HashMapBase):
+    """HashMapBase seguro para varios hilos mediante locks por franjas.
+
+    Las cubetas se reparten en `stripes` franjas (cubeta i -> franja
+    i % stripes), cada una con su propio lock y su propio contador de
+    elementos, así que operaciones sobre DNIs de franjas distintas nunca se
+    bloquean entre sí. put_if_absent y pop son atómicos. Para redimensionar
+    se toman todos los locks en orden; ninguna operación espera un segundo
+    lock mientras tiene uno, de modo que no hay interbloqueos. La iteración
+    no bloquea y puede no reflejar cambios concurrentes.
+    """
+
+    def __init__(self, capacity_hint=None, load_factor=0.75, hash_strategy="python",
+                 stripes=64):
+        super().__init__(capacity_hint, load_factor, hash_strategy)
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counts = [0] * stripes       # Elementos por franja
+
+    def _lock_bucket(self, k):
+        """Toma el lock de la franja de la cubeta de k y retorna (i, lock).
+
+        Si la tabla se redimensiona mientras se espera el lock, el índice
+        ya no es válido y se vuelve a calcular."""
+        while True:
+            table = self._table
+            i = self._hash(k) % len(table)
+            lock = self._locks[i % len(self._locks)]
+            lock.acquire()
+            if table is self._table:
+                return i, lock
+            lock.release()
+
+    def _grow_if_needed(self, stripe):
+        """Duplica la tabla si la franja modificada sugiere que se superó el
+        factor de carga y el total lo confirma."""
+        table_size = len(self._table)
+        if self._counts[stripe] * len(self._locks) <= self._load_factor * table_size:
+            return
+        if sum(self._counts) <= self._load_factor * table_size:
+            return
+        self._with_all_locks(self._grow, table_size)
+
+    def _grow(self, table_size):
+        if len(self._table) == table_size:  # Nadie la redimensionó antes
+            self._resize(_siguiente_primo(2 * table_size + 1))
+
+    def _with_all_locks(self, funcion, *args):
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            return funcion(*args)
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def _resize(self, c):
+        """Redistribuye los elementos (con todos los locks tomados) y
+        recalcula los contadores por franja."""
+        super()._resize(c)
+        stripes = len(self._locks)
+        self._counts = [0] * stripes
+        for i, bucket in enumerate(self._table):
+            if bucket:
+                self._counts[i % stripes] += len(bucket)
+
+    def reserve(self, n):
+        """Agranda la tabla para n elementos (toma todos los locks)."""
+        self._with_all_locks(super().reserve, n)
+
+    def put_if_absent(self, k, v):
+        """Inserta v en la clave k solo si k no existe, de forma atómica.
+        Retorna True si se insertó y False si la clave ya estaba."""
+        i, lock = self._lock_bucket(k)
+        stripe = i % len(self._locks)
+        try:
+            bucket = self._table[i]
+            if bucket is None:
+                bucket = self._table[i] = UnsortedTableMap()
+            elif k in bucket:
+                return False
+            bucket[k] = v
+            self._counts[stripe] += 1
+        finally:
+            lock.release()
+        self._grow_if_needed(stripe)
+        return True
+
+    def __setitem__(self, k, v):
+        """Inserta o actualiza el valor v en la clave k."""
+        i, lock = self._lock_bucket(k)
+        stripe = i % len(self._locks)
+        try:
+            bucket = self._table[i]
+            if bucket is None:
+                bucket = self._table[i] = UnsortedTableMap()
+            oldsize = len(bucket)
+            bucket[k] = v
+            self._counts[stripe] += len(bucket) - oldsize
+        finally:
+            lock.release()
+        self._grow_if_needed(stripe)
+
+    def __getitem__(self, k):
+        """Retorna el valor asociado a la clave k si existe."""
+        i, lock = self._lock_bucket(k)
+        try:
+            bucket = self._table[i]
+            if bucket is not None:
+                try:
+                    return bucket[k]
+                except KeyError:
+                    pass
+            return None
+        finally:
+            lock.release()
+
+    def pop(self, k):
+        """Elimina la clave k de forma atómica y retorna su valor, o None si
+        no existía."""
+        i, lock = self._lock_bucket(k)
+        try:
+            bucket = self._table[i]
+            if bucket is None:
+                return None
+            try:
+                v = bucket[k]
+            except KeyError:
+                return None
+            del bucket[k]
+            self._counts[i % len(self._locks)] -= 1
+            return v
+        finally:
+            lock.release()
+
+    def __delitem__(self, k):
+        """Elimina el elemento con clave k."""
+        if self.pop(k) is None:
+            raise KeyError("Key Error: " + repr(k))
+
+    def __len__(self):
+        """Retorna el número de elementos almacenados."""
+        return sum(self._counts)
+
+    def snapshot(self):
+        """No admitido: las escrituras por franja no respetan la copia en
+        escritura de HashMapBase, así que la copia no sería consistente."""
+        raise TypeError("ConcurrentHashMap no admite snapshot()")
+
+
+_ESPACIO_DNI = 10 ** 8         # DNIs válidos: exactamente 8 dígitos
+_MAX_ID_BITMAP = 255           # Ids de candidato de 1 byte
+
+
+class DNIBitmapMap:
+    """Almacén de votantes indexado directamente por el valor entero del DNI.
+
+    Como los DNIs válidos son exactamente 8 dígitos, el espacio de claves es
+    10^8: un bit por DNI indica si ya votó (12.5 MB) y un byte por DNI guarda
+    el id del candidato elegido. El arreglo de ids es un mmap anónimo, así
+    que el sistema operativo solo asigna las páginas que llegan a usarse
+    (como máximo 100 MB). No se crea ningún objeto Python por votante y el
+    costo de memoria no depende del tamaño del padrón.
+
+    Ofrece la misma interfaz que HashMapBase; las claves que no son DNIs de
+    8 dígitos se tratan como ausentes. Los valores deben ser ids enteros de
+    candidato entre 0 y 255 (ver RegistroCandidatos).
+    """
+
+    def __init__(self, capacity_hint=None):
+        # capacity_hint se acepta por compatibilidad; el tamaño es fijo
+        self._bits = bytearray(_ESPACIO_DNI // 8)
+        self._ids = mmap.mmap(-1, _ESPACIO_DNI)
+        self._n = 0
+
+    @staticmethod
+    def _dni_a_entero(k):
+        """Convierte un DNI de 8 dígitos a entero, o retorna None si no lo es."""
+        if isinstance(k, str) and len(k) == 8 and k.isdecimal():
+            return int(k)
+        return None
+
+    @staticmethod
+    def _validar_id(v):
+        """Verifica que v sea un id de candidato representable en un byte."""
+        if not isinstance(v, int) or not 0 <= v <= _MAX_ID_BITMAP:
+            raise ValueError(f"El backend bitmap solo admite ids de candidato entre 0 y {_MAX_ID_BITMAP}")
+        return v
+
+    def _entero_valido(self, k):
+        """Como _dni_a_entero, pero lanza KeyError si k no es un DNI."""
+        i = self._dni_a_entero(k)
+        if i is None:
+            raise KeyError("Key Error: " + repr(k))
+        return i
+
+    def put_if_absent(self, k, v):
+        """Inserta v en la clave k solo si k no existe. Retorna True si se
+        insertó y False si el DNI ya estaba."""
+        i = self._entero_valido(k)
+        byte, mascara = i >> 3, 1 << (i & 7)
+        if self._bits[byte] & mascara:
+            return False
+        self._ids[i] = self._validar_id(v)
+        self._bits[byte] |= mascara
+        self._n += 1
+        return True
+
+    def __setitem__(self, k, v):
+        """Inserta o actualiza el valor v en la clave k."""
+        i = self._entero_valido(k)
+        self._ids[i] = self._validar_id(v)
+        byte, mascara = i >> 3, 1 << (i & 7)
+        if not self._bits[byte] & mascara:
+            self._bits[byte] |= mascara
+            self._n += 1
+
+    def __getitem__(self, k):
+        """Retorna el valor asociado a la clave k si existe."""
+        i = self._dni_a_entero(k)
+        if i is None or not self._bits[i >> 3] & (1 << (i & 7)):
+            return None
+        return self._ids[i]
+
+    def __delitem__(self, k):
+        """Elimina el elemento con clave k."""
+        i = self._dni_a_entero(k)
+        if i is None or not self._bits[i >> 3] & (1 << (i & 7)):
+            raise KeyError("Key Error: " + repr(k))
+        self._bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        self._n -= 1
+
+    def pop(self, k):
+        """Elimina la clave k y retorna su valor, o None si no existía."""
+        v = self[k]
+        if v is not None:
+            del self[k]
+        return v
+
+    def __contains__(self, k):
+        """Verifica si la clave k está en el mapa."""
+        return self.__getitem__(k) is not None
+
+    def __len__(self):
+        """Retorna el número de DNIs registrados."""
+        return self._n
+
+    def reserve(self, n):
+        """No hace nada: la capacidad del bitmap es fija."""
+
+    def _enteros(self):
+        """Itera en orden sobre los DNIs registrados como enteros."""
+        for byte, valor in enumerate(self._bits):
+            if valor:
+                base = byte << 3
+                for bit in range(8):
+                    if valor & (1 << bit):
+                        yield base + bit
+
+    def __iter__(self):
+        """Itera sobre todas las claves almacenadas, en orden creciente."""
+        for i in self._enteros():
+            yield f"{i:08d}"
+
+    def items(self):
+        """Itera sobre todos los pares clave-valor del mapa."""
+        for i in self._enteros():
+            yield f"{i:08d}", self._ids[i]
+
+
+class MapSnapshot:
+    """Copia de solo lectura de un mapa, obtenida con snapshot().
+
+    Ofrece las consultas del mapa (búsqueda, pertenencia, longitud,
+    iteración, iter_chunks y bucket_occupancy) pero no las escrituras, que
+    modificarían las cubetas compartidas con el mapa original.
+    """
+
+    __slots__ = ("_map",)
+
+    def __init__(self, frozen):
+        self._map = frozen
+
+    def __getitem__(self, k):
+        """Retorna el valor asociado a la clave k si existe."""
+        return self._map[k]
+
+    def __contains__(self, k):
+        """Verifica si la clave k está en el mapa."""
+        return k in self._map
+
+    def __len__(self):
+        """Retorna el número de elementos almacenados."""
+        return len(self._map)
+
+    def __iter__(self):
+        """Itera sobre todas las claves almacenadas."""
+        return iter(self._map)
+
+    def items(self):
+        """Itera sobre todos los pares clave-valor del mapa."""
+        return self._map.items()
+
+    def iter_chunks(self, size):
+        """Itera sobre los pares clave-valor en listas de unos size pares."""
+        return self._map.iter_chunks(size)
+
+    def bucket_occupancy(self):
+        """Reporta la ocupación de las cubetas del mapa copiado."""
+        return self._map.bucket_occupancy()
+
+
+# Almacenes disponibles para los votantes de SistemaVotacion. Cada fábrica
+# recibe el tamaño esperado del padrón (o None).
+BACKENDS_VOTANTES = {
+    "encadenamiento": lambda capacity_hint: HashMapBase(capacity_hint, hash_strategy="dni"),
+    "sondeo": lambda capacity_hint: ProbeHashMap(capacity_hint, hash_strategy="dni"),
+    "bitmap": DNIBitmapMap,
+}
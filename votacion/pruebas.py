@@ -0,0 +1,60 @@
+"""Pruebas de demostración del informe: carga de ejemplo, distribución de
+las estrategias hash y DNIs inválidos. Los tiempos se miden con
+votacion.benchmark y las cargas grandes se generan con votacion.generador.
+
+Uso:
+    python -m votacion.pruebas
+"""
+
+import random
+
+from .generador import GeneradorVotos
+from .mapas import HASH_STRATEGIES, HashMapBase
+from .sistema import SistemaVotacion
+
+
+def generar_dni():
+    """Genera un DNI aleatorio válido de 8 dígitos como string. Dos
+    llamadas pueden dar el mismo DNI; para DNIs distintos en cantidad se
+    usa GeneradorVotos."""
+    return f"{random.randrange(10 ** 8):08d}"
+
+
+def prueba_distribucion(dnis):
+    """Compara la ocupación de cubetas de cada estrategia hash con los DNIs dados."""
+    print(f"\n[Distribución] Ocupación de cubetas con {len(dnis)} DNIs:")
+    for nombre in HASH_STRATEGIES:
+        tabla = HashMapBase(capacity_hint=len(dnis), hash_strategy=nombre)
+        for dni in dnis:
+            tabla[dni] = True
+        ocupacion = tabla.bucket_occupancy()
+        print(f"  {nombre:>6}: {ocupacion['used']}/{ocupacion['buckets']} cubetas usadas, "
+              f"cadena máxima {ocupacion['max_chain']}, "
+              f"cadena media {ocupacion['mean_chain']:.2f}")
+
+
+def caso_extremo_dnis_invalidos(sistema):
+    """Se prueban DNIs vacíos o con caracteres inválidos."""
+    print("\n[Prueba extrema] DNIs inválidos:")
+    print(sistema.registrar_voto("", "A"))
+    print(sistema.registrar_voto("ABC12345", "B"))
+    print(sistema.registrar_voto("-0000001", "C"))
+
+
+def main():
+    sistema = SistemaVotacion()
+
+    # Carga de prueba; los tiempos se miden con votacion.benchmark
+    dnis, candidatos = GeneradorVotos(candidatos=["A", "B", "C"]).lote(1000)
+    for dni, candidato in zip(dnis, candidatos):
+        sistema.registrar_voto(dni, candidato)
+    print("Total de votantes:", sistema.total_votantes())
+    print("Resultados:", sistema.mostrar_resultados())
+    prueba_distribucion(list(sistema.votantes))
+
+    # Casos extremos
+    caso_extremo_dnis_invalidos(SistemaVotacion())
+
+
+if __name__ == "__main__":
+    main()
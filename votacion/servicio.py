@@ -0,0 +1,257 @@
+"""Servicio de votación en red (TCP, un comando por línea) con asyncio.
+
+Protocolo: cada línea es un comando y cada respuesta es una línea JSON.
+
+    VOTAR <dni> <candidato>    {"estado": "ok" | "dni_invalido" | "ya_voto" | "candidato_invalido"}
+    CONSULTAR <dni>            {"estado": "ok", "candidato": <nombre o null>}
+    ELIMINAR <dni>             {"estado": "ok" | "no_registrado"}
+    RESULTADOS                 {"estado": "ok", "resultados": {...}, "total": n}
+
+Si aplicar una petición lanza una excepción, esa petición (o todos los
+votos de su microlote) responde {"estado": "error", "detalle": "..."} y el
+servicio sigue atendiendo las demás.
+
+Las peticiones de todas las conexiones pasan por una única cola. Un bucle
+de fondo la vacía en microlotes: los votos consecutivos se aplican juntos
+con registrar_votos_lote y el resto de operaciones se ejecuta en orden
+entre ellos, así que nunca se observa un voto fuera de orden. Un cliente
+puede enviar varias líneas sin esperar respuesta; las respuestas llegan en
+el mismo orden.
+
+Uso:
+    python -m votacion.servicio servidor --puerto 8765 --candidatos A,B,C
+    python -m votacion.servicio carga --puerto 8765 --conexiones 50 --votos 100000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from .generador import GeneradorVotos
+from .mapas import BACKENDS_VOTANTES
+from .sistema import (SistemaVotacion, VOTO_REGISTRADO, DNI_INVALIDO, YA_VOTO,
+                      DUPLICADO_EN_LOTE, CANDIDATO_INVALIDO)
+
+TAM_LOTE = 1000
+ESPERA_LOTE = 0.001      # Segundos que se espera a que el lote se llene
+
+ESTADOS_VOTO = {
+    VOTO_REGISTRADO: "ok",
+    DNI_INVALIDO: "dni_invalido",
+    YA_VOTO: "ya_voto",
+    DUPLICADO_EN_LOTE: "ya_voto",      # Otra petición del mismo lote ganó
+    CANDIDATO_INVALIDO: "candidato_invalido",
+}
+
+
+class ServicioVotacion:
+    """Atiende conexiones TCP y aplica sus peticiones sobre un
+    SistemaVotacion en microlotes de hasta tam_lote peticiones."""
+
+    def __init__(self, sistema, tam_lote=TAM_LOTE, espera_lote=ESPERA_LOTE):
+        self.sistema = sistema
+        self._tam_lote = tam_lote
+        self._espera_lote = espera_lote
+        self._cola = asyncio.Queue()
+        self._aplicador = None
+        self.lotes_aplicados = 0
+        self.peticiones_atendidas = 0
+
+    async def iniciar(self, host="127.0.0.1", puerto=8765):
+        """Inicia el bucle de lotes y el servidor TCP; retorna el servidor."""
+        self._aplicador = asyncio.create_task(self._aplicar_lotes())
+        return await asyncio.start_server(self._atender_conexion, host, puerto)
+
+    async def detener(self):
+        if self._aplicador is not None:
+            self._aplicador.cancel()
+            try:
+                await self._aplicador
+            except asyncio.CancelledError:
+                pass
+
+    def _encolar(self, operacion, *argumentos):
+        futuro = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((operacion, argumentos, futuro))
+        return futuro
+
+    async def _atender_conexion(self, lector, escritor):
+        """Lee comandos de una conexión y escribe las respuestas en orden."""
+        respuestas = asyncio.Queue()
+        escritura = asyncio.create_task(self._escribir_respuestas(respuestas, escritor))
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                respuestas.put_nowait(self._interpretar(linea.decode("utf-8", "replace").strip()))
+        finally:
+            respuestas.put_nowait(None)
+            await escritura
+
+    async def _escribir_respuestas(self, respuestas, escritor):
+        try:
+            while True:
+                futuro = await respuestas.get()
+                if futuro is None:
+                    break
+                escritor.write(json.dumps(await futuro, ensure_ascii=False).encode("utf-8") + b"\n")
+                if respuestas.empty():
+                    await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    def _interpretar(self, linea):
+        """Convierte una línea en un futuro con su respuesta."""
+        comando, _, resto = linea.partition(" ")
+        comando = comando.upper()
+        if comando == "VOTAR":
+            dni, _, candidato = resto.strip().partition(" ")
+            return self._encolar("votar", dni, candidato.strip())
+        if comando in ("CONSULTAR", "ELIMINAR"):
+            return self._encolar(comando.lower(), resto.strip())
+        if comando == "RESULTADOS":
+            return self._encolar("resultados")
+        futuro = asyncio.get_running_loop().create_future()
+        futuro.set_result({"estado": "comando_desconocido"})
+        return futuro
+
+    async def _siguiente_lote(self):
+        """Espera la primera petición y junta las que lleguen enseguida."""
+        lote = [await self._cola.get()]
+        limite = time.monotonic() + self._espera_lote
+        while len(lote) < self._tam_lote:
+            if not self._cola.empty():
+                lote.append(self._cola.get_nowait())
+                continue
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self._cola.get(), restante))
+            except asyncio.TimeoutError:
+                break
+        return lote
+
+    async def _aplicar_lotes(self):
+        while True:
+            lote = await self._siguiente_lote()
+            votos = []
+            for peticion in lote:
+                if peticion[0] == "votar":
+                    votos.append(peticion)
+                    continue
+                self._aplicar_seguro(votos, self._aplicar_votos, votos)
+                votos = []
+                self._aplicar_seguro([peticion], self._aplicar, peticion)
+            self._aplicar_seguro(votos, self._aplicar_votos, votos)
+            self.lotes_aplicados += 1
+            self.peticiones_atendidas += len(lote)
+
+    def _aplicar_seguro(self, peticiones, funcion, argumento):
+        """Llama a funcion(argumento); si falla, responde con el error a las
+        peticiones que quedaron sin respuesta en lugar de detener el bucle."""
+        try:
+            funcion(argumento)
+        except Exception as error:
+            for _, _, futuro in peticiones:
+                if not futuro.done():
+                    futuro.set_result({"estado": "error", "detalle": str(error)})
+
+    def _aplicar_votos(self, votos):
+        if not votos:
+            return
+        codigos = self.sistema.registrar_votos_lote([a[0] for _, a, _ in votos],
+                                                    [a[1] for _, a, _ in votos])
+        for (_, _, futuro), codigo in zip(votos, codigos):
+            if not futuro.cancelled():
+                futuro.set_result({"estado": ESTADOS_VOTO[codigo]})
+
+    def _aplicar(self, peticion):
+        operacion, argumentos, futuro = peticion
+        sistema = self.sistema
+        if operacion == "consultar":
+            respuesta = {"estado": "ok", "candidato": sistema.candidato_de(argumentos[0])}
+        elif operacion == "eliminar":
+            eliminado = sistema.votantes[argumentos[0]] is not None
+            sistema.eliminar_votante(argumentos[0])
+            respuesta = {"estado": "ok" if eliminado else "no_registrado"}
+        else:
+            respuesta = {"estado": "ok", "resultados": sistema.mostrar_resultados(),
+                         "total": sistema.total_votantes()}
+        if not futuro.cancelled():
+            futuro.set_result(respuesta)
+
+
+async def cliente_de_carga(host, puerto, conexiones, votos, candidatos, ventana=100):
+    """Generador de carga local: abre varias conexiones que envían votos
+    aleatorios con hasta `ventana` peticiones en vuelo cada una. Retorna
+    (votos enviados, segundos)."""
+    por_conexion = votos // conexiones
+
+    async def una_conexion(semilla):
+        generador = GeneradorVotos(semilla, candidatos)
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        enviados = 0
+        while enviados < por_conexion:
+            n = min(ventana, por_conexion - enviados)
+            dnis, elegidos = generador.lote(n)
+            for dni, candidato in zip(dnis, elegidos):
+                escritor.write(f"VOTAR {dni} {candidato}\n".encode())
+            await escritor.drain()
+            for _ in range(n):
+                await lector.readline()
+            enviados += n
+        escritor.close()
+        await escritor.wait_closed()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(una_conexion(i) for i in range(conexiones)))
+    return por_conexion * conexiones, time.perf_counter() - inicio
+
+
+async def _servir(args):
+    candidatos = args.candidatos.split(",") if args.candidatos else None
+    servicio = ServicioVotacion(SistemaVotacion(args.capacidad, args.backend, candidatos),
+                                args.lote, args.espera)
+    servidor = await servicio.iniciar(args.host, args.puerto)
+    print(f"[Servicio] Escuchando en {args.host}:{args.puerto}")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio de votación en red.")
+    sub = parser.add_subparsers(dest="modo", required=True)
+    servidor = sub.add_parser("servidor", help="inicia el servicio")
+    carga = sub.add_parser("carga", help="genera carga contra un servicio local")
+    for p in (servidor, carga):
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--puerto", type=int, default=8765)
+    servidor.add_argument("--candidatos", help="lista cerrada de candidatos separados por comas")
+    servidor.add_argument("--backend", default="encadenamiento", choices=sorted(BACKENDS_VOTANTES))
+    servidor.add_argument("--capacidad", type=int, help="tamaño esperado del padrón")
+    servidor.add_argument("--lote", type=int, default=TAM_LOTE, help="peticiones por microlote")
+    servidor.add_argument("--espera", type=float, default=ESPERA_LOTE,
+                          help="segundos de espera para completar un microlote")
+    carga.add_argument("--conexiones", type=int, default=50)
+    carga.add_argument("--votos", type=int, default=100000)
+    carga.add_argument("--candidatos", default="A,B,C")
+    args = parser.parse_args(argv)
+
+    if args.modo == "servidor":
+        try:
+            asyncio.run(_servir(args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        enviados, segundos = asyncio.run(cliente_de_carga(
+            args.host, args.puerto, args.conexiones, args.votos, args.candidatos.split(",")))
+        print(f"[Carga] {enviados} votos en {segundos:.3f} segundos ({enviados / segundos:.0f} votos/s)")
+
+
+if __name__ == "__main__":
+    main()
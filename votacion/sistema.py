@@ -0,0 +1,762 @@
+"""Sistema de votación: registro de candidatos, clasificación y votantes."""
+
+import contextlib
+import threading
+from array import array
+
+from .mapas import BACKENDS_VOTANTES, ConcurrentHashMap, _MAX_ID_BITMAP
+from .filtros import MapaFiltrado
+
+_np = None
+_np_cargado = False
+
+
+def _numpy():
+    """Retorna el módulo NumPy, o None si no está instalado. Se importa la
+    primera vez que hace falta: tarda bastante más que todo el paquete y
+    solo lo usa la validación por lotes."""
+    global _np, _np_cargado
+    if not _np_cargado:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = None
+        _np_cargado = True
+    return _np
+
+
+class RegistroCandidatos:
+    """Registro de candidatos que asigna a cada nombre un id entero pequeño
+    (0, 1, 2, ...) en orden de registro.
+
+    Si se construye con una lista de candidatos queda cerrado: solo esos
+    nombres son válidos. Sin lista queda abierto y cada nombre nuevo recibe
+    el siguiente id con el primer voto aceptado por él (ver registrar_si).
+    maximo limita el número de candidatos (por ejemplo, a los ids que caben
+    en el almacén).
+    """
+
+    def __init__(self, candidatos=None, maximo=None):
+        self._nombres = []                 # Id -> nombre
+        self._ids = {}                     # Nombre -> id
+        self._cerrado = False
+        self._maximo = maximo
+        self._lock = threading.Lock()      # Solo se usa al registrar nombres
+        if candidatos is not None:
+            for nombre in candidatos:
+                self.registrar(nombre)
+            self._cerrado = True
+
+    @property
+    def cerrado(self):
+        """Indica si el registro ya no admite candidatos nuevos."""
+        return self._cerrado
+
+    def registrar(self, nombre):
+        """Registra un candidato y retorna su id (el existente si ya estaba)."""
+        with self._lock:
+            cid = self._ids.get(nombre)
+            if cid is None:
+                if self._cerrado:
+                    raise ValueError(f"El registro de candidatos está cerrado: {nombre!r}")
+                if self.lleno:
+                    raise ValueError(f"El registro admite como máximo {self._maximo} candidatos")
+                cid = self._agregar(nombre)
+            return cid
+
+    def _agregar(self, nombre):
+        """Agrega un nombre nuevo (con el lock tomado) y retorna su id."""
+        self._nombres.append(nombre)
+        cid = self._ids[nombre] = len(self._nombres) - 1
+        return cid
+
+    @property
+    def lleno(self):
+        """Indica si ya se alcanzó el máximo de candidatos."""
+        return self._maximo is not None and len(self._nombres) >= self._maximo
+
+    def cerrar(self):
+        """Cierra el registro: a partir de ahora no admite candidatos nuevos."""
+        self._cerrado = True
+
+    def admite(self, nombre):
+        """Indica si nombre está registrado o todavía se puede registrar."""
+        return nombre in self._ids or not (self._cerrado or self.lleno)
+
+    def registrar_si(self, nombre, aceptar):
+        """Registra nombre solo si aceptar(cid) retorna verdadero (por
+        ejemplo, si se acepta el voto que lo trae). Retorna (cid, aceptado),
+        o (None, False) si el nombre es nuevo y el registro está cerrado o
+        lleno.
+
+        aceptar se llama con el lock del registro tomado. Un nombre nuevo
+        recibe el siguiente id y nombre(cid) ya funciona dentro de aceptar,
+        pero id_de no lo encuentra hasta que aceptar lo confirma; si retorna
+        falso o lanza una excepción, el nombre se descarta."""
+        with self._lock:
+            cid = self._ids.get(nombre)
+            if cid is not None:
+                return cid, aceptar(cid)
+            if self._cerrado or self.lleno:
+                return None, False
+            cid = len(self._nombres)
+            self._nombres.append(nombre)
+            aceptado = False
+            try:
+                aceptado = aceptar(cid)
+            finally:
+                if aceptado:
+                    self._ids[nombre] = cid
+                else:
+                    self._nombres.pop()
+            return cid, aceptado
+
+    def id_de(self, nombre):
+        """Retorna el id del candidato, o None si no está registrado."""
+        return self._ids.get(nombre)
+
+    def nombre(self, cid):
+        """Retorna el nombre del candidato con id cid."""
+        return self._nombres[cid]
+
+    def __contains__(self, nombre):
+        return nombre in self._ids
+
+    def __len__(self):
+        return len(self._nombres)
+
+    def __iter__(self):
+        """Itera sobre los nombres en orden de id."""
+        return iter(self._nombres)
+
+
+class Clasificacion:
+    """Ranking de candidatos por número de votos, mantenido de forma
+    incremental a medida que cambian los conteos.
+
+    _orden guarda los ids de candidato de mayor a menor cantidad de votos y
+    _posicion la posición de cada id en _orden. Cuando un conteo cambia en
+    ±1 (un voto o una eliminación) el candidato solo cruza un bloque de
+    empatados, así que basta intercambiarlo con el extremo de ese bloque,
+    ubicado por búsqueda binaria: O(log C). Los cambios mayores (lotes)
+    desplazan el tramo intermedio. El líder y el margen se leen en O(1).
+
+    Con diferida=True (modo concurrente del sistema) los escritores no
+    toman el lock del ranking: solo lo marcan con invalidar(), y la
+    siguiente lectura lo reordena desde resultados en O(C log C). Así los
+    votos para candidatos distintos no se serializan en la clasificación.
+
+    Cada cambio se publica a los suscriptores como (nombre, delta, votos),
+    fuera del lock, de modo que un suscriptor puede consultar el ranking.
+    """
+
+    def __init__(self, candidatos, resultados=(), diferida=False):
+        self._candidatos = candidatos      # RegistroCandidatos, para los nombres
+        self._suscriptores = []            # Se reemplaza, nunca se modifica
+        self._lock = threading.Lock()
+        self._resultados = resultados if diferida else None   # Conteos vivos, en modo diferido
+        self._invalida = False
+        self.reconstruir(resultados)
+
+    def reconstruir(self, resultados):
+        """Vuelve a ordenar desde un arreglo de conteos completo (por
+        ejemplo, tras reproducir un diario). No notifica a los suscriptores."""
+        with self._lock:
+            if self._resultados is not None:
+                self._resultados = resultados
+            self._invalida = False
+            self._ordenar(resultados)
+
+    def _ordenar(self, resultados):
+        self._votos = list(resultados)
+        self._orden = sorted(range(len(self._votos)), key=self._votos.__getitem__,
+                             reverse=True)
+        self._posicion = [0] * len(self._orden)
+        for i, cid in enumerate(self._orden):
+            self._posicion[cid] = i
+
+    def invalidar(self):
+        """Marca el ranking diferido como desactualizado, sin tomar el lock."""
+        self._invalida = True
+
+    def _al_dia(self):
+        """Con el lock tomado, reordena el ranking diferido si hubo cambios.
+        La marca se borra antes de copiar los conteos: un cambio posterior a
+        la copia vuelve a marcarlo."""
+        if self._invalida:
+            self._invalida = False
+            self._ordenar(self._resultados)
+
+    def _agregar(self, cid):
+        """Agrega con 0 votos (al final del ranking) los ids hasta cid."""
+        while len(self._votos) <= cid:
+            self._posicion.append(len(self._orden))
+            self._orden.append(len(self._votos))
+            self._votos.append(0)
+
+    def agregar(self, cid):
+        """Incorpora un candidato nuevo sin votos."""
+        with self._lock:
+            self._agregar(cid)
+
+    def aplicar(self, cid, delta):
+        """Suma delta votos al candidato cid y lo reubica en el ranking sin
+        notificar. Retorna el cambio (cid, delta, votos) para pasarlo a
+        notificar() una vez fuera de los locks del llamador."""
+        with self._lock:
+            self._agregar(cid)
+            votos = self._votos[cid] = self._votos[cid] + delta
+            if delta > 0:
+                self._subir(cid, votos)
+            elif delta < 0:
+                self._bajar(cid, votos)
+        return cid, delta, votos
+
+    def notificar(self, cambios):
+        """Publica a los suscriptores los cambios retornados por aplicar()."""
+        suscriptores = self._suscriptores
+        if suscriptores:
+            for cid, delta, votos in cambios:
+                nombre = self._candidatos.nombre(cid)
+                for funcion in suscriptores:
+                    funcion(nombre, delta, votos)
+
+    def _subir(self, cid, votos):
+        orden, conteo = self._orden, self._votos
+        i = self._posicion[cid]
+        # Primera posición de _orden[:i] con menos votos que cid
+        bajo, alto = 0, i
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if conteo[orden[medio]] < votos:
+                alto = medio
+            else:
+                bajo = medio + 1
+        if bajo < i:
+            self._mover(i, bajo)
+
+    def _bajar(self, cid, votos):
+        orden, conteo = self._orden, self._votos
+        i = self._posicion[cid]
+        # Última posición de _orden[i+1:] con más votos que cid
+        bajo, alto = i + 1, len(orden)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if conteo[orden[medio]] > votos:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo - 1 > i:
+            self._mover(i, bajo - 1)
+
+    def _mover(self, i, j):
+        """Lleva el candidato de la posición i a la j manteniendo el orden."""
+        orden, posicion, conteo = self._orden, self._posicion, self._votos
+        if conteo[orden[i + 1 if j > i else i - 1]] == conteo[orden[j]]:
+            orden[i], orden[j] = orden[j], orden[i]    # El tramo es un empate
+            posicion[orden[i]] = i
+            posicion[orden[j]] = j
+            return
+        cid = orden.pop(i)
+        orden.insert(j, cid)
+        for p in range(min(i, j), max(i, j) + 1):
+            posicion[orden[p]] = p
+
+    def lider(self):
+        """Retorna (nombre, votos) del candidato con más votos, o None."""
+        with self._lock:
+            self._al_dia()
+            if not self._orden:
+                return None
+            cid = self._orden[0]
+            return self._candidatos.nombre(cid), self._votos[cid]
+
+    def margen(self):
+        """Retorna la diferencia de votos entre el primero y el segundo."""
+        with self._lock:
+            self._al_dia()
+            if not self._orden:
+                return 0
+            segundo = self._votos[self._orden[1]] if len(self._orden) > 1 else 0
+            return self._votos[self._orden[0]] - segundo
+
+    def top(self, k=None):
+        """Retorna los k primeros (todos si k es None) como una lista de
+        pares (nombre, votos) en orden de ranking."""
+        with self._lock:
+            self._al_dia()
+            ids = self._orden if k is None else self._orden[:k]
+            return [(self._candidatos.nombre(cid), self._votos[cid]) for cid in ids]
+
+    def suscribir(self, funcion):
+        """Registra funcion(nombre, delta, votos), que se llama con cada
+        cambio de conteo. Retorna funcion."""
+        with self._lock:
+            self._suscriptores = self._suscriptores + [funcion]
+        return funcion
+
+    def desuscribir(self, funcion):
+        """Deja de notificar a funcion."""
+        with self._lock:
+            self._suscriptores = [f for f in self._suscriptores if f is not funcion]
+
+
+# Códigos de estado de registrar_votos_lote (uno por fila del lote)
+VOTO_REGISTRADO = 0
+DNI_INVALIDO = 1
+YA_VOTO = 2
+DUPLICADO_EN_LOTE = 3
+CANDIDATO_INVALIDO = 4
+MESA_INVALIDA = 5
+
+# Con territorio, el valor de cada votante es cid | (mesa + 1) << 16; sin
+# mesa (o sin territorio) es simplemente cid
+_BITS_CANDIDATO = 16
+_MASCARA_CANDIDATO = (1 << _BITS_CANDIDATO) - 1
+
+# Id provisional, durante la validación de un lote, de un nombre que aún no
+# está en un registro abierto
+_CANDIDATO_NUEVO = -2
+
+_SIN_LOCK = contextlib.nullcontext()
+
+
+class _ConsultasVotacion:
+    """Consultas comunes a SistemaVotacion y VistaVotacion, sobre votantes,
+    resultados, candidatos y territorio."""
+
+    def total_votantes(self):
+        """Devuelve el número total de votantes únicos registrados."""
+        return len(self.votantes)
+
+    def mostrar_resultados(self):
+        """Devuelve los resultados de la votación en forma de diccionario."""
+        return dict(zip(self.candidatos, self.resultados))
+
+    def resultados_de(self, nivel, nombre=None):
+        """Devuelve los resultados de una mesa, distrito o región (o los
+        nacionales, con nivel "nacional") como diccionario, en O(c). Retorna
+        None si el nodo no existe."""
+        if nivel == "nacional":
+            return self.mostrar_resultados()
+        if self.territorio is None:
+            raise ValueError("El sistema no tiene territorio")
+        conteos = self.territorio.conteos(nivel, nombre)
+        if conteos is None:
+            return None
+        return dict(zip(self.candidatos, conteos))
+
+    def candidato_de(self, dni):
+        """Retorna el nombre del candidato por el que votó dni, o None."""
+        valor = self.votantes[dni]
+        if valor is None:
+            return None
+        return self.candidatos.nombre(valor & _MASCARA_CANDIDATO)
+
+
+class SistemaVotacion(_ConsultasVotacion):
+    """Clase principal que gestiona el sistema de votación.
+
+    vista() retorna una VistaVotacion congelada y consistente para leer
+    (reportes, exportaciones, auditorías) mientras se siguen registrando
+    votos: el sistema solo se detiene lo que tarda en copiar la lista de
+    cubetas de votantes y los conteos.
+    """
+
+    def __init__(self, capacity_hint=None, backend="encadenamiento", candidatos=None,
+                 diario=None, concurrente=False, filtro=None, territorio=None,
+                 auditoria=None):
+        # capacity_hint: tamaño esperado del padrón, para reservar la tabla
+        # backend: almacén de votantes, una clave de BACKENDS_VOTANTES
+        # candidatos: lista cerrada de candidatos; None acepta cualquier nombre
+        # diario: DiarioVotos opcional donde se anota cada operación aceptada
+        # concurrente: permite llamar al sistema desde varios hilos a la vez
+        # filtro: tasa de falsos positivos de un filtro cuckoo delante de los
+        #         votantes (ver filtros.py), o None para no usarlo
+        # territorio: Territorio opcional para llevar conteos por mesa,
+        #             distrito y región (ver territorio.py)
+        # auditoria: RegistroAuditoria opcional (árbol de Merkle de las
+        #            operaciones aceptadas, ver auditoria.py)
+        if backend not in BACKENDS_VOTANTES:
+            raise ValueError(f"Backend de votantes desconocido: {backend!r}")
+        # Ids de candidato que caben en el valor de cada votante (un byte
+        # en el bitmap, _BITS_CANDIDATO en los demás); una lista cerrada más
+        # larga se rechaza aquí
+        maximo = _MAX_ID_BITMAP + 1 if backend == "bitmap" else 1 << _BITS_CANDIDATO
+        self.candidatos = RegistroCandidatos(candidatos, maximo)
+        if concurrente:
+            if backend != "encadenamiento":
+                raise ValueError("El modo concurrente solo admite el backend 'encadenamiento'")
+            self.votantes = ConcurrentHashMap(capacity_hint, hash_strategy="dni")
+        else:
+            self.votantes = BACKENDS_VOTANTES[backend](capacity_hint)  # Claves: DNI, Valores: id del candidato
+        if filtro is not None:
+            if concurrente or backend == "bitmap":
+                raise ValueError("El filtro solo admite los backends 'encadenamiento' y 'sondeo' sin modo concurrente")
+            self.votantes = MapaFiltrado(self.votantes, capacity_hint, filtro)
+        if territorio is not None and backend == "bitmap":
+            raise ValueError("El backend 'bitmap' no puede guardar la mesa de cada voto")
+        self.resultados = array("q", bytes(8 * len(self.candidatos)))  # Índice: id del candidato, Valor: conteo
+        self.territorio = territorio
+        if territorio is not None:
+            territorio.ampliar(len(self.candidatos))
+        self.clasificacion = Clasificacion(self.candidatos, self.resultados, diferida=concurrente)
+        self.diario = diario
+        self.auditoria = auditoria
+        # Un lock por candidato para que los incrementos sean atómicos
+        self._locks_conteo = [threading.Lock() for _ in self.candidatos] if concurrente else None
+        self._lock_candidatos = threading.Lock()
+        # Cada escritura deja votantes y conteos coherentes antes de soltarlo,
+        # y vista() los copia con él tomado (ver _escritura)
+        self._lock_escritura = threading.Lock()
+
+    @property
+    def _escritura(self):
+        """Lock que hace atómica cada escritura. En modo concurrente sin
+        diario ni auditoría no se usa, para no serializar a los escritores
+        (y vista() no está disponible). Con diario o auditoría sí: el cambio
+        en votantes y su registro deben quedar en el mismo orden, y esas
+        escrituras ya se serializan en el lock del diario o del registro."""
+        if self._locks_conteo is not None and self.diario is None and self.auditoria is None:
+            return _SIN_LOCK
+        return self._lock_escritura
+
+    def _ampliar_resultados(self, cid):
+        """Agrega conteos (y locks) hasta cubrir el id de un candidato nuevo.
+
+        Los conteos se amplían al final: un hilo que ve len(resultados) > cid
+        sin tomar el lock ya encuentra el lock de conteo, el ranking y las
+        columnas del territorio de ese candidato."""
+        with self._lock_candidatos:
+            n = cid + 1
+            if len(self.resultados) >= n:
+                return
+            if self._locks_conteo is not None:
+                while len(self._locks_conteo) < n:
+                    self._locks_conteo.append(threading.Lock())
+            self.clasificacion.agregar(cid)
+            if self.territorio is not None:
+                self.territorio.ampliar(n)
+            self.resultados.extend([0] * (n - len(self.resultados)))
+            if self._locks_conteo is not None:
+                self.clasificacion.invalidar()
+
+    def _sumar_votos(self, cid, votos):
+        """Suma votos (positivos o negativos) al conteo del candidato cid.
+        Retorna el cambio de la clasificación, que el llamador notifica
+        después de soltar _escritura: un suscriptor puede volver a llamar
+        al sistema."""
+        if self._locks_conteo is None:
+            self.resultados[cid] += votos
+            return self.clasificacion.aplicar(cid, votos)
+        with self._locks_conteo[cid]:
+            total = self.resultados[cid] = self.resultados[cid] + votos
+        self.clasificacion.invalidar()
+        return cid, votos, total
+
+    def _resolver_mesa(self, mesa):
+        """Retorna el id de la mesa (-1 si no se indicó), o None si no es
+        una mesa del territorio."""
+        if mesa is None:
+            return -1
+        if self.territorio is None:
+            return None
+        return self.territorio.id_mesa(mesa)
+
+    def registrar_voto(self, dni, candidato, mesa=None):
+        """Registra el voto de un votante identificado por su DNI, emitido
+        opcionalmente en una mesa del territorio."""
+
+        # Validación del formato de DNI
+        if not isinstance(dni, str) or not dni.isascii() or not dni.isdigit() or len(dni) != 8:
+            return f"Error: el DNI '{dni}' no es válido. Debe tener 8 dígitos numéricos."
+
+        if not self.candidatos.admite(candidato):
+            return f"Error: el candidato '{candidato}' no está registrado."
+        m = self._resolver_mesa(mesa)
+        if m is None:
+            return f"Error: la mesa '{mesa}' no está registrada."
+
+        with self._escritura:
+            cid = self.candidatos.id_de(candidato)
+            if cid is not None:
+                guardado = self._guardar_voto(dni, cid, m)
+            else:
+                # Un nombre nuevo solo queda registrado si su voto se acepta
+                cid, guardado = self.candidatos.registrar_si(
+                    candidato, lambda cid: self._guardar_voto(dni, cid, m))
+                if cid is None:
+                    return f"Error: el candidato '{candidato}' no está registrado."
+            if not guardado:
+                return f"Error: el DNI {dni} ya ha votado."
+            if cid >= len(self.resultados):    # Candidato nuevo en registro abierto
+                self._ampliar_resultados(cid)
+
+            cambio = self._sumar_votos(cid, 1)
+            if m >= 0:
+                self.territorio.sumar(m, cid, 1)
+            if self.auditoria is not None:
+                self.auditoria.anotar_voto(dni, cid, m)
+        self.clasificacion.notificar([cambio])
+        return f"Voto registrado exitosamente para {candidato}."
+
+    def _guardar_voto(self, dni, cid, m):
+        """Guarda el votante y anota el voto en el diario, antes de contarlo
+        y confirmarlo; si el diario falla, lo deshace. Retorna False si el
+        DNI ya había votado."""
+        if not self.votantes.put_if_absent(dni, cid | (m + 1) << _BITS_CANDIDATO):
+            return False
+        if self.diario is not None:
+            try:
+                self.diario.anotar_voto(dni, cid, self.candidatos, m)
+            except BaseException:
+                self.votantes.pop(dni)
+                raise
+        return True
+
+    def registrar_votos_lote(self, dnis, candidatos, mesas=None):
+        """Registra un lote de votos; dnis[i] vota por candidatos[i] (en la
+        mesa mesas[i], si se indica).
+
+        Valida todo el lote de una vez (con NumPy si está disponible), detecta
+        DNIs repetidos dentro del lote y contra los ya registrados, y aplica
+        los votos aceptados en una sola pasada. Retorna un bytearray con un
+        código de estado por fila (VOTO_REGISTRADO, DNI_INVALIDO, YA_VOTO,
+        DUPLICADO_EN_LOTE, CANDIDATO_INVALIDO o MESA_INVALIDA) en lugar de
+        mensajes.
+        """
+        if len(dnis) != len(candidatos) or (mesas is not None and len(mesas) != len(dnis)):
+            raise ValueError("dnis, candidatos y mesas deben tener la misma longitud")
+        validacion = None
+        np = _numpy()
+        if np is not None:
+            validacion = self._validar_lote_numpy(np, dnis, candidatos)
+        if validacion is None:
+            validacion = self._validar_lote_python(dnis, candidatos)
+        codigos, dnis, cids = validacion
+        with self._escritura:
+            cambios = self._aplicar_lote(codigos, dnis, cids, mesas, candidatos)
+        self.clasificacion.notificar(cambios)
+        return codigos
+
+    def _aplicar_lote(self, codigos, dnis, cids, mesas, candidatos):
+        """Aplica los votos aceptados de un lote validado y marca en codigos
+        los rechazados al aplicarlos (YA_VOTO, MESA_INVALIDA o, si el
+        registro se llenó, CANDIDATO_INVALIDO). Retorna los cambios de la
+        clasificación, para notificarlos fuera de _escritura.
+
+        Los nombres nuevos (_CANDIDATO_NUEVO en cids) se registran con su
+        primer voto guardado, como en registrar_voto.
+
+        Los votos guardados se anotan en el diario con una sola escritura
+        antes de sumar los conteos (en bloque). Si algo falla antes de eso,
+        se quitan del almacén los votantes ya guardados del lote, de modo
+        que votantes, resultados y diario no se desfasan."""
+        put_if_absent = self.votantes.put_if_absent
+        conteo = [0] * len(self.resultados)
+        conteo_mesas = {}                  # (mesa, cid) -> votos
+        ids_mesa = {}
+        nuevos = {}                        # Nombre nuevo -> id, una vez registrado
+        guardados = []                     # (dni, cid, mesa) de los votos guardados
+        m = -1
+        try:
+            for i, codigo in enumerate(codigos):
+                if codigo == VOTO_REGISTRADO:
+                    cid = cids[i]
+                    if mesas is not None:
+                        mesa = mesas[i]
+                        m = ids_mesa.get(mesa)
+                        if m is None:
+                            m = ids_mesa[mesa] = self._resolver_mesa(mesa)
+                            if m is None:
+                                m = ids_mesa[mesa] = -2
+                        if m == -2:
+                            codigos[i] = MESA_INVALIDA
+                            continue
+                    if cid == _CANDIDATO_NUEVO:
+                        cid = nuevos.get(candidatos[i], cid)
+                    if cid != _CANDIDATO_NUEVO:
+                        guardado = put_if_absent(dnis[i], cid | (m + 1) << _BITS_CANDIDATO)
+                    else:
+                        # Un nombre nuevo solo queda registrado si su voto se guarda
+                        dni, valor = dnis[i], (m + 1) << _BITS_CANDIDATO
+                        cid, guardado = self.candidatos.registrar_si(
+                            candidatos[i], lambda cid: put_if_absent(dni, cid | valor))
+                        if cid is None:
+                            codigos[i] = CANDIDATO_INVALIDO
+                            continue
+                        if guardado:
+                            nuevos[candidatos[i]] = cid
+                    if guardado:
+                        if cid >= len(conteo):
+                            # Candidato nuevo de este lote, o publicado por otro
+                            # hilo que aún no amplió los conteos
+                            self._ampliar_resultados(cid)
+                            conteo.extend([0] * (cid + 1 - len(conteo)))
+                        guardados.append((dnis[i], cid, m))
+                        conteo[cid] += 1
+                        if m >= 0:
+                            conteo_mesas[m, cid] = conteo_mesas.get((m, cid), 0) + 1
+                    else:
+                        codigos[i] = YA_VOTO
+            if self.diario is not None and guardados:
+                self.diario.anotar_votos(guardados, self.candidatos)
+        except BaseException:
+            for dni, _, _ in guardados:
+                self.votantes.pop(dni)
+            raise
+        cambios = [self._sumar_votos(cid, votos) for cid, votos in enumerate(conteo) if votos]
+        if conteo_mesas:
+            self.territorio.sumar_varios(conteo_mesas)
+        if self.auditoria is not None:
+            for dni, cid, m in guardados:
+                self.auditoria.anotar_voto(dni, cid, m)
+        return cambios
+
+    def _resolver_candidato_lote(self, candidato):
+        """Resuelve el id de un candidato del lote: -1 si no es válido y
+        _CANDIDATO_NUEVO si todavía no está registrado pero se puede
+        registrar (se hace al aplicar su primer voto)."""
+        cid = self.candidatos.id_de(candidato)
+        if cid is not None:
+            return cid
+        return _CANDIDATO_NUEVO if self.candidatos.admite(candidato) else -1
+
+    def _validar_lote_python(self, dnis, candidatos):
+        """Validación del lote en Python puro. Retorna (códigos, dnis, ids)."""
+        dnis = list(dnis)
+        codigos = bytearray(len(dnis))
+        cids = [-1] * len(dnis)
+        cache = {}
+        vistos = set()
+        for i, (dni, candidato) in enumerate(zip(dnis, candidatos)):
+            if not isinstance(dni, str) or len(dni) != 8 or not dni.isascii() or not dni.isdigit():
+                codigos[i] = DNI_INVALIDO
+                continue
+            cid = cache.get(candidato)
+            if cid is None:
+                cid = cache[candidato] = self._resolver_candidato_lote(candidato)
+            if cid == -1:
+                codigos[i] = CANDIDATO_INVALIDO
+            elif dni in vistos:
+                codigos[i] = DUPLICADO_EN_LOTE
+            else:
+                vistos.add(dni)
+                cids[i] = cid
+        return codigos, dnis, cids
+
+    def _validar_lote_numpy(self, np, dnis, candidatos):
+        """Validación vectorizada del lote con NumPy. Retorna (códigos, dnis,
+        ids), o None si los datos no son cadenas y hay que usar Python puro."""
+        # np.asarray convertiría enteros u otros objetos en cadenas
+        for datos in (dnis, candidatos):
+            if not isinstance(datos, np.ndarray) and set(map(type, datos)) - {str}:
+                return None
+        arr = np.asarray(dnis)
+        nombres = np.asarray(candidatos)
+        if arr.ndim != 1 or arr.dtype.kind != "U" or nombres.dtype.kind != "U":
+            return None
+        codigos = np.zeros(len(arr), dtype=np.uint8)
+        # Cada fila '<Uk' son k códigos UCS-4 rellenados con ceros
+        ancho = arr.dtype.itemsize // 4
+        if ancho < 8:
+            validos = np.zeros(len(arr), dtype=bool)
+        else:
+            caracteres = np.ascontiguousarray(arr).view(np.uint32).reshape(len(arr), ancho)
+            validos = ((caracteres[:, :8] >= ord("0")) & (caracteres[:, :8] <= ord("9"))).all(axis=1)
+            if ancho > 8:
+                validos &= caracteres[:, 8] == 0
+        codigos[~validos] = DNI_INVALIDO
+
+        # Un solo id por nombre distinto, en orden de primera aparición
+        cids = np.full(len(arr), -1, dtype=np.int64)
+        filas = np.flatnonzero(validos)
+        unicos, primeras, inversa = np.unique(nombres[filas], return_index=True,
+                                             return_inverse=True)
+        ids = np.empty(len(unicos), dtype=np.int64)
+        for u in np.argsort(primeras):
+            ids[u] = self._resolver_candidato_lote(str(unicos[u]))
+        cids[filas] = ids[inversa]
+        codigos[filas[cids[filas] == -1]] = CANDIDATO_INVALIDO
+
+        # Solo la primera aparición de cada DNI aceptado cuenta dentro del lote
+        filas = np.flatnonzero(codigos == VOTO_REGISTRADO)
+        _, primeras = np.unique(arr[filas], return_index=True)
+        repetidas = np.ones(len(filas), dtype=bool)
+        repetidas[primeras] = False
+        codigos[filas[repetidas]] = DUPLICADO_EN_LOTE
+        return bytearray(codigos.tobytes()), arr.tolist(), cids.tolist()
+
+    def eliminar_votante(self, dni):
+        """Permite eliminar un votante (por ejemplo, para pruebas o errores)."""
+        with self._escritura:
+            valor = self.votantes.pop(dni)
+            if valor is None:
+                return f"El DNI {dni} no está registrado."
+            if self.diario is not None:
+                try:
+                    self.diario.anotar_eliminacion(dni)
+                except BaseException:
+                    self.votantes.put_if_absent(dni, valor)
+                    raise
+            cid = valor & _MASCARA_CANDIDATO
+            if cid >= len(self.resultados):
+                # Voto concurrente por un nombre recién registrado que aún no
+                # amplió los conteos
+                self._ampliar_resultados(cid)
+            cambio = self._sumar_votos(cid, -1)
+            if valor > _MASCARA_CANDIDATO:
+                self.territorio.sumar((valor >> _BITS_CANDIDATO) - 1, cid, -1)
+            if self.auditoria is not None:
+                self.auditoria.anotar_eliminacion(dni)
+        self.clasificacion.notificar([cambio])
+        return f"Votante con DNI {dni} eliminado correctamente."
+
+    def vista(self):
+        """Retorna una VistaVotacion con el estado actual congelado.
+
+        Copia con el lock de escritura tomado la lista de cubetas de
+        votantes (ver HashMapBase.snapshot), los conteos, el territorio y
+        la posición del diario: O(cubetas + mesas * c), sin recorrer el
+        padrón. Las lecturas posteriores sobre la vista no bloquean al
+        sistema. No disponible en modo concurrente ni con el backend
+        'bitmap'.
+        """
+        if self._locks_conteo is not None or not hasattr(self.votantes, "snapshot"):
+            raise ValueError("Las vistas solo admiten los backends 'encadenamiento' y "
+                             "'sondeo' sin modo concurrente")
+        with self._escritura:
+            votantes = self.votantes.snapshot()
+            resultados = array("q", self.resultados)
+            territorio = self.territorio.copia() if self.territorio is not None else None
+            hojas = len(self.auditoria) if self.auditoria is not None else None
+            posicion = self.diario.posicion() if self.diario is not None else None
+        candidatos = RegistroCandidatos()
+        for cid in range(len(resultados)):
+            candidatos.registrar(self.candidatos.nombre(cid))
+        if self.candidatos.cerrado:
+            candidatos.cerrar()
+        return VistaVotacion(votantes, resultados, candidatos, territorio, hojas, posicion)
+
+
+class VistaVotacion(_ConsultasVotacion):
+    """Estado congelado de un SistemaVotacion, obtenido con vista().
+
+    votantes es un MapSnapshot y resultados, candidatos, clasificacion y
+    territorio son copias, todos del mismo instante; posicion_diario es la
+    del diario en ese instante (o None). Ofrece las consultas del sistema
+    y se puede pasar a exportar_padron, exportar_resultados,
+    guardar_instantanea o RegistroAuditoria.verificar (que solo considera
+    las hojas_auditoria anotadas hasta la vista).
+    """
+
+    def __init__(self, votantes, resultados, candidatos, territorio=None, hojas_auditoria=None,
+                 posicion_diario=None):
+        self.votantes = votantes
+        self.resultados = resultados
+        self.candidatos = candidatos
+        self.territorio = territorio
+        self.clasificacion = Clasificacion(candidatos, resultados)
+        self.hojas_auditoria = hojas_auditoria
+        self.posicion_diario = posicion_diario
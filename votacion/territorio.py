@@ -0,0 +1,195 @@
+"""Conteos por mesa, distrito y región, con totales acumulados incrementales.
+
+Cada mesa pertenece a un distrito y cada distrito a una región; el total
+nacional es SistemaVotacion.resultados. Cada nodo de la jerarquía guarda su
+propio array("q") de conteos por id de candidato, y cada mesa guarda la
+ruta (sus tres arreglos) hasta la región, así que un voto o una eliminación
+actualiza exactamente tres conteos, sin recorrer el padrón. Consultar
+cualquier nivel cuesta O(c), independiente del número de votantes.
+
+Uso:
+    territorio = Territorio([("M-0001", "Miraflores", "Lima"), ...])
+    sistema = SistemaVotacion(territorio=territorio)
+    sistema.registrar_voto("12345678", "A", mesa="M-0001")
+    sistema.resultados_de("distrito", "Miraflores")
+"""
+
+import threading
+from array import array
+
+MESA = "mesa"
+DISTRITO = "distrito"
+REGION = "region"
+NACIONAL = "nacional"
+NIVELES = (MESA, DISTRITO, REGION, NACIONAL)
+
+# El diario y el registro de auditoría guardan la mesa + 1 como uint32
+MAX_MESAS = 2 ** 32 - 2
+
+
+class _Nivel:
+    """Nombres, ids y conteos de los nodos de un nivel de la jerarquía."""
+
+    def __init__(self):
+        self.ids = {}                      # Nombre -> id
+        self.nombres = []                  # Id -> nombre
+        self.conteos = []                  # Id -> array("q") por candidato
+
+    def registrar(self, nombre, n_candidatos):
+        """Retorna el id del nodo, creándolo si no existía."""
+        i = self.ids.get(nombre)
+        if i is None:
+            i = self.ids[nombre] = len(self.nombres)
+            self.nombres.append(nombre)
+            self.conteos.append(array("q", bytes(8 * n_candidatos)))
+        return i
+
+
+class Territorio:
+    """Jerarquía mesa -> distrito -> región con conteos por candidato.
+
+    mesas es un iterable de tuplas (mesa, distrito, región). Los ids de mesa
+    se asignan en orden de registro y son los que se guardan con cada voto
+    (y en el diario), así que al recuperar un sistema hay que construir el
+    territorio con las mismas mesas en el mismo orden.
+    """
+
+    def __init__(self, mesas=()):
+        self._n_candidatos = 0
+        self._mesas = _Nivel()
+        self._distritos = _Nivel()
+        self._regiones = _Nivel()
+        self._distrito_de = []             # Id de mesa -> id de distrito
+        self._region_de = []               # Id de distrito -> id de región
+        self._rutas = []                   # Id de mesa -> (mesa, distrito, región)
+        self._lock = threading.Lock()
+        for mesa, distrito, region in mesas:
+            self.agregar_mesa(mesa, distrito, region)
+
+    def agregar_mesa(self, mesa, distrito, region):
+        """Registra una mesa y retorna su id. Un distrito no puede estar en
+        dos regiones ni una mesa en dos distritos."""
+        with self._lock:
+            m = self._mesas.ids.get(mesa)
+            d = self._distritos.ids.get(distrito)
+            r = self._regiones.ids.get(region)
+            if d is not None and self._region_de[d] != r:
+                raise ValueError(f"El distrito {distrito!r} ya pertenece a otra región")
+            if m is not None:
+                if self._distrito_de[m] != d:
+                    raise ValueError(f"La mesa {mesa!r} ya pertenece a otro distrito")
+                return m
+            if len(self._rutas) >= MAX_MESAS:
+                raise ValueError(f"El territorio no admite más de {MAX_MESAS} mesas")
+            r = self._regiones.registrar(region, self._n_candidatos)
+            if d is None:
+                d = self._distritos.registrar(distrito, self._n_candidatos)
+                self._region_de.append(r)
+            m = self._mesas.registrar(mesa, self._n_candidatos)
+            self._distrito_de.append(d)
+            self._rutas.append((self._mesas.conteos[m], self._distritos.conteos[d],
+                                self._regiones.conteos[r]))
+            return m
+
+    def id_mesa(self, mesa):
+        """Retorna el id de la mesa, o None si no está registrada."""
+        return self._mesas.ids.get(mesa)
+
+    def ampliar(self, n_candidatos):
+        """Agrega columnas de conteo hasta cubrir n_candidatos."""
+        with self._lock:
+            faltan = n_candidatos - self._n_candidatos
+            if faltan <= 0:
+                return
+            for nivel in (self._mesas, self._distritos, self._regiones):
+                for conteo in nivel.conteos:
+                    conteo.extend(array("q", bytes(8 * faltan)))
+            self._n_candidatos = n_candidatos
+
+    def sumar(self, m, cid, votos):
+        """Suma votos (positivos o negativos) al candidato cid en la mesa m
+        y en su distrito y región."""
+        with self._lock:
+            for conteo in self._rutas[m]:
+                conteo[cid] += votos
+
+    def sumar_varios(self, conteo):
+        """Aplica de una vez un dict {(mesa, cid): votos}, por ejemplo el de
+        un lote."""
+        with self._lock:
+            rutas = self._rutas
+            for (m, cid), votos in conteo.items():
+                for arreglo in rutas[m]:
+                    arreglo[cid] += votos
+
+    def _nivel(self, nivel):
+        if nivel == MESA:
+            return self._mesas
+        if nivel == DISTRITO:
+            return self._distritos
+        if nivel == REGION:
+            return self._regiones
+        raise ValueError(f"Nivel desconocido: {nivel!r}; debe ser uno de {NIVELES}")
+
+    def conteos(self, nivel, nombre):
+        """Retorna una copia del array("q") de conteos del nodo, o None si no
+        existe."""
+        datos = self._nivel(nivel)
+        i = datos.ids.get(nombre)
+        if i is None:
+            return None
+        with self._lock:
+            return array("q", datos.conteos[i])
+
+    def nombres(self, nivel):
+        """Retorna los nombres de los nodos del nivel en orden de registro."""
+        return list(self._nivel(nivel).nombres)
+
+    def conteos_mesas(self):
+        """Retorna los conteos de todas las mesas concatenados en un solo
+        array("q") (mesa por mesa), por ejemplo para una instantánea."""
+        with self._lock:
+            todos = array("q")
+            for conteo in self._mesas.conteos:
+                todos.extend(conteo)
+            return todos
+
+    def cargar_conteos_mesas(self, todos):
+        """Reemplaza los conteos con los de conteos_mesas() y recalcula los
+        distritos y regiones a partir de ellos: O(mesas * c)."""
+        with self._lock:
+            c = self._n_candidatos
+            if len(todos) != c * len(self._rutas):
+                raise ValueError("Los conteos no corresponden a las mesas del territorio")
+            for nivel in (self._mesas, self._distritos, self._regiones):
+                for conteo in nivel.conteos:
+                    conteo[:] = array("q", bytes(8 * c))
+            for m, ruta in enumerate(self._rutas):
+                for cid in range(c):
+                    votos = todos[m * c + cid]
+                    if votos:
+                        for conteo in ruta:
+                            conteo[cid] += votos
+
+    def copia(self):
+        """Retorna un Territorio independiente con las mismas mesas y los
+        conteos actuales, en O(nodos * c); por ejemplo, para una vista de
+        lectura del sistema."""
+        with self._lock:
+            otro = Territorio()
+            otro._n_candidatos = self._n_candidatos
+            for m, mesa in enumerate(self._mesas.nombres):
+                d = self._distrito_de[m]
+                otro.agregar_mesa(mesa, self._distritos.nombres[d],
+                                  self._regiones.nombres[self._region_de[d]])
+            # Los ids coinciden porque se registran en el mismo orden; los
+            # arreglos se copian en el lugar porque las rutas los referencian
+            for nivel, copia in ((self._mesas, otro._mesas), (self._distritos, otro._distritos),
+                                 (self._regiones, otro._regiones)):
+                for conteo, destino in zip(nivel.conteos, copia.conteos):
+                    destino[:] = conteo
+            return otro
+
+    def __len__(self):
+        """Retorna el número de mesas."""
+        return len(self._rutas)